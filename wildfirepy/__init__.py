@@ -1,10 +1,28 @@
-from pkg_resources import DistributionNotFound, get_distribution
+import importlib
 
-from wildfirepy import coordinates, net
+__all__ = ['config', 'coordinates', 'gis', 'granule', 'io', 'net']
 
-__all__ = ['net', 'coordinates']
+try:
+    from importlib.metadata import PackageNotFoundError, version
+except ImportError:  # Python < 3.8
+    from pkg_resources import DistributionNotFound as PackageNotFoundError
+    from pkg_resources import get_distribution
+
+    def version(name):
+        return get_distribution(name).version
 
 try:
-    __version__ = get_distribution(__name__).version
-except DistributionNotFound:
+    __version__ = version(__name__)
+except PackageNotFoundError:
     pass  # package is not installed
+
+
+# Subpackages are imported on first access, see PEP 562.
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,16 @@
+import os
+from pathlib import Path
+
+__all__ = ['get_cache_dir']
+
+
+def get_cache_dir():
+    """
+    Returns the directory used by wildfirepy for its on-disk caches.
+
+    Defaults to ``~/.wildfirepy`` and can be overridden with the
+    ``WILDFIREPY_CACHE_DIR`` environment variable.
+    """
+    path = Path(os.environ.get('WILDFIREPY_CACHE_DIR', Path.home() / '.wildfirepy'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,3 +1,9 @@
-from wildfirepy.coordinates import util
+import importlib
 
 __all__ = ['util']
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+
+converter = SinusoidalCoordinate()
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    return {'latitude': rng.uniform(-89.9, 89.9, 10000),
+            'longitude': rng.uniform(-179.9, 179.9, 10000)}
+
+
+def test_forward_matches_pyproj(points):
+    x, y = converter.forward(points['latitude'], points['longitude'])
+    x_proj, y_proj = converter.MODIS_GRID(points['longitude'], points['latitude'])
+
+    np.testing.assert_allclose(x, x_proj, rtol=0, atol=1e-6)
+    np.testing.assert_allclose(y, y_proj, rtol=0, atol=1e-6)
+
+
+def test_batch_matches_scalar(points):
+    h, v, _, _ = converter.get_modis_grid_coords(points['latitude'], points['longitude'])
+    expected = [converter(lat, lon)
+                for lat, lon in zip(points['latitude'][:500], points['longitude'][:500])]
+
+    assert list(zip(h[:500], v[:500])) == expected
+
+
+def test_batch_pixel_indices(points):
+    for resolution, cells in converter.RESOLUTIONS.items():
+        h, v, row, col = converter.get_modis_grid_coords(points['latitude'], points['longitude'],
+                                                         resolution=resolution)
+        _, _, row_proj, col_proj = converter.get_modis_grid_coords(points['latitude'],
+                                                                   points['longitude'],
+                                                                   resolution=resolution,
+                                                                   use_pyproj=True)
+        assert row.min() >= 0 and row.max() < cells
+        assert col.min() >= 0 and col.max() < cells
+        assert np.mean(row == row_proj) > 0.999
+        assert np.mean(col == col_proj) > 0.999
+
+
+def test_known_tile():
+    h, v, _, _ = converter.get_modis_grid_coords([28.7041], [77.1025])
+    assert (h[0], v[0]) == (24, 6)
+
+
+def test_inverse_roundtrip(points):
+    x, y = converter.forward(points['latitude'], points['longitude'])
+    latitude, longitude = converter.inverse(x, y)
+
+    np.testing.assert_allclose(latitude, points['latitude'], atol=1e-9)
+    np.testing.assert_allclose(longitude, points['longitude'], atol=1e-9)
+
+
+def test_pixel_lat_lon_roundtrip(points):
+    h, v, row, col = converter.get_modis_grid_coords(points['latitude'], points['longitude'])
+    latitude, longitude = converter.get_pixel_lat_lon(h, v, row, col)
+    h2, v2, row2, col2 = converter.get_modis_grid_coords(latitude, longitude)
+
+    np.testing.assert_array_equal(h, h2)
+    np.testing.assert_array_equal(v, v2)
+    np.testing.assert_array_equal(row, row2)
+    np.testing.assert_array_equal(col, col2)
+
+
+def test_tile_lat_lon_is_cached():
+    latitude, longitude = converter.get_tile_lat_lon(24, 6, resolution='1km')
+
+    assert latitude.shape == longitude.shape == (1200, 1200)
+    assert latitude.dtype == longitude.dtype == np.float32
+    assert not latitude.flags.writeable
+    assert SinusoidalCoordinate().get_tile_lat_lon(24, 6, resolution='1km')[0] is latitude
+    assert converter.get_tile_lat_lon(24, 6, resolution='500m')[0].shape == (2400, 2400)
+    np.testing.assert_allclose(latitude[500, 600], converter.get_pixel_lat_lon(24, 6, 500, 600)[0],
+                               atol=1e-5)
+
+
+def test_tile_lat_lon_outside_globe_is_nan():
+    latitude, longitude = converter.get_tile_lat_lon(0, 0)
+
+    assert np.isnan(longitude[0, 0])
+    assert np.isnan(latitude[0, 0])
+
+
+def test_pixel_window_covers_box():
+    bbox = (28.5, 76.9, 28.9, 77.3)
+    rows, cols = converter.get_pixel_window(24, 6, bbox)
+
+    latitude, longitude = converter.get_tile_lat_lon(24, 6)
+    inside = ((latitude >= bbox[0]) & (latitude <= bbox[2]) &
+              (longitude >= bbox[1]) & (longitude <= bbox[3]))
+    inside_rows, inside_cols = np.nonzero(inside)
+
+    assert inside_rows.min() >= rows.start and inside_rows.max() < rows.stop
+    assert inside_cols.min() >= cols.start and inside_cols.max() < cols.stop
+    assert (rows.stop - rows.start) * (cols.stop - cols.start) < 2 * inside.sum()
+
+
+def test_pixel_window_outside_tile():
+    assert converter.get_pixel_window(10, 6, (28.5, 76.9, 28.9, 77.3)) is None
+
+
+def test_tiles_of_box():
+    converter = SinusoidalCoordinate()
+    assert converter.get_tiles((28, 76, 29, 78)) == [(24, 6)]
+    assert converter.get_tiles((29.9, 79.9, 30.1, 80.1)) == [(24, 5), (24, 6)]
+    for h, v in converter.get_tiles((35, -125, 42, -114)):
+        assert converter.get_pixel_window(h, v, (35, -125, 42, -114)) is not None
+
+
+def test_polygon_mask():
+    converter = SinusoidalCoordinate()
+    polygon = [(25, 75), (29, 75), (29, 79), (25, 79)]
+    mask = converter.get_polygon_mask(24, 6, polygon, resolution='500m')
+    assert mask.shape == (2400, 2400)
+    assert converter.get_polygon_mask(24, 6, polygon, resolution='500m') is mask
+
+    latitude, longitude = converter.get_tile_lat_lon(24, 6, resolution='500m')
+    expected = (latitude > 25) & (latitude < 29) & (longitude > 75) & (longitude < 79)
+    assert (mask != expected).sum() < 0.001 * expected.sum()
+    assert not converter.get_polygon_mask(24, 6, [(0, 0), (1, 0), (1, 1)]).any()
+
+
+def test_tiles_of_polygon():
+    converter = SinusoidalCoordinate()
+    triangle = [(32, -125), (42, -125), (32, -114)]
+
+    tiles = converter.get_polygon_tiles(triangle)
+
+    assert tiles == [(7, 5), (8, 4), (8, 5)]
+    assert set(tiles) < set(converter.get_tiles((32, -125, 42, -114)))
+    for tile in converter.get_tiles((32, -125, 42, -114)):
+        assert converter.get_polygon_mask(*tile, triangle).any() == (tile in tiles)
@@ -1,6 +1,7 @@
 import math
+from functools import lru_cache
 
-from pyproj import Proj
+import numpy as np
 
 __all__ = ['SinusoidalCoordinate', ]
 
@@ -12,7 +13,12 @@ class SinusoidalCoordinate:
     Examples
     --------
     >>> coord = SinusoidalCoordinate()
-    >>> h, v = coords(latitude=30.3244, longitude=78.0418)
+    >>> h, v = coord(latitude=30.3244, longitude=78.0418)
+
+    >>> h, v, row, col = coord.get_modis_grid_coords(latitude=df['latitude'],
+    ...                                              longitude=df['longitude'])
+
+    >>> latitude, longitude = coord.get_tile_lat_lon(h=24, v=6, resolution='1km')
 
     References
     ----------
@@ -29,16 +35,409 @@ class SinusoidalCoordinate:
         self.TILE_WIDTH = self.EARTH_WIDTH / self.HORIZONTAL_TILES
         self.TILE_HEIGHT = self.TILE_WIDTH
         self.CELL_SIZE = self.TILE_WIDTH / self.CELLS
-        self.MODIS_GRID = Proj(f'+proj=sinu +R={self.EARTH_RADIUS} +nadgrids=@null +wktext')
+        self.RESOLUTIONS = {'1km': 1200, '500m': 2400}
+
+    @property
+    def MODIS_GRID(self):
+        """
+        The `pyproj.Proj` of the MODIS Sinusoidal projection, imported on first use.
+        """
+        return _get_modis_grid(self.EARTH_RADIUS)
 
     def __call__(self, latitude, longitude):
         return self.get_modis_grid_coord(latitude, longitude)
 
     def get_modis_grid_coord(self, latitude, longitude):
-        x, y = self.MODIS_GRID(longitude, latitude)
+        x, y = self.forward(latitude, longitude)
 
         h = (self.EARTH_WIDTH * 0.5 + x) / self.TILE_WIDTH
         v = -(self.EARTH_WIDTH * 0.25 + y -
               self.VERTICAL_TILES * self.TILE_HEIGHT) / self.TILE_HEIGHT
 
         return int(h), int(v)
+
+    def forward(self, latitude, longitude):
+        """
+        Projects latitude and longitude onto the sinusoidal plane.
+
+        A plain NumPy implementation of the spherical sinusoidal projection,
+        which agrees with `pyproj` to well below a millimetre.
+
+        Parameters
+        ----------
+        latitude: `float` or array-like
+            Latitude(s) in degrees.
+        longitude: `float` or array-like
+            Longitude(s) in degrees.
+
+        Returns
+        -------
+        x, y: `numpy.ndarray`
+            Sinusoidal map coordinates in metres.
+        """
+        phi = np.radians(np.asarray(latitude, dtype=np.float64))
+        lam = np.radians(np.asarray(longitude, dtype=np.float64))
+        x = self.EARTH_RADIUS * lam * np.cos(phi)
+        y = self.EARTH_RADIUS * phi
+        return x, y
+
+    def get_modis_grid_coords(self, latitude, longitude, resolution='1km', use_pyproj=False):
+        """
+        Vectorized version of `get_modis_grid_coord`.
+
+        Parameters
+        ----------
+        latitude: array-like
+            Latitudes in degrees. Accepts anything `numpy.asarray` does,
+            e.g. a `pandas.Series`.
+        longitude: array-like
+            Longitudes in degrees.
+        resolution: `str`
+            Grid resolution used for the pixel indices, either ``'1km'``
+            (1200x1200 cells per tile) or ``'500m'`` (2400x2400 cells per tile).
+            By default ``'1km'``.
+        use_pyproj: `bool`
+            If `True`, projects through `pyproj` instead of `forward`.
+            By default `False`.
+
+        Returns
+        -------
+        h, v, row, col: `numpy.ndarray`
+            Horizontal and vertical tile numbers and the pixel row and column
+            within that tile.
+        """
+        cells = self.RESOLUTIONS[resolution]
+        if use_pyproj:
+            x, y = self.MODIS_GRID(np.asarray(longitude, dtype=np.float64),
+                                   np.asarray(latitude, dtype=np.float64))
+            x, y = np.asarray(x), np.asarray(y)
+        else:
+            x, y = self.forward(latitude, longitude)
+
+        h = (self.EARTH_WIDTH * 0.5 + x) / self.TILE_WIDTH
+        v = -(self.EARTH_WIDTH * 0.25 + y -
+              self.VERTICAL_TILES * self.TILE_HEIGHT) / self.TILE_HEIGHT
+
+        tile_h = np.floor(h)
+        tile_v = np.floor(v)
+        col = np.floor((h - tile_h) * cells)
+        row = np.floor((v - tile_v) * cells)
+
+        return (tile_h.astype(np.int64), tile_v.astype(np.int64),
+                row.astype(np.int64), col.astype(np.int64))
+
+    def inverse(self, x, y):
+        """
+        Converts sinusoidal map coordinates back to latitude and longitude.
+
+        Parameters
+        ----------
+        x: `float` or array-like
+            Sinusoidal x coordinate(s) in metres.
+        y: `float` or array-like
+            Sinusoidal y coordinate(s) in metres.
+
+        Returns
+        -------
+        latitude, longitude: `numpy.ndarray`
+            Geographic coordinates in degrees. Points that fall outside the
+            projected globe, e.g. in the corners of edge tiles, are `nan`.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        phi = np.asarray(y, dtype=np.float64) / self.EARTH_RADIUS
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lam = x / (self.EARTH_RADIUS * np.cos(phi))
+        latitude = np.degrees(phi)
+        longitude = np.degrees(lam)
+
+        outside = (np.abs(longitude) > 180) | (np.abs(latitude) > 90)
+        latitude = np.where(outside, np.nan, latitude)
+        longitude = np.where(outside, np.nan, longitude)
+        return latitude, longitude
+
+    def get_pixel_lat_lon(self, h, v, row, col, resolution='1km'):
+        """
+        Returns latitude and longitude of pixel centres within a tile.
+
+        Parameters
+        ----------
+        h: `int` or array-like
+            Sinusoidal grid longitude (horizontal tile number).
+        v: `int` or array-like
+            Sinusoidal grid latitude (vertical tile number).
+        row: `int` or array-like
+            Pixel row within the tile.
+        col: `int` or array-like
+            Pixel column within the tile.
+        resolution: `str`
+            Either ``'1km'`` or ``'500m'``. By default ``'1km'``.
+
+        Returns
+        -------
+        latitude, longitude: `numpy.ndarray`
+            Coordinates of the pixel centres in degrees.
+        """
+        cells = self.RESOLUTIONS[resolution]
+        h = np.asarray(h, dtype=np.float64) + (np.asarray(col, dtype=np.float64) + 0.5) / cells
+        v = np.asarray(v, dtype=np.float64) + (np.asarray(row, dtype=np.float64) + 0.5) / cells
+
+        x = h * self.TILE_WIDTH - self.EARTH_WIDTH * 0.5
+        y = self.EARTH_WIDTH * 0.25 - v * self.TILE_HEIGHT
+        return self.inverse(x, y)
+
+    def get_tile_lat_lon(self, h, v, resolution='1km'):
+        """
+        Returns per-pixel latitude and longitude grids for a whole tile.
+
+        Grids of the most recently used tiles are memoized on ``(h, v,
+        resolution)``, so asking for the same tile again is free. The
+        returned arrays are shared between callers and therefore read-only.
+        They are single precision, i.e. accurate to about a metre, to bound
+        the memory of the cache.
+
+        Parameters
+        ----------
+        h: `int`
+            Sinusoidal grid longitude (horizontal tile number).
+        v: `int`
+            Sinusoidal grid latitude (vertical tile number).
+        resolution: `str`
+            Either ``'1km'`` (1200x1200) or ``'500m'`` (2400x2400).
+            By default ``'1km'``.
+
+        Returns
+        -------
+        latitude, longitude: `numpy.ndarray`
+            2D ``float32`` arrays of pixel centre coordinates in degrees.
+        """
+        if resolution not in self.RESOLUTIONS:
+            raise ValueError(f"Resolution must be one of {list(self.RESOLUTIONS)}.")
+        return _tile_lat_lon[resolution](int(h), int(v), resolution)
+
+    def get_pixel_window(self, h, v, bbox, resolution='1km'):
+        """
+        Returns the pixel window of a tile covering a latitude/longitude box.
+
+        Parameters
+        ----------
+        h: `int`
+            Sinusoidal grid longitude (horizontal tile number).
+        v: `int`
+            Sinusoidal grid latitude (vertical tile number).
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)`` in degrees.
+        resolution: `str`
+            Either ``'1km'`` or ``'500m'``. By default ``'1km'``.
+
+        Returns
+        -------
+        window: `tuple` of `slice`
+            Row and column slices of the tile, usable directly to index a
+            dataset, or `None` if the box does not intersect the tile.
+        """
+        cells = self.RESOLUTIONS[resolution]
+        tile_h, tile_v = self._get_box_edges(bbox)
+        col = (tile_h - h) * cells
+        row = (tile_v - v) * cells
+
+        row_start = max(0, int(np.floor(row.min())))
+        row_stop = min(cells, int(np.ceil(row.max())))
+        col_start = max(0, int(np.floor(col.min())))
+        col_stop = min(cells, int(np.ceil(col.max())))
+        if row_start >= row_stop or col_start >= col_stop:
+            return None
+        return slice(row_start, row_stop), slice(col_start, col_stop)
+
+    def get_tiles(self, bbox):
+        """
+        Returns the tiles intersecting a latitude/longitude box.
+
+        Parameters
+        ----------
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)`` in degrees.
+
+        Returns
+        -------
+        tiles: `list` of `tuple`
+            Sinusoidal grid coordinates ``(h, v)``, sorted.
+        """
+        min_latitude, min_longitude, max_latitude, max_longitude = bbox
+        tile_h, tile_v = self._get_box_edges(bbox)
+        candidates = [(h, v)
+                      for h in range(max(0, int(tile_h.min())), min(36, int(tile_h.max()) + 1))
+                      for v in range(max(0, int(tile_v.min())), min(18, int(tile_v.max()) + 1))]
+
+        # The projected box is curved, so its bounding rectangle can touch
+        # tiles the box misses. A tile is kept if a box edge enters it or if
+        # part of the tile lies inside the box.
+        inside = np.linspace(0, 1, 17)
+        tiles = []
+        for h, v in candidates:
+            if np.any((tile_h >= h) & (tile_h < h + 1) & (tile_v >= v) & (tile_v < v + 1)):
+                tiles.append((h, v))
+                continue
+            x = (h + inside[None, :]) * self.TILE_WIDTH - self.EARTH_WIDTH * 0.5
+            y = self.EARTH_WIDTH * 0.25 - (v + inside[:, None]) * self.TILE_HEIGHT
+            latitude, longitude = self.inverse(x, y)
+            if np.any((latitude >= min_latitude) & (latitude <= max_latitude) &
+                      (longitude >= min_longitude) & (longitude <= max_longitude)):
+                tiles.append((h, v))
+        return tiles
+
+    def get_polygon_mask(self, h, v, polygon, resolution='1km'):
+        """
+        Rasterizes a latitude/longitude polygon onto the pixels of a tile.
+
+        A pixel is inside if its centre is. Masks are cached per tile and
+        polygon, and returned read-only.
+
+        Parameters
+        ----------
+        h: `int`
+            Sinusoidal grid longitude (horizontal tile number).
+        v: `int`
+            Sinusoidal grid latitude (vertical tile number).
+        polygon: `list` of `tuple`
+            Vertices ``(latitude, longitude)`` in degrees.
+        resolution: `str`
+            Either ``'1km'`` or ``'500m'``. By default ``'1km'``.
+
+        Returns
+        -------
+        mask: `numpy.ndarray`
+            Boolean array of the tile's shape.
+        """
+        if resolution not in self.RESOLUTIONS:
+            raise ValueError(f"Resolution must be one of {list(self.RESOLUTIONS)}.")
+        polygon = tuple((float(latitude), float(longitude)) for latitude, longitude in polygon)
+        return _polygon_mask(int(h), int(v), polygon, resolution)
+
+    def get_polygon_tiles(self, polygon):
+        """
+        Returns the tiles intersecting a latitude/longitude polygon.
+
+        Parameters
+        ----------
+        polygon: `list` of `tuple`
+            Vertices ``(latitude, longitude)`` in degrees.
+
+        Returns
+        -------
+        tiles: `list` of `tuple`
+            Sinusoidal grid coordinates ``(h, v)``, sorted.
+        """
+        vertices = np.asarray(polygon, dtype=np.float64)
+        bbox = (*vertices.min(axis=0), *vertices.max(axis=0))
+        tile_h, tile_v = self._get_polygon_edges(vertices)
+
+        # As for boxes, a candidate tile is kept if an edge enters it or if
+        # part of the tile lies inside the polygon.
+        inside = np.linspace(0, 1, 17)
+        tiles = []
+        for h, v in self.get_tiles(bbox):
+            if np.any((tile_h >= h) & (tile_h < h + 1) & (tile_v >= v) & (tile_v < v + 1)):
+                tiles.append((h, v))
+                continue
+            points_h, points_v = np.meshgrid(h + inside, v + inside)
+            if np.any(_contains_points(tile_h, tile_v, points_h.ravel(), points_v.ravel())):
+                tiles.append((h, v))
+        return tiles
+
+    def _get_polygon_edges(self, vertices):
+        """
+        Returns the densified polygon edges in fractional tile coordinates ``h, v``.
+        """
+        # Edges are straight in latitude/longitude, so they are densified before
+        # projecting, as they curve on the sinusoidal grid.
+        vertices = np.concatenate([vertices, vertices[:1]])
+        steps = np.linspace(0, 1, 33)[:-1, None]
+        points = np.concatenate([start + steps * (stop - start)
+                                 for start, stop in zip(vertices[:-1], vertices[1:])])
+        x, y = self.forward(points[:, 0], points[:, 1])
+        return ((self.EARTH_WIDTH * 0.5 + x) / self.TILE_WIDTH,
+                (self.EARTH_WIDTH * 0.25 - y) / self.TILE_HEIGHT)
+
+    def _get_box_edges(self, bbox):
+        """
+        Returns the box edges sampled in fractional tile coordinates ``h, v``.
+        """
+        min_latitude, min_longitude, max_latitude, max_longitude = bbox
+
+        # The box edges map onto the boundary of its projected image. Within a
+        # meridian edge |x| peaks at the latitude closest to the equator.
+        latitudes = np.linspace(min_latitude, max_latitude, 65)
+        if min_latitude < 0 < max_latitude:
+            latitudes = np.append(latitudes, 0)
+        longitudes = np.linspace(min_longitude, max_longitude, 65)
+        edge_latitudes = np.concatenate([latitudes, latitudes, np.full(65, min_latitude),
+                                         np.full(65, max_latitude)])
+        edge_longitudes = np.concatenate([np.full(len(latitudes), min_longitude),
+                                          np.full(len(latitudes), max_longitude),
+                                          longitudes, longitudes])
+        x, y = self.forward(edge_latitudes, edge_longitudes)
+        return ((self.EARTH_WIDTH * 0.5 + x) / self.TILE_WIDTH,
+                (self.EARTH_WIDTH * 0.25 - y) / self.TILE_HEIGHT)
+
+
+def _contains_points(x, y, points_x, points_y):
+    """
+    Even-odd test of points against the closed polygon with vertices `x`, `y`.
+    """
+    x0, y0 = x[None, :], y[None, :]
+    x1, y1 = np.roll(x, -1)[None, :], np.roll(y, -1)[None, :]
+    px, py = points_x[:, None], points_y[:, None]
+    crosses = (y0 > py) != (y1 > py)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        intersect = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+    return np.count_nonzero(crosses & (px < intersect), axis=1) % 2 == 1
+
+
+@lru_cache(maxsize=None)
+def _get_modis_grid(radius):
+    from pyproj import Proj
+
+    return Proj(f'+proj=sinu +R={radius} +nadgrids=@null +wktext')
+
+
+def _get_tile_lat_lon(h, v, resolution):
+    converter = SinusoidalCoordinate()
+    cells = converter.RESOLUTIONS[resolution]
+    index = np.arange(cells)
+    latitude, longitude = converter.get_pixel_lat_lon(h, v, index[:, None], index[None, :],
+                                                      resolution=resolution)
+    latitude = latitude.astype(np.float32)
+    longitude = longitude.astype(np.float32)
+    latitude.setflags(write=False)
+    longitude.setflags(write=False)
+    return latitude, longitude
+
+
+# A grid pair takes 11.5 MB at 1 km and 46 MB at 500 m, so each cache holds about 92 MB.
+_tile_lat_lon = {
+    '1km': lru_cache(maxsize=8)(_get_tile_lat_lon),
+    '500m': lru_cache(maxsize=2)(_get_tile_lat_lon),
+}
+
+
+@lru_cache(maxsize=64)
+def _polygon_mask(h, v, polygon, resolution):
+    from matplotlib.path import Path
+
+    converter = SinusoidalCoordinate()
+    cells = converter.RESOLUTIONS[resolution]
+    mask = np.zeros((cells, cells), dtype=bool)
+
+    tile_h, tile_v = converter._get_polygon_edges(np.array(polygon))
+    col = (tile_h - h) * cells
+    row = (tile_v - v) * cells
+
+    row_start, row_stop = max(0, int(np.floor(row.min()))), min(cells, int(np.ceil(row.max())))
+    col_start, col_stop = max(0, int(np.floor(col.min()))), min(cells, int(np.ceil(col.max())))
+    if row_start < row_stop and col_start < col_stop:
+        rows, cols = np.mgrid[row_start:row_stop, col_start:col_stop]
+        centres = np.column_stack([cols.ravel() + 0.5, rows.ravel() + 0.5])
+        inside = Path(np.column_stack([col, row])).contains_points(centres)
+        mask[row_start:row_stop, col_start:col_stop] = inside.reshape(rows.shape)
+    mask.setflags(write=False)
+    return mask
@@ -1,2 +1,28 @@
-from wildfirepy.gis.map import *
-from wildfirepy.gis.mapfactory import *
+import importlib
+
+# `stretch` is both a submodule and a function, so the module is imported
+# eagerly for the function to shadow it. It only needs NumPy.
+from wildfirepy.gis.stretch import *
+
+# Public names and the submodule defining them. Submodules are imported on
+# first access (PEP 562), so matplotlib is only imported once a map is used.
+_ATTRIBUTES = {
+    'Map': 'map',
+    'MapFactory': 'mapfactory',
+    'RenderError': 'render',
+    'RenderResult': 'render',
+    'render_many': 'render',
+}
+
+__all__ = list(_ATTRIBUTES) + ['StreamingPercentile', 'gamma_lut', 'stretch']
+
+
+def __getattr__(name):
+    if name in _ATTRIBUTES:
+        module = importlib.import_module(f'{__name__}.{_ATTRIBUTES[name]}')
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
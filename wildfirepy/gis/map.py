@@ -1,11 +1,53 @@
+import io
+
 import h5py
-import matplotlib.pyplot as plt
 import numpy as np
-from skimage import exposure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
 from wildfirepy.gis.mapfactory import MapFactory
+from wildfirepy.gis.stretch import StreamingPercentile, stretch
+from wildfirepy.io.arraycache import CachedDataset
 
 __all__ = ['Map']
 
+# FireMask classes 7, 8 and 9: low, nominal and high confidence fire.
+FIRE_COLORS = ListedColormap(['yellow', 'orange', 'red'])
+
+
+def _get_window_bounds(shape, window):
+    if window is None:
+        window = (slice(None), slice(None))
+    bounds = []
+    for size, selection in zip(shape, window):
+        start, stop, step = selection.indices(size)
+        if step != 1:
+            raise ValueError("Windows must be contiguous.")
+        bounds.append((start, max(start, stop)))
+    return bounds
+
+
+def _read_scaled_band(band, scale, fill, rows, cols, out, chunk_rows=None):
+    """
+    Reads `band` within `rows` and `cols` into `out`, scaled, with fill values set to 0.
+
+    Only one block of raw values of at most `chunk_rows` rows is held at a time.
+    """
+    height = rows[1] - rows[0]
+    width = cols[1] - cols[0]
+    chunk_rows = min(chunk_rows or height, height)
+    if chunk_rows <= 0 or width <= 0:
+        return out
+    raw = np.empty((chunk_rows, width), dtype=band.dtype)
+    for start in range(0, height, chunk_rows):
+        stop = min(start + chunk_rows, height)
+        block = raw[:stop - start]
+        band.read_direct(block, np.s_[rows[0] + start:rows[0] + stop, cols[0]:cols[1]])
+        target = out[start:stop]
+        np.multiply(block, scale, out=target, casting='unsafe')
+        target[block == fill] = 0
+    return out
+
 
 class Map(MapFactory):
 
@@ -24,7 +66,8 @@ class Map(MapFactory):
     def _get_all_datasets(self, data):
         grids = self.Viirs1KmLoader.get_grids(data)
         h5_objs = self._get_all_objects(data)
-        all_datasets = [obj for grid in grids for obj in h5_objs if isinstance(data[obj], h5py.Dataset) and grid in obj]
+        all_datasets = [obj for grid in grids for obj in h5_objs
+                        if isinstance(data[obj], (h5py.Dataset, CachedDataset)) and grid in obj]
         return all_datasets
 
     def get_all_fire_objects(self):
@@ -40,12 +83,8 @@ class Map(MapFactory):
         return self._get_all_datasets(self.data['surface'])
 
     def get_surface_rgb(self):
-        all_datasets = self.get_all_surface_datasets()
-        r = self.data['surface'][[a for a in all_datasets if 'M5' in a][0]]  # M5 = Red
-        g = self.data['surface'][[a for a in all_datasets if 'M4' in a][0]]  # M4 = Green
-        b = self.data['surface'][[a for a in all_datasets if 'M3' in a][0]]  # M3 = Blue
-        n = self.data['surface'][[a for a in all_datasets if 'M7' in a][0]]  # M7  = NIR
-        return r, g, b, n
+        # M5 = Red, M4 = Green, M3 = Blue, M7 = NIR
+        return self.Viirs1KmLoader.get_surface_bands(self.data['surface'])
 
     def get_attributes_of_rgb(self, color):
         return list(color.attrs)
@@ -56,40 +95,192 @@ class Map(MapFactory):
     def get_fill_value(self, color):
         return color.attrs['_FillValue'][0]
 
-    def get_scaled_stacked_rgb(self):
-        r, g, b, n = self.get_surface_rgb()
-        scaleFactor = self.get_scale_value(r)
-        fillValue = self.get_fill_value(r)
-        red = r[()] * scaleFactor
-        green = g[()] * scaleFactor
-        blue = b[()] * scaleFactor
-        n[()] * scaleFactor
-        rgb = np.dstack((red, green, blue))
-        rgb[rgb == fillValue * scaleFactor] = 0
-        return rgb
-
-    def apply_contrast_stretch_gamma_correction(self, rgb):
-        p2, p98 = np.percentile(rgb, (2, 98))                               # Calculate 2nd,98th percentile for updating min/max vals
-        rgbStretched = exposure.rescale_intensity(rgb, in_range=(p2, p98))  # Perform contrast stretch on RGB range
-        rgbStretched = exposure.adjust_gamma(rgbStretched, 0.5)             # Perform Gamma Correction
-        return rgbStretched
-
-    def get_corrected_rgb_image(self):
-        firemask = self.Viirs1KmLoader.get_firemask(self.data['fire'])
-        rgb = self.get_scaled_stacked_rgb()
-        rgbStretched = self.apply_contrast_stretch_gamma_correction(rgb)
-        fig = plt.figure(figsize=(15, 15), dpi=100)                           # Set the figure size
-        ax = plt.Axes(fig, [0, 0, 1, 1])
-        ax.set_axis_off()  # Turn off axes
-        fig.add_axes(ax)
+    def get_window(self, bbox):
+        """
+        Returns the pixel window of the loaded tile covering a bounding box.
+
+        Parameters
+        ----------
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)`` in degrees.
+        """
+        return self.Viirs1KmLoader.get_window(self.data['fire'], bbox)
+
+    def get_scaled_stacked_rgb(self, window=None, bbox=None, out=None, dtype=np.float32,
+                               chunk_rows=None):
+        """
+        Returns the scaled natural colour composite of the surface reflectance.
+
+        Bands are read straight into a preallocated ``(rows, columns, 3)``
+        buffer, and scaling and fill masking happen in place using each
+        band's own ``Scale`` and ``_FillValue``.
+
+        Parameters
+        ----------
+        window: `tuple` of `slice`
+            Row and column slices to read. By default the whole tile.
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)``
+            to read instead of `window`.
+        out: `numpy.ndarray`
+            Buffer to write the composite into, e.g. to reuse it across tiles.
+            Allocated if `None`.
+        dtype: `numpy.dtype`
+            Floating point type of the allocated buffer. By default ``float32``.
+        chunk_rows: `int`
+            Number of rows read at a time. By default the whole window at once.
+        """
+        if bbox is not None:
+            window = self.get_window(bbox)
+        r, g, b, _ = self.get_surface_rgb()
+        rows, cols = _get_window_bounds(r.shape, window)
+        shape = (rows[1] - rows[0], cols[1] - cols[0], 3)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"Output buffer has shape {out.shape}, expected {shape}.")
+
+        for index, band in enumerate((r, g, b)):
+            _read_scaled_band(band, self.get_scale_value(band), self.get_fill_value(band),
+                              rows, cols, out[..., index], chunk_rows)
+        return out
+
+    def apply_contrast_stretch_gamma_correction(self, rgb, limits=None, gamma=0.5):
+        """
+        Stretches `rgb` between its 2nd and 98th percentile and applies gamma correction.
 
-        firemask[firemask != 9] = 0
-        pts = list(zip(np.where(firemask != 0)[0], np.where(firemask != 0)[1]))
+        Parameters
+        ----------
+        rgb: `numpy.ndarray`
+            Composite from `get_scaled_stacked_rgb`.
+        limits: `tuple`
+            Input values mapped to black and white, e.g. percentiles of a whole
+            mosaic from `~wildfirepy.gis.stretch.StreamingPercentile`.
+            By default estimated from `rgb`.
+        gamma: `float`
+            Gamma correction exponent. By default 0.5.
+
+        Returns
+        -------
+        rgbStretched: `numpy.ndarray`
+            The stretched image as ``uint8``.
+        """
+        if limits is None:
+            limits = StreamingPercentile().update(rgb).percentile((2, 98))
+        p2, p98 = limits
+        return stretch(rgb, p2, p98, gamma=gamma)
+
+    def plot_fire_pixels(self, ax, pixels, window=None):
+        """
+        Draws fire detections on `ax` as a single scatter layer, coloured by confidence.
+
+        Parameters
+        ----------
+        ax: `matplotlib.axes.Axes`
+            Axes showing the tile, or the `window` of it, in pixel coordinates.
+        pixels: `~wildfirepy.io.viirs1km.FirePixels`
+            Detections as returned by `Viirs1KmLoader.get_fire_pixels`.
+        window: `tuple` of `slice`
+            Window of the tile shown on `ax`. By default the whole tile.
+        """
+        rows, cols = pixels.row, pixels.col
+        if window is not None:
+            rows = rows - (window[0].start or 0)
+            cols = cols - (window[1].start or 0)
+        return ax.scatter(cols, rows, c=pixels.confidence, cmap=FIRE_COLORS, vmin=6.5, vmax=9.5,
+                          s=4, marker='s', linewidths=0)
+
+    def draw(self, fig, window=None, bbox=None, min_confidence=9, limits=None):
+        """
+        Draws the contrast stretched natural colour image and its fire pixels on `fig`.
+
+        Parameters
+        ----------
+        fig: `matplotlib.figure.Figure`
+            Figure to draw on. The image fills the whole figure.
+        window: `tuple` of `slice`
+            Row and column slices to draw. By default the whole tile.
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)``
+            to draw instead of `window`.
+        min_confidence: `int`
+            Lowest `FireMask` class to mark. By default 9 (high confidence).
+        limits: `tuple`
+            Contrast stretch limits, see `apply_contrast_stretch_gamma_correction`.
+        """
+        if bbox is not None:
+            window = self.get_window(bbox)
+        pixels = self.Viirs1KmLoader.get_fire_pixels(self.data['fire'], window=window,
+                                                     min_confidence=min_confidence)
+        rgb = self.get_scaled_stacked_rgb(window=window)
+        rgbStretched = self.apply_contrast_stretch_gamma_correction(rgb, limits)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_axis_off()  # Turn off axes
 
         ax.imshow(rgbStretched)  # Plot a natural color RGB
+        self.plot_fire_pixels(ax, pixels, window)
+        return ax
+
+    def render(self, filename=None, format='png', window=None, bbox=None, min_confidence=9,
+               limits=None, dpi=100, scale=1):
+        """
+        Renders a quicklook without a display, using the Agg backend.
 
-        for i, j in pts:
-            plt.annotate('Fire!', xy=(j, i), xycoords='data',
-                         xytext=(0.5, 0.5), textcoords='figure fraction',
-                         arrowprops=dict(arrowstyle="->"))
+        Unlike `get_corrected_rgb_image` this does not touch the `pyplot`
+        state, so it can run in server processes and worker threads.
+
+        Parameters
+        ----------
+        filename: `str` or `pathlib.Path`
+            File to write the image to. If `None`, the encoded image is returned.
+        format: `str`
+            Image format understood by Matplotlib, e.g. ``'png'`` or ``'jpg'``.
+            By default ``'png'``.
+        window: `tuple` of `slice`
+            Row and column slices to render. By default the whole tile.
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)``
+            to render instead of `window`.
+        min_confidence: `int`
+            Lowest `FireMask` class to mark. By default 9 (high confidence).
+        limits: `tuple`
+            Contrast stretch limits, see `apply_contrast_stretch_gamma_correction`.
+            Pass the same limits for every tile to render them consistently.
+        dpi: `int`
+            Resolution of the figure. By default 100.
+        scale: `float`
+            Output pixels per grid pixel. By default 1.
+
+        Returns
+        -------
+        image: `bytes`
+            The encoded image if `filename` is `None`, otherwise `filename`.
+        """
+        if bbox is not None:
+            window = self.get_window(bbox)
+        rows, cols = _get_window_bounds(self.get_surface_rgb()[0].shape, window)
+        fig = Figure(figsize=((cols[1] - cols[0]) * scale / dpi,
+                              (rows[1] - rows[0]) * scale / dpi), dpi=dpi)
+        FigureCanvasAgg(fig)
+        self.draw(fig, window=window, min_confidence=min_confidence, limits=limits)
+
+        if filename is None:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=format, dpi=dpi)
+            return buffer.getvalue()
+        fig.savefig(str(filename), format=format, dpi=dpi)
+        return filename
+
+    def close(self):
+        """
+        Closes the opened surface and fire granules.
+        """
+        for key in ('surface', 'fire'):
+            self.data[key].close()
+
+    def get_corrected_rgb_image(self, window=None, bbox=None, min_confidence=9, limits=None):
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=(15, 15), dpi=100)                           # Set the figure size
+        self.draw(fig, window=window, bbox=bbox, min_confidence=min_confidence, limits=limits)
         plt.show()
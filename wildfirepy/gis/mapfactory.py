@@ -19,6 +19,7 @@ class MapFactory(Io):
             if set(['surface', 'fire']) == self.files.keys():
                 return self.Viirs1KmLoader.get_data(self.files)
 
-        elif set(['latitude', 'longitude', 'obsdate']).issubset(self.kwargs):
+        elif (set(['latitude', 'longitude', 'obsdate']).issubset(self.kwargs) or
+              set(['tile', 'obsdate']).issubset(self.kwargs)):
             data = self.Viirs1KmLoader.Viirs1KMDownloader.get_data(**self.kwargs)
             return self.Viirs1KmLoader.get_data(data)
@@ -0,0 +1,96 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from wildfirepy.gis.map import Map
+
+__all__ = ['RenderError', 'RenderResult', 'render_many']
+
+RenderResult = namedtuple('RenderResult', ['request', 'path', 'error'])
+RenderResult.__doc__ = """
+Outcome of a single quicklook requested through `render_many`.
+
+Parameters
+----------
+request: `dict`
+    The request as it was passed in.
+path: `str`
+    Path to the written image, `None` if rendering failed.
+error: `RenderError`
+    The error raised while rendering, `None` on success.
+"""
+
+
+class RenderError(namedtuple('RenderError', ['type', 'message'])):
+    """
+    An error raised while rendering in a worker process.
+
+    Exceptions are not sent back from the workers as they are, since some,
+    e.g. `urllib.error.HTTPError`, cannot be unpickled and would break the
+    process pool.
+
+    Parameters
+    ----------
+    type: `str`
+        Qualified name of the exception class, e.g. ``'urllib.error.HTTPError'``.
+    message: `str`
+        The exception as a string.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return f'{self.type}: {self.message}'
+
+
+def _render(request, directory, format, kwargs):
+    request = dict(request)
+    filename = request.pop('filename', None)
+    render_kwargs = {key: request.pop(key) for key in ('window', 'bbox', 'min_confidence')
+                     if key in request}
+    try:
+        tile_map = Map(**request)
+        try:
+            if filename is None:
+                filename = Path(tile_map.data['fire'].filename).stem + '.' + format
+            filename = str(Path(directory) / filename)
+            tile_map.render(filename, format=format, **render_kwargs, **kwargs)
+        finally:
+            tile_map.close()
+    except Exception as err:
+        cls = type(err)
+        return None, RenderError(f'{cls.__module__}.{cls.__qualname__}', str(err))
+    return filename, None
+
+
+def render_many(requests, directory='./', format='png', max_workers=None, **kwargs):
+    """
+    Renders quicklooks for many tiles and dates across a process pool.
+
+    Parameters
+    ----------
+    requests: `list` of `dict`
+        Keyword arguments for `Map` identifying each image, e.g.
+        ``{'obsdate': '2020-02-01', 'tile': (24, 6)}`` or
+        ``{'data': {'surface': ..., 'fire': ...}}``. A request may also set
+        ``filename``, ``window``, ``bbox`` and ``min_confidence``. By default
+        images are named after the fire granule.
+    directory: `str`
+        Directory to write the images to. By default the current directory.
+    format: `str`
+        Image format, e.g. ``'png'`` or ``'jpg'``. By default ``'png'``.
+    max_workers: `int`
+        Number of worker processes. By default the number of CPUs.
+    kwargs: `dict`
+        Keyword arguments passed to every `Map.render` call, e.g. ``dpi``.
+
+    Returns
+    -------
+    results: `list` of `RenderResult`
+        One result per request, in the order of `requests`.
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_render, request, directory, format, kwargs)
+                   for request in requests]
+        return [RenderResult(request, *future.result())
+                for request, future in zip(requests, futures)]
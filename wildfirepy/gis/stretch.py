@@ -0,0 +1,138 @@
+import numpy as np
+
+__all__ = ['StreamingPercentile', 'gamma_lut', 'stretch']
+
+
+class StreamingPercentile:
+    """
+    Approximate percentiles accumulated chunk by chunk in a fixed histogram.
+
+    Memory use is independent of the amount of data, so percentiles of a
+    whole mosaic can be estimated in one streaming pass over its tiles, and
+    estimators filled in different processes can be merged. Values are
+    binned over `range`; values outside it count towards the edge bins.
+
+    Parameters
+    ----------
+    range: `tuple`
+        Lower and upper edge of the histogram. By default ``(-0.1, 1.7)``,
+        which covers scaled VIIRS surface reflectance.
+    bins: `int`
+        Number of bins. By default 18000, one per reflectance step of 1e-4.
+
+    Examples
+    --------
+    >>> estimator = StreamingPercentile()
+    >>> for tile in tiles:
+    ...     estimator.update(tile.get_scaled_stacked_rgb())
+    >>> low, high = estimator.percentile((2, 98))
+    """
+    def __init__(self, range=(-0.1, 1.7), bins=18000):
+        self.range = (float(range[0]), float(range[1]))
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self._scale = bins / (self.range[1] - self.range[0])
+
+    @property
+    def count(self):
+        """
+        Number of values accumulated so far.
+        """
+        return int(self.counts.sum())
+
+    def update(self, values):
+        """
+        Adds `values` to the histogram. NaNs are ignored.
+        """
+        values = np.asarray(values).ravel()
+        indices = values - self.range[0]
+        indices *= self._scale
+        indices = indices[~np.isnan(indices)]
+        np.clip(indices, 0, self.bins - 1, out=indices)
+        self.counts += np.bincount(indices.astype(np.intp), minlength=self.bins)
+        return self
+
+    def merge(self, other):
+        """
+        Adds the histogram of another estimator with the same range and bins.
+        """
+        if other.range != self.range or other.bins != self.bins:
+            raise ValueError("Only estimators with the same range and bins can be merged.")
+        self.counts += other.counts
+        return self
+
+    def percentile(self, q):
+        """
+        Returns the estimated percentiles `q`, in the same way as `numpy.percentile`.
+
+        Values are interpolated linearly within a bin, so the error is at most
+        one bin width for values inside `range`.
+        """
+        total = self.count
+        if total == 0:
+            raise ValueError("No values have been accumulated.")
+        cumulative = np.cumsum(self.counts)
+        ranks = np.asarray(q, dtype=np.float64) / 100 * total
+        bins = np.clip(np.searchsorted(cumulative, ranks, side='left'), 0, self.bins - 1)
+        below = np.where(bins > 0, cumulative[bins - 1], 0)
+        fraction = (ranks - below) / np.maximum(self.counts[bins], 1)
+        return self.range[0] + (bins + np.clip(fraction, 0, 1)) / self._scale
+
+
+def gamma_lut(gamma, levels=4096, dtype=np.uint8):
+    """
+    Returns a lookup table applying gamma correction to quantized inputs.
+
+    Parameters
+    ----------
+    gamma: `float`
+        Exponent, as in `skimage.exposure.adjust_gamma`.
+    levels: `int`
+        Number of input levels, e.g. 256 for ``uint8`` images. By default 4096.
+    dtype: `numpy.dtype`
+        Output type. Integer types are scaled to their full range, floating
+        point types to ``[0, 1]``. By default ``uint8``.
+
+    Returns
+    -------
+    lut: `numpy.ndarray`
+        Array of `levels` entries, applied with ``lut[image]``.
+    """
+    lut = np.linspace(0, 1, levels) ** gamma
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'iu':
+        return np.round(lut * np.iinfo(dtype).max).astype(dtype)
+    return lut.astype(dtype)
+
+
+def stretch(image, low, high, gamma=1.0, levels=4096, dtype=np.uint8):
+    """
+    Linearly stretches `image` from ``[low, high]`` and applies gamma correction.
+
+    The image is quantized to `levels` steps and gamma correction is done
+    through `gamma_lut` instead of a power per pixel.
+
+    Parameters
+    ----------
+    image: `numpy.ndarray`
+        Image to stretch, e.g. from `Map.get_scaled_stacked_rgb`.
+    low, high: `float`
+        Input values mapped to black and white, e.g. 2nd and 98th percentile.
+    gamma: `float`
+        Gamma correction exponent. By default 1.
+    levels: `int`
+        Number of quantization levels. By default 4096.
+    dtype: `numpy.dtype`
+        Output type. By default ``uint8``.
+
+    Returns
+    -------
+    stretched: `numpy.ndarray`
+    """
+    scaled = np.subtract(image, low, dtype=np.float32)
+    scaled *= (levels - 1) / max(high - low, np.finfo(np.float32).tiny)
+    np.clip(scaled, 0, levels - 1, out=scaled)
+    np.nan_to_num(scaled, copy=False)
+    scaled += 0.5
+    indices = scaled.astype(np.uint16 if levels <= 1 << 16 else np.intp)
+    return gamma_lut(gamma, levels, dtype)[indices]
@@ -0,0 +1,203 @@
+import pickle
+import socket
+from urllib.error import HTTPError
+
+import h5py
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from wildfirepy.gis import mapfactory, render
+from wildfirepy.gis.map import Map, _get_window_bounds, _read_scaled_band
+from wildfirepy.gis.render import RenderError, render_many
+from wildfirepy.io import ArrayCache, Viirs1KmLoader
+from wildfirepy.net import Viirs1KMDownloader
+
+
+@pytest.fixture
+def offline(monkeypatch, tmp_path):
+    monkeypatch.setenv('WILDFIREPY_CACHE_DIR', str(tmp_path / 'cache'))
+
+    def connect(*args, **kwargs):
+        raise AssertionError("Tried to access the network.")
+    monkeypatch.setattr(socket.socket, 'connect', connect)
+
+
+@pytest.fixture
+def granules(tmp_path):
+    surface = tmp_path / 'VNP09GA.A2020032.h24v06.001.2020034000000.h5'
+    reflectance = np.random.default_rng(0).integers(0, 5000, (1200, 1200), dtype=np.int16)
+    with h5py.File(surface, 'w') as h5file:
+        fields = h5file.create_group('HDFEOS/GRIDS/VNP_Grid_1km_2D/Data Fields')
+        for band in ('M3', 'M4', 'M5', 'M7'):
+            dataset = fields.create_dataset(f'SurfReflect_{band}_1', data=reflectance)
+            dataset.attrs['Scale'] = np.array([0.0001])
+            dataset.attrs['_FillValue'] = np.array([-28672], dtype=np.int16)
+
+    fire = tmp_path / 'VNP14A1.A2020032.h24v06.001.2020034000000.h5'
+    with h5py.File(fire, 'w') as h5file:
+        fields = h5file.create_group('HDFEOS/GRIDS/VNP14A1_Grid/Data Fields')
+        firemask = np.full((1200, 1200), 5, dtype=np.uint8)
+        firemask[500, 600], firemask[501, 600], firemask[10, 20] = 9, 8, 7
+        fields.create_dataset('FireMask', data=firemask)
+        frp = fields.create_dataset('MaxFRP', data=np.zeros((1200, 1200), dtype=np.int32))
+        frp[500, 600] = 123
+        frp.attrs['scale_factor'] = np.array([0.1])
+    return {'surface': str(surface), 'fire': str(fire)}
+
+
+def test_clients_are_constructed_offline(offline):
+    Viirs1KMDownloader()
+
+
+def test_map_from_local_files(offline, granules):
+    tile_map = Map(data=granules)
+    pixels = tile_map.Viirs1KmLoader.get_fire_pixels(tile_map.data['fire'], min_confidence=8)
+    np.testing.assert_array_equal(pixels.row, [500, 501])
+    np.testing.assert_array_equal(pixels.confidence, [9, 8])
+    np.testing.assert_allclose(pixels.frp, [12.3, 0])
+    np.testing.assert_allclose(pixels.latitude[0], 30 - 500.5 / 120)
+
+    rgb = tile_map.get_scaled_stacked_rgb(bbox=(25, 71, 27, 73))
+    assert rgb.dtype == np.float32 and rgb.ndim == 3
+    image = tile_map.render(bbox=(25, 71, 27, 73))
+    assert image.startswith(b'\x89PNG')
+    tile_map.close()
+
+
+def test_map_from_cached_granules(offline, granules, tmp_path, monkeypatch):
+    expected = Map(data=granules)
+    image = expected.render(bbox=(25, 71, 27, 73))
+    fire = expected.Viirs1KmLoader.get_fire_pixels(expected.data['fire'])
+    expected.close()
+
+    loader = Viirs1KmLoader(cache=ArrayCache(tmp_path / 'arrays'))
+    for filename in granules.values():
+        loader.cache_granule(filename)
+    monkeypatch.setattr(mapfactory, 'Viirs1KmLoader', lambda: loader)
+    monkeypatch.setattr(h5py, 'File', None)
+
+    tile_map = Map(data=granules)
+    assert tile_map.render(bbox=(25, 71, 27, 73)) == image
+    pixels = loader.get_fire_pixels(tile_map.data['fire'])
+    for actual, wanted in zip(pixels, fire):
+        np.testing.assert_array_equal(actual, wanted)
+    tile_map.close()
+
+
+def test_cache_granule_without_cache(granules):
+    with pytest.raises(ValueError, match='disabled'):
+        Viirs1KmLoader(cache=False).cache_granule(granules['fire'])
+
+
+@pytest.mark.parametrize('min_confidence, rows',
+                         [(7, [10, 500, 501]), (8, [500, 501]), (9, [500])])
+def test_fire_pixels_min_confidence(offline, granules, min_confidence, rows):
+    tile_map = Map(data=granules)
+    pixels = tile_map.Viirs1KmLoader.get_fire_pixels(tile_map.data['fire'],
+                                                     min_confidence=min_confidence)
+    np.testing.assert_array_equal(pixels.row, rows)
+    assert (pixels.confidence >= min_confidence).all()
+    tile_map.close()
+
+
+def test_fire_pixels_window(offline, granules):
+    tile_map = Map(data=granules)
+    loader = tile_map.Viirs1KmLoader
+    window = (slice(400, 501), slice(550, 650))
+    pixels = loader.get_fire_pixels(tile_map.data['fire'], window=window)
+
+    # Rows and columns are those of the tile, not of the window.
+    np.testing.assert_array_equal(pixels.row, [500])
+    np.testing.assert_array_equal(pixels.col, [600])
+    np.testing.assert_allclose(pixels.frp, [12.3])
+
+    empty = loader.get_fire_pixels(tile_map.data['fire'], window=(slice(0, 5), slice(None)))
+    assert len(empty.row) == len(empty.frp) == 0
+    tile_map.close()
+
+
+def test_fire_pixels_bbox(offline, granules):
+    tile_map = Map(data=granules)
+    loader = tile_map.Viirs1KmLoader
+    fire = loader.get_fire_pixels(tile_map.data['fire'], min_confidence=9)
+    latitude, longitude = fire.latitude[0], fire.longitude[0]
+    bbox = (latitude - 0.001, longitude - 0.001, latitude + 0.001, longitude + 0.001)
+
+    pixels = loader.get_fire_pixels(tile_map.data['fire'], bbox=bbox)
+    np.testing.assert_array_equal(pixels.row, [500])
+    np.testing.assert_array_equal(pixels.col, [600])
+    np.testing.assert_allclose(pixels.latitude, [latitude])
+    tile_map.close()
+
+
+@pytest.mark.parametrize('window, offsets', [(None, [[20, 10], [600, 500], [600, 501]]),
+                                             ((slice(400, 600), slice(550, 650)),
+                                              [[-530, -390], [50, 100], [50, 101]])])
+def test_plot_fire_pixels(offline, granules, window, offsets):
+    tile_map = Map(data=granules)
+    pixels = tile_map.Viirs1KmLoader.get_fire_pixels(tile_map.data['fire'])
+    ax = Figure().add_subplot()
+
+    collection = tile_map.plot_fire_pixels(ax, pixels, window)
+    np.testing.assert_array_equal(collection.get_offsets(), offsets)
+    np.testing.assert_array_equal(collection.get_array(), [7, 9, 8])
+    assert list(ax.collections) == [collection]
+    tile_map.close()
+
+
+def test_render_many(offline, granules, tmp_path):
+    missing = dict(granules, fire=str(tmp_path / 'missing.h5'))
+    requests = [{'data': granules, 'bbox': (25, 71, 27, 73)},
+                {'data': missing},
+                {'data': granules, 'filename': 'tile.jpg'}]
+    results = render_many(requests, directory=str(tmp_path / 'images'), max_workers=2)
+
+    assert [result.request for result in results] == requests
+    assert results[0].error is None
+    name = 'VNP14A1.A2020032.h24v06.001.2020034000000.png'
+    assert results[0].path == str(tmp_path / 'images' / name)
+    assert open(results[0].path, 'rb').read().startswith(b'\x89PNG')
+    assert results[1].path is None
+    assert isinstance(results[1].error, RenderError)
+    assert results[2].path == str(tmp_path / 'images' / 'tile.jpg')
+
+
+def test_render_error_is_picklable(monkeypatch, tmp_path):
+    def fail(**kwargs):
+        raise HTTPError('https://example.com/tile.h5', 404, 'Not Found', {}, None)
+    monkeypatch.setattr(render, 'Map', fail)
+
+    path, error = render._render({'obsdate': '2020-02-01', 'tile': (24, 6)}, str(tmp_path),
+                                 'png', {})
+    assert path is None
+    assert pickle.loads(pickle.dumps(error)) == error
+    assert str(error) == 'urllib.error.HTTPError: HTTP Error 404: Not Found'
+
+
+@pytest.fixture
+def band(tmpdir):
+    values = np.arange(100 * 80, dtype=np.int16).reshape(100, 80)
+    values[5, 7] = -28672
+    h5file = h5py.File(str(tmpdir / 'surface.h5'), 'w')
+    yield h5file.create_dataset('M5', data=values, chunks=(20, 80))
+    h5file.close()
+
+
+@pytest.mark.parametrize('chunk_rows', [None, 7, 1000])
+def test_read_scaled_band(band, chunk_rows):
+    rows, cols = _get_window_bounds(band.shape, (slice(3, 50), slice(4, 60)))
+    out = np.full((47, 56), np.nan, dtype=np.float32)
+    _read_scaled_band(band, 0.0001, -28672, rows, cols, out, chunk_rows)
+
+    expected = band[3:50, 4:60] * np.float32(0.0001)
+    expected[band[3:50, 4:60] == -28672] = 0
+    assert out[2, 3] == 0
+    np.testing.assert_allclose(out, expected, rtol=1e-6)
+
+
+def test_window_bounds():
+    assert _get_window_bounds((100, 80), None) == [(0, 100), (0, 80)]
+    bounds = _get_window_bounds((100, 80), (slice(90, 120), slice(-10, None)))
+    assert bounds == [(90, 100), (70, 80)]
+    with pytest.raises(ValueError):
+        _get_window_bounds((100, 80), (slice(0, 10, 2), slice(None)))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from wildfirepy.gis.stretch import StreamingPercentile, gamma_lut, stretch
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).gamma(2.0, 0.1, size=(300, 200, 3)).astype(np.float32)
+
+
+def test_percentile_matches_numpy(values):
+    estimator = StreamingPercentile()
+    for chunk in np.array_split(values, 7):
+        estimator.update(chunk)
+    assert estimator.count == values.size
+    np.testing.assert_allclose(estimator.percentile((2, 50, 98)),
+                               np.percentile(values, (2, 50, 98)), atol=2e-4)
+
+
+def test_percentile_merge(values):
+    whole = StreamingPercentile().update(values)
+    first = StreamingPercentile().update(values[:100])
+    second = StreamingPercentile().update(values[100:])
+    np.testing.assert_array_equal(first.merge(second).counts, whole.counts)
+    with pytest.raises(ValueError):
+        first.merge(StreamingPercentile(bins=10))
+
+
+def test_percentile_ignores_nan():
+    estimator = StreamingPercentile(range=(0, 10), bins=1000).update([1.0, np.nan, 3.0, 5.0])
+    assert estimator.count == 3
+    with pytest.raises(ValueError):
+        StreamingPercentile().percentile(50)
+
+
+def test_gamma_lut():
+    lut = gamma_lut(0.5, levels=256)
+    assert lut.dtype == np.uint8
+    np.testing.assert_array_equal(lut, np.round(255 * (np.arange(256) / 255) ** 0.5))
+    np.testing.assert_allclose(gamma_lut(2, levels=11, dtype=np.float32),
+                               np.linspace(0, 1, 11) ** 2, rtol=1e-6)
+
+
+def test_stretch(values):
+    low, high = np.percentile(values, (2, 98))
+    stretched = stretch(values, low, high, gamma=0.5)
+    expected = np.clip((values - low) / (high - low), 0, 1) ** 0.5 * 255
+    assert stretched.dtype == np.uint8
+    assert stretched.shape == values.shape
+    # Quantization error is largest near black, where the gamma curve is steepest.
+    assert np.abs(stretched - expected).max() <= 5
+    assert np.abs(stretched - expected).mean() < 0.6
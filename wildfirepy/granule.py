@@ -0,0 +1,178 @@
+import re
+from collections import namedtuple
+from datetime import date, timedelta
+
+__all__ = ['Granule', 'parse_granule', 'parse_granules', 'get_latest']
+
+GRANULE_NAME = re.compile(r'(?P<product>\w+)\.A(?P<year>\d{4})(?P<doy>\d{3})\.'
+                          r'(?:h(?P<h>\d{2})v(?P<v>\d{2})|(?P<time>\d{4}))\.'
+                          r'(?P<collection>\d{3})\.(?P<production>\d{13})\.'
+                          r'(?P<extension>h5|hdf)$')
+
+
+class Granule(namedtuple('Granule', ['product', 'year', 'doy', 'h', 'v', 'time', 'collection',
+                                     'production', 'extension'])):
+    """
+    Fields of an LP DAAC granule name.
+
+    Tiled granules, e.g. ``VNP14A1.A2020032.h24v06.001.2020034000000.h5``,
+    have `h` and `v` and no `time`. Swath granules, e.g.
+    ``VNP03MODLL.A2020032.1200.001.2020033000000.h5``, have a `time` and no
+    `h` and `v`. Granules are ordered by product, date, tile or time,
+    collection and production, so lists mixing tiles and swaths sort too.
+
+    Parameters
+    ----------
+    product: `str`
+        Product name, e.g. ``'VNP14A1'``.
+    year: `int`
+        Year of the observation.
+    doy: `int`
+        Day of year of the observation.
+    h: `int`
+        Sinusoidal grid longitude, `None` for swaths.
+    v: `int`
+        Sinusoidal grid latitude, `None` for swaths.
+    time: `str`
+        Start time of a swath as ``'HHMM'``, UTC. `None` for tiles.
+    collection: `str`
+        Collection, e.g. ``'001'``.
+    production: `str`
+        Production timestamp as ``YYYYDDDHHMMSS``.
+    extension: `str`
+        Either ``'h5'`` or ``'hdf'``.
+    """
+    __slots__ = ()
+
+    @property
+    def name(self):
+        """
+        The file name of the granule.
+        """
+        location = self.time if self.time is not None else f'h{self.h:02d}v{self.v:02d}'
+        return (f'{self.product}.A{self.year}{self.doy:03d}.{location}.{self.collection}.'
+                f'{self.production}.{self.extension}')
+
+    @property
+    def browse_name(self):
+        """
+        The file name of the browse image of the granule.
+        """
+        return f'BROWSE.{self.name[:-len(self.extension)]}1.jpg'
+
+    @property
+    def date(self):
+        """
+        The `datetime.date` of the observation.
+        """
+        return date(self.year, 1, 1) + timedelta(days=self.doy - 1)
+
+    @property
+    def tile(self):
+        """
+        Sinusoidal grid coordinates ``(h, v)``, `None` for swaths.
+        """
+        return None if self.h is None else (self.h, self.v)
+
+    @property
+    def key(self):
+        """
+        Fields identifying the observation, i.e. all but collection, production and extension.
+        """
+        return self[:6]
+
+    @property
+    def sort_key(self):
+        """
+        The fields the granule is ordered by, with ``-1`` for the missing `h` and `v` of swaths.
+        """
+        return (self.product, self.year, self.doy, -1 if self.h is None else self.h,
+                -1 if self.v is None else self.v, self.time or '', self.collection,
+                self.production, self.extension)
+
+    def __lt__(self, other):
+        if not isinstance(other, Granule):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other):
+        if not isinstance(other, Granule):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other):
+        if not isinstance(other, Granule):
+            return NotImplemented
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other):
+        if not isinstance(other, Granule):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
+
+
+def parse_granule(name):
+    """
+    Parses a granule file name.
+
+    Parameters
+    ----------
+    name: `str`
+        File name, without directories.
+
+    Returns
+    -------
+    granule: `Granule`
+        `None` if `name` is not a granule name.
+    """
+    return parse_granules([name])[0]
+
+
+def parse_granules(names):
+    """
+    Parses many granule file names.
+
+    Parameters
+    ----------
+    names: iterable of `str`
+        File names, e.g. from a listing or a directory.
+
+    Returns
+    -------
+    granules: `list` of `Granule`
+        One entry per name, in order. `None` where a name is not a granule name.
+    """
+    match = GRANULE_NAME.match
+    granules = []
+    for name in names:
+        fields = match(name)
+        if fields is None:
+            granules.append(None)
+            continue
+        product, year, doy, h, v, time, collection, production, extension = fields.groups()
+        if h is not None:
+            h, v = int(h), int(v)
+        granules.append(Granule(product, int(year), int(doy), h, v, time, collection,
+                                production, extension))
+    return granules
+
+
+def get_latest(granules):
+    """
+    Keeps the most recently produced granule of every observation.
+
+    Parameters
+    ----------
+    granules: iterable of `Granule`
+
+    Returns
+    -------
+    latest: `list` of `Granule`
+        Sorted by product, date and tile or time.
+    """
+    latest = {}
+    for granule in granules:
+        current = latest.get(granule.key)
+        if current is None or granule.production > current.production:
+            latest[granule.key] = granule
+    return sorted(latest.values())
@@ -1,2 +1,36 @@
-from wildfirepy.io.hdf import *
-from wildfirepy.io.viirs1km import *
+import importlib
+
+# Public names and the submodule defining them. Submodules are imported on
+# first access (PEP 562), so e.g. reading metadata does not import h5json.
+_ATTRIBUTES = {
+    'ArrayCache': 'arraycache',
+    'CachedDataset': 'arraycache',
+    'CachedGranule': 'arraycache',
+    'find_dataset': 'arraycache',
+    'get_array_cache': 'arraycache',
+    'get_granule_id': 'arraycache',
+    'LazyDataset': 'hdf',
+    'ReadH5': 'hdf',
+    'read_metadata': 'metadata',
+    'FirePixels': 'viirs1km',
+    'Viirs1KmLoader': 'viirs1km',
+    'Viirs1KmMosaic': 'mosaic',
+    'FireMaskCube': 'cube',
+    'BurnedArea': 'mcd64a1',
+    'get_burned_area': 'mcd64a1',
+    'get_burned_area_many': 'mcd64a1',
+    'read_mcd64a1': 'mcd64a1',
+}
+
+__all__ = list(_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _ATTRIBUTES:
+        module = importlib.import_module(f'{__name__}.{_ATTRIBUTES[name]}')
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,339 @@
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import h5py
+import numpy as np
+from wildfirepy.config import get_cache_dir
+from wildfirepy.granule import parse_granule
+from wildfirepy.io.metadata import _to_json_value
+
+__all__ = ['ArrayCache', 'CachedDataset', 'CachedGranule', 'find_dataset', 'get_array_cache',
+           'get_granule_id']
+
+
+def find_dataset(h5file, name):
+    """
+    Looks up a dataset by path, or else by its name anywhere in the file.
+
+    Parameters
+    ----------
+    h5file: `h5py.File` or `CachedGranule`
+        The opened granule.
+    name: `str`
+        Path of the dataset, e.g. ``'HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/FireMask'``,
+        or only its name, e.g. ``'FireMask'``.
+
+    Raises
+    ------
+    KeyError
+        If the file has no dataset of that name.
+    """
+    if name in h5file:
+        return h5file[name]
+    basename = name.split('/')[-1]
+    matches = []
+    h5file.visititems(lambda key, obj: matches.append(key)
+                      if isinstance(obj, h5py.Dataset) and key.split('/')[-1] == basename
+                      else None)
+    if not matches:
+        raise KeyError(f"No dataset named {basename} in {h5file.filename}.")
+    return h5file[matches[0]]
+
+
+def get_granule_id(filename):
+    """
+    Returns the granule id of a file, its name without the extension.
+    """
+    return Path(filename).name.rsplit('.', 1)[0]
+
+
+class CachedDataset:
+    """
+    A dataset of the `ArrayCache`, read like an `h5py.Dataset`.
+
+    Parameters
+    ----------
+    array: `numpy.ndarray`
+        The values, usually a read-only memory map.
+    name: `str`
+        Path of the dataset in the granule.
+    attrs: `dict`
+        Attributes of the dataset as recorded in the header of the granule.
+    """
+    def __init__(self, array, name, attrs):
+        self.array = array
+        self.name = name
+        self.attrs = {key: np.asarray(value) if isinstance(value, list) else value
+                      for key, value in attrs.items()}
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    @property
+    def dtype(self):
+        return self.array.dtype
+
+    @property
+    def ndim(self):
+        return self.array.ndim
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, key):
+        return self.array[key]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.array, dtype=dtype)
+
+    def read_direct(self, dest, source_sel=None, dest_sel=None):
+        """
+        Copies values into `dest`, like `h5py.Dataset.read_direct`.
+        """
+        dest[() if dest_sel is None else dest_sel] = self.array[() if source_sel is None
+                                                                else source_sel]
+
+
+class CachedGranule:
+    """
+    A granule opened from the `ArrayCache`.
+
+    Cached datasets are read from the cache. The granule is only opened with
+    `h5py` once something else is asked for, e.g. a dataset that was not
+    cached or a group, and every other attribute of `h5py.File` is looked up
+    on the opened file.
+
+    Use `ArrayCache.open` to open a granule.
+
+    Parameters
+    ----------
+    cache: `ArrayCache`
+        The cache holding the granule.
+    filename: `str`
+        Path of the granule file.
+    header: `dict`
+        Header of the granule in the cache.
+    """
+    def __init__(self, cache, filename, header):
+        self.cache = cache
+        self.filename = str(filename)
+        self.header = header
+        self.granule_id = get_granule_id(filename)
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<CachedGranule "{Path(self.filename).name}">'
+
+    def _get_file(self):
+        with self._lock:
+            if self._file is None:
+                self._file = h5py.File(self.filename, 'r')
+            return self._file
+
+    def _get_cached_name(self, name):
+        path = name.strip('/')
+        basename = path.split('/')[-1]
+        info = self.header['datasets'].get(basename)
+        if info is None or path not in (basename, info['path'].strip('/')):
+            return None
+        return basename
+
+    def __contains__(self, name):
+        return self._get_cached_name(name) is not None or name in self._get_file()
+
+    def __getitem__(self, name):
+        basename = self._get_cached_name(name)
+        if basename is not None:
+            array = self.cache.get(self.granule_id, basename)
+            if array is not None:
+                info = self.header['datasets'][basename]
+                return CachedDataset(array, info['path'], info['attrs'])
+        return self._get_file()[name]
+
+    def __getattr__(self, name):
+        return getattr(self._get_file(), name)
+
+    def close(self):
+        """
+        Closes the granule file if it had to be opened.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ArrayCache:
+    """
+    A disk cache of decompressed granule datasets as memory-mappable arrays.
+
+    Each dataset is stored as a ``.npy`` file and opened with `numpy.memmap`,
+    so reading it again costs neither HDF5 metadata parsing nor
+    decompression, and slicing it is zero-copy. A JSON header per granule
+    records the tile and the shape, type and attributes of every cached
+    dataset. Entries are keyed on the granule id, which includes the
+    production time, so they never go stale. The most recently used memory
+    maps are kept open.
+
+    Parameters
+    ----------
+    path: `str`
+        Directory of the cache.
+        By default ``arrays`` inside `~wildfirepy.config.get_cache_dir`.
+    max_arrays: `int`
+        Number of memory maps kept open. By default 64.
+
+    Examples
+    --------
+    >>> cache = ArrayCache()
+    >>> cache.add('VNP14A1.A2020032.h24v06.001.2020034000000.h5', ['FireMask', 'QA'])
+    >>> firemask = cache.get('VNP14A1.A2020032.h24v06.001.2020034000000', 'FireMask')
+    """
+    def __init__(self, path=None, max_arrays=64):
+        self.path = Path(path or get_cache_dir() / 'arrays')
+        self.max_arrays = max_arrays
+        self._lock = threading.Lock()
+        self._arrays = OrderedDict()
+
+    def _get_directory(self, granule_id):
+        return self.path / granule_id
+
+    def get_header(self, granule_id):
+        """
+        Returns the header of a cached granule, or `None` if it is not cached.
+        """
+        try:
+            with open(self._get_directory(granule_id) / 'header.json') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, granule_id, name):
+        """
+        Returns a cached dataset as a read-only memory map, or `None` if it is not cached.
+
+        Parameters
+        ----------
+        granule_id: `str`
+            Name of the granule file without extension.
+        name: `str`
+            Name of the dataset, e.g. ``'FireMask'``.
+        """
+        key = (granule_id, name)
+        with self._lock:
+            if key in self._arrays:
+                self._arrays.move_to_end(key)
+                return self._arrays[key]
+        filename = self._get_directory(granule_id) / f'{name}.npy'
+        if not filename.exists():
+            return None
+        array = np.load(filename, mmap_mode='r')
+        with self._lock:
+            self._arrays[key] = array
+            self._arrays.move_to_end(key)
+            while len(self._arrays) > self.max_arrays:
+                self._arrays.popitem(last=False)
+        return array
+
+    def open(self, filename):
+        """
+        Opens a cached granule, or returns `None` if it is not cached.
+
+        Parameters
+        ----------
+        filename: `str`
+            Path of the granule file.
+
+        Returns
+        -------
+        granule: `CachedGranule`
+        """
+        header = self.get_header(get_granule_id(filename))
+        if header is None:
+            return None
+        return CachedGranule(self, filename, header)
+
+    def add(self, filename, names):
+        """
+        Decompresses datasets of a granule into the cache.
+
+        Parameters
+        ----------
+        filename: `str` or `h5py.File`
+            The granule, or the granule opened with `h5py`.
+        names: `list` of `str`
+            Names or paths of the datasets to cache.
+
+        Returns
+        -------
+        header: `dict`
+            The updated header of the granule.
+        """
+        if isinstance(filename, h5py.File):
+            return self._add(filename, names)
+        with h5py.File(filename, 'r') as h5file:
+            return self._add(h5file, names)
+
+    def _add(self, h5file, names):
+        granule_id = get_granule_id(h5file.filename)
+        directory = self._get_directory(granule_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        header = self.get_header(granule_id) or {'granule': granule_id, 'datasets': {}}
+        granule = parse_granule(Path(h5file.filename).name)
+        if granule is not None and granule.tile is not None:
+            header['tile'] = list(granule.tile)
+
+        for name in names:
+            dataset = find_dataset(h5file, name)
+            name = name.split('/')[-1]
+            partial = directory / f'{name}.npy.part'
+            with open(partial, 'wb') as file:
+                np.save(file, dataset[()])
+            os.replace(partial, directory / f'{name}.npy')
+            attrs = {key: _to_json_value(value, h5file) for key, value in dataset.attrs.items()}
+            header['datasets'][name] = {'path': dataset.name, 'shape': list(dataset.shape),
+                                        'dtype': dataset.dtype.str, 'attrs': attrs}
+            with self._lock:
+                self._arrays.pop((granule_id, name), None)
+
+        partial = directory / 'header.json.part'
+        with open(partial, 'w') as file:
+            json.dump(header, file)
+        os.replace(partial, directory / 'header.json')
+        return header
+
+    def remove(self, granule_id):
+        """
+        Drops a granule from the cache.
+        """
+        with self._lock:
+            for key in [key for key in self._arrays if key[0] == granule_id]:
+                del self._arrays[key]
+        shutil.rmtree(self._get_directory(granule_id), ignore_errors=True)
+
+
+_array_cache = None
+_array_cache_lock = threading.Lock()
+
+
+def get_array_cache():
+    """
+    Returns the process-wide `ArrayCache`.
+    """
+    global _array_cache
+    with _array_cache_lock:
+        if _array_cache is None:
+            _array_cache = ArrayCache()
+    return _array_cache
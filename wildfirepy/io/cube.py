@@ -0,0 +1,216 @@
+import os
+import warnings
+from datetime import date, datetime, timedelta
+
+import h5py
+import numpy as np
+
+__all__ = ['FireMaskCube']
+
+FIREMASK = 'HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/FireMask'
+
+
+def _to_date(obsdate, fmt):
+    if isinstance(obsdate, datetime):
+        return obsdate.date()
+    if isinstance(obsdate, date):
+        return obsdate
+    return datetime.strptime(obsdate, fmt).date()
+
+
+class FireMaskCube:
+    """
+    A ``(time, row, column)`` stack of daily VNP14A1 `FireMask` layers of one tile.
+
+    The cube is an HDF5 file with one layer per day from `start` onwards.
+    Chunks span many days and a small spatial block, so reading the time
+    series of a region touches few chunks. Days are written into their own
+    slot, so gaps can be filled in any order and new days appended as they
+    become available. Days without data read as 0 and are flagged in
+    ``valid``.
+
+    Parameters
+    ----------
+    filename: `str`
+        Path to the cube. Created if it does not exist.
+    tile: `tuple`
+        Sinusoidal grid coordinates ``(h, v)``. Required to create a cube.
+    start: `str` or `datetime.date`
+        First day of the cube. Required to create a cube.
+    fmt: `str`
+        Format of dates given as strings. By default ``'%Y-%m-%d'``.
+    chunks: `tuple`
+        Chunk shape of a new cube. By default ``(32, 150, 150)``.
+    cache_size: `int`
+        Size of the HDF5 chunk cache in bytes. Large enough by default to
+        hold a full row of chunks while writing a day.
+
+    Examples
+    --------
+    >>> cube = FireMaskCube('h24v06.h5', tile=(24, 6), start='2020-06-01')
+    >>> missing = cube.extend('2020-06-01', '2020-08-29')
+    >>> dates, firemask = cube.read(window=(slice(100, 200), slice(300, 400)))
+    """
+    CELLS = 1200
+
+    def __init__(self, filename, tile=None, start=None, fmt="%Y-%m-%d", chunks=(32, 150, 150),
+                 cache_size=64 << 20):
+        self.filename = str(filename)
+        self.fmt = fmt
+        if (tile is None or start is None) and not os.path.exists(self.filename):
+            raise ValueError("tile and start are required to create a cube.")
+        self._file = h5py.File(self.filename, 'a', rdcc_nbytes=cache_size, rdcc_nslots=10007)
+        if 'FireMask' not in self._file:
+            if tile is None or start is None:
+                self._file.close()
+                raise ValueError("tile and start are required to create a cube.")
+            self._file.attrs['h'], self._file.attrs['v'] = tile
+            self._file.attrs['start'] = _to_date(start, fmt).isoformat()
+            self._file.create_dataset('FireMask', shape=(0, self.CELLS, self.CELLS),
+                                      maxshape=(None, self.CELLS, self.CELLS), dtype=np.uint8,
+                                      chunks=chunks, compression='gzip', shuffle=True)
+            self._file.create_dataset('valid', shape=(0,), maxshape=(None,), dtype=bool,
+                                      chunks=(chunks[0],))
+        elif tile is not None and tuple(tile) != self.tile:
+            existing = self.tile
+            self._file.close()
+            raise ValueError(f"{self.filename} holds tile {existing}, not {tuple(tile)}.")
+
+    @property
+    def tile(self):
+        return int(self._file.attrs['h']), int(self._file.attrs['v'])
+
+    @property
+    def start(self):
+        return datetime.strptime(self._file.attrs['start'], '%Y-%m-%d').date()
+
+    @property
+    def firemask(self):
+        """
+        The underlying `h5py.Dataset`, indexed ``[day, row, column]``.
+        """
+        return self._file['FireMask']
+
+    @property
+    def dates(self):
+        """
+        Days holding data, in order.
+        """
+        valid = np.flatnonzero(self._file['valid'][()])
+        return [self.start + timedelta(days=int(day)) for day in valid]
+
+    def _get_index(self, obsdate):
+        index = (_to_date(obsdate, self.fmt) - self.start).days
+        if index < 0:
+            raise ValueError(f"{obsdate} is before the start of the cube, {self.start}.")
+        return index
+
+    def __contains__(self, obsdate):
+        index = self._get_index(obsdate)
+        valid = self._file['valid']
+        return index < len(valid) and bool(valid[index])
+
+    def append(self, obsdate, firemask):
+        """
+        Writes the `FireMask` of one day, growing the cube as needed.
+        """
+        index = self._get_index(obsdate)
+        if index >= len(self._file['valid']):
+            self._file['FireMask'].resize(index + 1, axis=0)
+            self._file['valid'].resize((index + 1,))
+        self._file['FireMask'][index] = firemask
+        self._file['valid'][index] = True
+
+    def extend(self, start, end, max_workers=4, downloader=None, **kwargs):
+        """
+        Adds every day from `start` to `end`, inclusive, that is not in the cube yet.
+
+        Granules are taken from the local disk where available and the rest
+        are downloaded concurrently.
+
+        Parameters
+        ----------
+        start, end: `str` or `datetime.date`
+            First and last day to add.
+        max_workers: `int`
+            Maximum number of concurrent downloads. By default 4.
+        downloader: `~wildfirepy.net.Viirs1KMDownloader`
+            Downloader to use. By default a new one.
+        kwargs: `dict`
+            Keyword arguments for `Viirs1KMDownloader.get_product`, e.g. ``path``.
+            Days are passed as ISO dates, so a ``fmt`` is ignored.
+
+        Returns
+        -------
+        missing: `list` of `datetime.date`
+            Days that could not be fetched.
+        """
+        start, end = _to_date(start, self.fmt), _to_date(end, self.fmt)
+        days = [start + timedelta(days=day) for day in range((end - start).days + 1)]
+        days = [day for day in days if day not in self]
+        if not days:
+            return []
+        # Imported here, so reading a cube does not load the network stack.
+        from wildfirepy.net import Viirs1KMDownloader
+        from wildfirepy.net.util.bulk import fetch_many
+
+        if downloader is None:
+            downloader = Viirs1KMDownloader()
+        kwargs.pop('fmt', None)
+
+        def get_product(*, day):
+            return downloader.get_product('VNP14A1', obsdate=day.isoformat(), tile=self.tile,
+                                          fmt='%Y-%m-%d', **kwargs)
+
+        missing = []
+        for result in fetch_many(get_product, [{'day': day} for day in days],
+                                 max_workers=max_workers):
+            day = result.request['day']
+            if result.error is not None:
+                warnings.warn(UserWarning(f"FireMask for {day} could not be fetched: "
+                                          f"{result.error}"))
+                missing.append(day)
+                continue
+            with h5py.File(result.path, 'r') as granule:
+                self.append(day, granule[FIREMASK][()])
+        self._file.flush()
+        return missing
+
+    def read(self, start=None, end=None, window=None):
+        """
+        Reads the cube between two days, inclusive.
+
+        Parameters
+        ----------
+        start, end: `str` or `datetime.date`
+            First and last day. By default the whole cube.
+        window: `tuple` of `slice`
+            Row and column slices. By default the whole tile.
+
+        Returns
+        -------
+        dates: `list` of `datetime.date`
+            Day of each layer.
+        firemask: `numpy.ndarray`
+            Array of shape ``(days, rows, columns)``. Days without data are 0.
+        """
+        first = 0 if start is None else self._get_index(start)
+        last = len(self._file['valid']) - 1 if end is None else self._get_index(end)
+        last = min(last, len(self._file['valid']) - 1)
+        rows, cols = window if window is not None else (slice(None), slice(None))
+        firemask = self._file['FireMask'][first:last + 1, rows, cols]
+        dates = [self.start + timedelta(days=day) for day in range(first, last + 1)]
+        return dates, firemask
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return (f"<FireMaskCube h{self.tile[0]:02d}v{self.tile[1]:02d} from {self.start}, "
+                f"{len(self._file['valid'])} days>")
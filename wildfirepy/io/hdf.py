@@ -1,27 +1,89 @@
+import itertools
+
 import h5py
-from h5json import Hdf5db
-from h5json.h5tojson.h5tojson import DumpJson
+import numpy as np
 from munch import munchify
+from wildfirepy.io.metadata import read_metadata
 
-__all__ = ['ReadH5']
+__all__ = ['ReadH5', 'LazyDataset']
 
 
 class ReadH5:
     """
     A class to make read objects for h5 files.
 
+    Can be used as a context manager, which closes the underlying file
+    opened by lazy datasets on exit.
+
     Parameters
     ----------
     filepath: `str`
         Path to the hdf file.
+
+    Examples
+    --------
+    >>> with ReadH5(filepath) as reader:
+    ...     reader.tojson()
+    ...     band = reader.subDatasets(lazy=True)[0].data
+    ...     window = band[:100, :100]
     """
 
     def __init__(self, filepath='/'):
         self.path = filepath
         self.name = filepath.split('/')[-1]
         self.json = None
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def open(self):
+        """
+        Returns the open `h5py.File`, opening it on first use.
+        """
+        if self._file is None or not self._file.id.valid:
+            self._file = h5py.File(self.path, "r")
+        return self._file
+
+    def close(self):
+        """
+        Closes the file if it is open.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def tojson(self, fast=False, cache=True):
+        """
+        Converts the structure of the file to json.
+
+        Parameters
+        ----------
+        fast: `bool`
+            If `True`, the structure is extracted by a single pass with
+            `h5py` instead of `h5json`, without writing a sidecar database.
+            By default `False`.
+        cache: `bool`
+            Whether the fast path may use the metadata cache, keyed on path
+            and modification time. By default `True`.
+
+        Returns
+        -------
+        json: `dict`
+            Groups, datasets and their attributes, types, shapes and
+            creation properties.
+        """
+        if fast:
+            self.json = read_metadata(self.path, cache=cache)
+            return self.json
+
+        # h5json is slow to import and only needed on this path.
+        from h5json import Hdf5db
+        from h5json.h5tojson.h5tojson import DumpJson
 
-    def tojson(self):
         db = Hdf5db(self.path, dbFilePath=self.path, app_logger=None)
         # `options_dict` is used to surpress data outputs.
         # If both set to `False`, operations takes a lot of time to copy all
@@ -33,8 +95,15 @@ class ReadH5:
         self.json = dumper.json
         return self.json
 
-    def subDatasets(self):
+    def subDatasets(self, lazy=False):
         """
+        Parameters
+        ----------
+        lazy: `bool`
+            If `True`, the ``data`` of each subdataset is a `LazyDataset`
+            which reads from the file only when indexed. Otherwise every
+            dataset is read into memory. By default `False`.
+
         Returns
         -------
         `list`
@@ -43,16 +112,126 @@ class ReadH5:
         if self.json is None:
             print('Use <obj>.tojson() method to convert HDF File to json first!')
             return
-        dsetnames = list()
-        h5file = h5py.File(self.path, "r")
         dsets = self.json['datasets']
         subdsets = list()
-        for i in dsets:
-            dsetnames.append(i)
-        for name in dsetnames:
+        if lazy:
+            h5file = None
+        else:
+            h5file = h5py.File(self.path, "r")
+        for name in dsets:
+            alias = dsets[name]['alias'][0]
             dset_dict = {}
             dset_dict['metadata'] = dsets[name]
-            dset_dict['name'] = dsets[name]['alias'][0].split('/')[-1]
-            dset_dict['data'] = h5file[dsets[name]['alias'][0]][...]
+            dset_dict['name'] = alias.split('/')[-1]
+            if lazy:
+                dset_dict['data'] = LazyDataset(self, alias)
+            else:
+                dset_dict['data'] = h5file[alias][...]
             subdsets.append(munchify(dset_dict))
+        if h5file is not None:
+            h5file.close()
         return subdsets
+
+
+class LazyDataset:
+    """
+    A proxy for a dataset in an h5 file, which reads data only on access.
+
+    Parameters
+    ----------
+    reader: `ReadH5`
+        The reader owning the file.
+    name: `str`
+        Full path of the dataset within the file.
+
+    Examples
+    --------
+    >>> band = LazyDataset(reader, '/HDFEOS/GRIDS/VNP_Grid_1km_2D/Data Fields/M5')
+    >>> window = band[100:200, 300:400]
+    >>> for selection, block in band.iter_chunks():
+    ...     process(block)
+    """
+    def __init__(self, reader, name):
+        self.reader = reader
+        self.name = name
+
+    @property
+    def dataset(self):
+        """
+        The underlying `h5py.Dataset`.
+        """
+        return self.reader.open()[self.name]
+
+    @property
+    def shape(self):
+        return self.dataset.shape
+
+    @property
+    def dtype(self):
+        return self.dataset.dtype
+
+    @property
+    def ndim(self):
+        return self.dataset.ndim
+
+    @property
+    def chunks(self):
+        return self.dataset.chunks
+
+    @property
+    def attrs(self):
+        return dict(self.dataset.attrs)
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, key):
+        return self.dataset[key]
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.dataset[()]
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __repr__(self):
+        return f"<LazyDataset {self.name!r} shape={self.shape} dtype={self.dtype}>"
+
+    def read(self, window=None):
+        """
+        Reads the dataset, or only a window of it.
+
+        Parameters
+        ----------
+        window: `tuple` of `slice`
+            Hyperslab to read. By default the whole dataset.
+        """
+        return self.dataset[() if window is None else window]
+
+    def iter_chunks(self, chunk_shape=None):
+        """
+        Iterates over the dataset block by block.
+
+        Parameters
+        ----------
+        chunk_shape: `tuple`
+            Shape of each block. By default the storage chunk shape of the
+            dataset, or blocks of about 1 MiB of whole rows if it is not chunked.
+
+        Yields
+        ------
+        selection: `tuple` of `slice`
+            Position of the block within the dataset.
+        block: `numpy.ndarray`
+            The data of the block.
+        """
+        dataset = self.dataset
+        shape = dataset.shape
+        if chunk_shape is None:
+            chunk_shape = dataset.chunks
+        if chunk_shape is None:
+            row_bytes = max(1, dataset.dtype.itemsize * int(np.prod(shape[1:])))
+            chunk_shape = (max(1, (1 << 20) // row_bytes),) + tuple(shape[1:])
+        starts = [range(0, size, step) for size, step in zip(shape, chunk_shape)]
+        for corner in itertools.product(*starts):
+            selection = tuple(slice(start, min(start + step, size))
+                              for start, step, size in zip(corner, chunk_shape, shape))
+            yield selection, dataset[selection]
@@ -0,0 +1,140 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from wildfirepy.granule import parse_granule
+
+__all__ = ['BurnedArea', 'read_mcd64a1', 'get_burned_area', 'get_burned_area_many']
+
+# The Sinusoidal projection is equal-area, so every 500 m pixel covers the
+# same area, in square kilometres.
+_converter = SinusoidalCoordinate()
+PIXEL_AREA = (_converter.TILE_WIDTH / _converter.RESOLUTIONS['500m']) ** 2 / 1e6
+
+BurnedArea = namedtuple('BurnedArea', ['filename', 'tile', 'year', 'month', 'daily', 'total',
+                                       'polygons'])
+BurnedArea.__doc__ = """
+Burned area of one MCD64A1 granule.
+
+Parameters
+----------
+filename: `str`
+    The granule.
+tile: `tuple`
+    Sinusoidal grid coordinates ``(h, v)``.
+year: `int`
+    Year of the granule.
+month: `int`
+    Month of the granule.
+daily: `numpy.ndarray`
+    Burned area in km² by day of year, indexed 0 to 366.
+total: `float`
+    Burned area of the month in km².
+polygons: `dict`
+    Daily burned area in km² within each named polygon.
+"""
+
+
+def read_mcd64a1(filename, layer='Burn Date'):
+    """
+    Reads a layer of an MCD64A1 burned area granule.
+
+    MCD64A1 granules are HDF4 files, which are read with the optional
+    `pyhdf` package.
+
+    Parameters
+    ----------
+    filename: `str`
+        Path to the ``.hdf`` granule.
+    layer: `str`
+        Scientific dataset to read, e.g. ``'Burn Date'``, ``'QA'`` or
+        ``'Burn Date Uncertainty'``. By default ``'Burn Date'``.
+
+    Returns
+    -------
+    data: `numpy.ndarray`
+        The layer. For ``'Burn Date'``: day of year of the burn, 0 if
+        unburned, -1 if unmapped and -2 over water.
+    """
+    try:
+        from pyhdf.SD import SD, SDC
+    except ImportError:
+        raise ImportError("Reading MCD64A1 (HDF4) granules requires pyhdf: "
+                          "pip install pyhdf") from None
+    hdf = SD(str(filename), SDC.READ)
+    try:
+        dataset = hdf.select(layer)
+        data = dataset.get()
+        dataset.endaccess()
+    finally:
+        hdf.end()
+    return data
+
+
+def _parse_filename(filename):
+    granule = parse_granule(Path(filename).name)
+    if granule is None or granule.tile is None:
+        raise ValueError(f"{filename} is not a tiled granule name.")
+    return granule.tile, granule.date
+
+
+def get_burned_area(filename, polygons=None):
+    """
+    Computes the burned area of an MCD64A1 granule by day, in total and per polygon.
+
+    Parameters
+    ----------
+    filename: `str`
+        Path to the ``.hdf`` granule.
+    polygons: `dict`
+        Named polygons, each a list of ``(latitude, longitude)`` vertices.
+        Their masks are rasterized once per tile and cached.
+
+    Returns
+    -------
+    area: `BurnedArea`
+    """
+    tile, date = _parse_filename(filename)
+    burn_date = read_mcd64a1(filename).astype(np.intp, copy=False)
+    burned = burn_date > 0
+
+    daily = np.bincount(burn_date[burned], minlength=367) * PIXEL_AREA
+    by_polygon = {}
+    for name, polygon in (polygons or {}).items():
+        mask = _converter.get_polygon_mask(*tile, polygon, resolution='500m')
+        by_polygon[name] = np.bincount(burn_date[burned & mask], minlength=367) * PIXEL_AREA
+    return BurnedArea(str(filename), tile, date.year, date.month, daily, float(daily.sum()),
+                      by_polygon)
+
+
+def get_burned_area_many(filenames, polygons=None, max_workers=None):
+    """
+    Computes burned area statistics for many granules across a process pool.
+
+    Parameters
+    ----------
+    filenames: `list` of `str`
+        MCD64A1 granules, e.g. every month of a year for several tiles.
+    polygons: `dict`
+        Named polygons, see `get_burned_area`.
+    max_workers: `int`
+        Number of worker processes. By default the number of CPUs.
+
+    Returns
+    -------
+    areas: `list` of `BurnedArea`
+        One result per granule, in the order of `filenames`.
+    """
+    # Granules of the same tile go to the same worker, so polygon masks are
+    # rasterized once per tile and worker.
+    filenames = [str(filename) for filename in filenames]
+    order = sorted(range(len(filenames)), key=lambda index: _parse_filename(filenames[index]))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        areas = list(executor.map(get_burned_area, [filenames[index] for index in order],
+                                  [polygons] * len(order), chunksize=8))
+    results = [None] * len(filenames)
+    for index, area in zip(order, areas):
+        results[index] = area
+    return results
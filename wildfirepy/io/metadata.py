@@ -0,0 +1,234 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+import h5py
+import numpy as np
+from wildfirepy.config import get_cache_dir
+
+__all__ = ['read_metadata']
+
+_FILTERS = {'gzip': (1, 'H5Z_FILTER_DEFLATE', 'deflate'),
+            'szip': (4, 'H5Z_FILTER_SZIP', 'szip'),
+            'lzf': (32000, 'H5Z_FILTER_LZF', 'lzf')}
+
+# Most recently used metadata by file path, as ``(key, metadata)``.
+_memory_cache = OrderedDict()
+_memory_cache_lock = threading.Lock()
+_MEMORY_CACHE_SIZE = 256
+
+
+def _get_cached(filepath, key):
+    with _memory_cache_lock:
+        entry = _memory_cache.get(filepath)
+        if entry is None or entry[0] != key:
+            return None
+        _memory_cache.move_to_end(filepath)
+        return entry[1]
+
+
+def _set_cached(filepath, key, metadata):
+    with _memory_cache_lock:
+        _memory_cache[filepath] = (key, metadata)
+        _memory_cache.move_to_end(filepath)
+        while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _get_type(dtype):
+    if dtype.names:
+        return {'class': 'H5T_COMPOUND',
+                'fields': [{'name': name, 'type': _get_type(dtype.fields[name][0])}
+                           for name in dtype.names]}
+    order = 'BE' if dtype.byteorder == '>' else 'LE'
+    if dtype.kind in 'iu':
+        sign = 'U' if dtype.kind == 'u' else 'I'
+        return {'class': 'H5T_INTEGER', 'base': f'H5T_STD_{sign}{dtype.itemsize * 8}{order}'}
+    if dtype.kind == 'f':
+        return {'class': 'H5T_FLOAT', 'base': f'H5T_IEEE_F{dtype.itemsize * 8}{order}'}
+    if dtype.kind == 'S':
+        return {'class': 'H5T_STRING', 'charSet': 'H5T_CSET_ASCII',
+                'length': dtype.itemsize, 'strPad': 'H5T_STR_NULLPAD'}
+    string_info = h5py.check_string_dtype(dtype)
+    if string_info is not None:
+        charset = 'H5T_CSET_UTF8' if string_info.encoding == 'utf-8' else 'H5T_CSET_ASCII'
+        return {'class': 'H5T_STRING', 'charSet': charset,
+                'length': 'H5T_VARIABLE', 'strPad': 'H5T_STR_NULLTERM'}
+    return {'class': 'H5T_OPAQUE', 'size': dtype.itemsize}
+
+
+def _get_shape(shape, maxshape=None):
+    if shape is None:
+        return {'class': 'H5S_NULL'}
+    if shape == ():
+        return {'class': 'H5S_SCALAR'}
+    item = {'class': 'H5S_SIMPLE', 'dims': list(shape)}
+    if maxshape is not None and tuple(maxshape) != tuple(shape):
+        item['maxdims'] = [0 if size is None else size for size in maxshape]
+    return item
+
+
+def _to_json_value(value, h5file):
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, h5py.Reference):
+        return h5file[value].name if value else None
+    if isinstance(value, (np.ndarray, np.generic)):
+        return _to_json_value(value.tolist(), h5file)
+    if isinstance(value, list):
+        return [_to_json_value(item, h5file) for item in value]
+    return value
+
+
+def _get_attributes(obj):
+    attributes = []
+    for name in obj.attrs:
+        attr = obj.attrs.get_id(name)
+        attributes.append({'name': name,
+                           'type': _get_type(attr.dtype),
+                           'shape': _get_shape(attr.shape),
+                           'value': _to_json_value(obj.attrs[name], obj.file)})
+    return attributes
+
+
+def _get_creation_properties(dataset):
+    if dataset.chunks is not None:
+        layout = {'class': 'H5D_CHUNKED', 'dims': list(dataset.chunks)}
+    else:
+        layout = {'class': 'H5D_CONTIGUOUS'}
+    filters = []
+    if dataset.shuffle:
+        filters.append({'class': 'H5Z_FILTER_SHUFFLE', 'id': 2, 'name': 'shuffle'})
+    if dataset.compression in _FILTERS:
+        filter_id, filter_class, filter_name = _FILTERS[dataset.compression]
+        item = {'class': filter_class, 'id': filter_id, 'name': filter_name}
+        if dataset.compression == 'gzip':
+            item['level'] = dataset.compression_opts
+        filters.append(item)
+    if dataset.fletcher32:
+        filters.append({'class': 'H5Z_FILTER_FLETCHER32', 'id': 3, 'name': 'fletcher32'})
+
+    properties = {'layout': layout}
+    if filters:
+        properties['filters'] = filters
+    return properties
+
+
+def _walk(h5file):
+    """
+    Walks the file once, breadth first, in the layout produced by `h5json`.
+    """
+    namespace = uuid.uuid5(uuid.NAMESPACE_URL, os.path.abspath(h5file.filename))
+    ids = {}
+    groups = {}
+    datasets = {}
+    datatypes = {}
+
+    def register(obj, path):
+        if obj.id in ids:
+            collection, obj_id = ids[obj.id]
+            collection[obj_id]['alias'].append(path)
+            return obj_id, False
+        obj_id = str(uuid.uuid5(namespace, path))
+        if isinstance(obj, h5py.Group):
+            collection, item = groups, {'links': []}
+        elif isinstance(obj, h5py.Dataset):
+            collection, item = datasets, {'type': _get_type(obj.dtype),
+                                          'shape': _get_shape(obj.shape, obj.maxshape),
+                                          'creationProperties': _get_creation_properties(obj)}
+        else:
+            collection, item = datatypes, {'type': _get_type(obj.dtype)}
+        item['alias'] = [path]
+        attributes = _get_attributes(obj)
+        if attributes:
+            item['attributes'] = attributes
+        collection[obj_id] = item
+        ids[obj.id] = (collection, obj_id)
+        return obj_id, True
+
+    root, _ = register(h5file, '/')
+    queue = [(h5file, '/')]
+    while queue:
+        group, path = queue.pop(0)
+        links = groups[ids[group.id][1]]['links']
+        for title in group:
+            if title == '__db__':
+                # Bookkeeping group written into the file by `h5json`.
+                continue
+            link = group.get(title, getlink=True)
+            child_path = path.rstrip('/') + '/' + title
+            if isinstance(link, h5py.SoftLink):
+                links.append({'class': 'H5L_TYPE_SOFT', 'title': title, 'h5path': link.path})
+                continue
+            if isinstance(link, h5py.ExternalLink):
+                links.append({'class': 'H5L_TYPE_EXTERNAL', 'title': title,
+                              'h5path': link.path, 'file': link.filename})
+                continue
+            child = group[title]
+            child_id, is_new = register(child, child_path)
+            collection = ('groups' if isinstance(child, h5py.Group) else
+                          'datasets' if isinstance(child, h5py.Dataset) else 'datatypes')
+            links.append({'class': 'H5L_TYPE_HARD', 'title': title,
+                          'collection': collection, 'id': child_id})
+            if is_new and isinstance(child, h5py.Group):
+                queue.append((child, child_path))
+
+    return {'apiVersion': '1.1.1', 'root': root, 'groups': groups,
+            'datasets': datasets, 'datatypes': datatypes}
+
+
+def read_metadata(filepath, cache=True):
+    """
+    Extracts the structure of an h5 file without reading any data.
+
+    Produces the same layout as `h5json` (groups, datasets, attributes,
+    shapes, types, chunking and compression) in a single pass over the
+    file with `h5py`. Results are cached on disk and, for the most
+    recently read files, in memory, keyed on the file path, modification
+    time and size. Every call returns its own copy.
+
+    Parameters
+    ----------
+    filepath: `str`
+        Path to the h5 file.
+    cache: `bool`
+        Whether to use the metadata cache. By default `True`.
+
+    Returns
+    -------
+    metadata: `dict`
+        The json-like description of the file.
+    """
+    filepath = os.path.abspath(filepath)
+    stat = os.stat(filepath)
+    key = (filepath, stat.st_mtime_ns, stat.st_size)
+
+    if cache:
+        metadata = _get_cached(filepath, key)
+        if metadata is not None:
+            return copy.deepcopy(metadata)
+        cache_file = (get_cache_dir() / 'metadata' /
+                      (hashlib.sha1(filepath.encode('utf-8')).hexdigest() + '.json'))
+        if cache_file.exists():
+            with open(cache_file) as file:
+                cached = json.load(file)
+            if cached.get('key') == list(key):
+                _set_cached(filepath, key, cached['metadata'])
+                return copy.deepcopy(cached['metadata'])
+
+    with h5py.File(filepath, 'r') as h5file:
+        metadata = _walk(h5file)
+
+    if cache:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        partial = cache_file.with_suffix('.part')
+        with open(partial, 'w') as file:
+            json.dump({'key': list(key), 'metadata': metadata}, file)
+        os.replace(partial, cache_file)
+        _set_cached(filepath, key, metadata)
+        return copy.deepcopy(metadata)
+    return metadata
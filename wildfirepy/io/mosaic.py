@@ -0,0 +1,230 @@
+import threading
+import warnings
+
+import h5py
+import numpy as np
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from wildfirepy.io.arraycache import find_dataset
+
+__all__ = ['Viirs1KmMosaic']
+
+
+class Viirs1KmMosaic:
+    """
+    A lazily read mosaic of one dataset over several VIIRS 1 km tiles.
+
+    The mosaic spans the global Sinusoidal pixel grid, so pixel ``(row, col)``
+    of tile ``(h, v)`` sits at ``(v * 1200 + row, h * 1200 + col)`` relative
+    to `origin`. Nothing is read until the mosaic is indexed, and then only
+    the parts of the tiles overlapping the requested window. Pixels outside
+    the available tiles are set to `fill_value`.
+
+    Parameters
+    ----------
+    files: `dict`
+        Maps tile coordinates ``(h, v)`` to granule paths. `None` marks a
+        tile without data, e.g. over the ocean.
+    dataset: `str`
+        Name or path of the dataset within each granule, e.g. ``'FireMask'``.
+    bbox: `tuple`
+        ``(min_latitude, min_longitude, max_latitude, max_longitude)`` to
+        crop the mosaic to. By default the mosaic covers the whole tiles.
+    fill_value: number
+        Value of pixels without data. By default 0.
+
+    Examples
+    --------
+    >>> mosaic = Viirs1KmMosaic.from_bbox((35, -125, 42, -114), obsdate='2020-09-01')
+    >>> firemask = mosaic[1000:2000, 500:1500]
+    """
+    CELLS = 1200
+
+    def __init__(self, files, dataset, bbox=None, fill_value=0):
+        self.files = dict(files)
+        self.dataset = dataset
+        self.bbox = bbox
+        self.fill_value = fill_value
+        self.converter = SinusoidalCoordinate()
+        self._datasets = {}
+        self._lock = threading.Lock()
+
+        if not self.files:
+            raise ValueError("A mosaic needs at least one tile.")
+        rows, cols = [], []
+        for h, v in self.files:
+            if bbox is None:
+                window = (slice(0, self.CELLS), slice(0, self.CELLS))
+            else:
+                window = self.converter.get_pixel_window(h, v, bbox, resolution='1km')
+                if window is None:
+                    continue
+            rows += [v * self.CELLS + window[0].start, v * self.CELLS + window[0].stop]
+            cols += [h * self.CELLS + window[1].start, h * self.CELLS + window[1].stop]
+        if not rows:
+            raise ValueError("None of the tiles intersect the bounding box.")
+        self.origin = (min(rows), min(cols))
+        self.shape = (max(rows) - self.origin[0], max(cols) - self.origin[1])
+
+    @classmethod
+    def from_bbox(cls, bbox, obsdate, product='VNP14A1', dataset='FireMask', fill_value=0,
+                  max_workers=4, downloader=None, **kwargs):
+        """
+        Builds the mosaic of every tile intersecting `bbox` on one day.
+
+        Tiles missing from the local disk are downloaded concurrently. Tiles
+        that cannot be fetched, e.g. because no granule exists over the
+        ocean, are left out and read as `fill_value`.
+
+        Parameters
+        ----------
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)`` in degrees.
+        obsdate: `str`
+            The date of observation.
+        product: `str`
+            Either ``'VNP14A1'`` (fire) or ``'VNP09GA'`` (surface). By default ``'VNP14A1'``.
+        dataset: `str`
+            Name or path of the dataset within each granule. By default ``'FireMask'``.
+        fill_value: number
+            Value of pixels without data. By default 0.
+        max_workers: `int`
+            Maximum number of concurrent downloads. By default 4.
+        downloader: `~wildfirepy.net.Viirs1KMDownloader`
+            Downloader to use. By default a new one.
+        kwargs: `dict`
+            Keyword arguments for `Viirs1KMDownloader.get_product`, e.g. ``path`` or ``fmt``.
+        """
+        # Imported here, so reading local granules does not load the network stack.
+        from wildfirepy.net import Viirs1KMDownloader
+        from wildfirepy.net.util.bulk import fetch_many
+
+        if downloader is None:
+            downloader = Viirs1KMDownloader()
+        tiles = SinusoidalCoordinate().get_tiles(bbox)
+
+        def get_product(**request):
+            return downloader.get_product(product, **request)
+
+        results = fetch_many(get_product, [{'tile': tile} for tile in tiles],
+                             max_workers=max_workers, obsdate=obsdate, **kwargs)
+        files = {}
+        for result in results:
+            if result.error is not None:
+                warnings.warn(UserWarning(f"Tile h{result.request['tile'][0]:02d}"
+                                          f"v{result.request['tile'][1]:02d} could not be "
+                                          f"fetched: {result.error}"))
+            files[result.request['tile']] = result.path
+        return cls(files, dataset, bbox=bbox, fill_value=fill_value)
+
+    def _get_dataset(self, tile):
+        with self._lock:
+            if tile not in self._datasets:
+                filename = self.files[tile]
+                dataset = None
+                if filename is not None:
+                    h5file = h5py.File(filename, 'r')
+                    try:
+                        dataset = find_dataset(h5file, self.dataset)
+                    except KeyError:
+                        h5file.close()
+                        raise
+                self._datasets[tile] = dataset
+            return self._datasets[tile]
+
+    @property
+    def dtype(self):
+        for tile in self.files:
+            dataset = self._get_dataset(tile)
+            if dataset is not None:
+                return dataset.dtype
+        return np.asarray(self.fill_value).dtype
+
+    @property
+    def ndim(self):
+        return 2
+
+    def __getitem__(self, key):
+        return self.read(key)
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.read()
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __repr__(self):
+        return (f"<Viirs1KmMosaic {self.dataset!r} shape={self.shape} "
+                f"tiles={sorted(self.files)}>")
+
+    def read(self, window=None):
+        """
+        Reads a window of the mosaic.
+
+        Parameters
+        ----------
+        window: `tuple` of `slice`
+            Row and column slices relative to the mosaic. By default all of it.
+
+        Returns
+        -------
+        data: `numpy.ndarray`
+        """
+        if window is None:
+            window = (slice(None), slice(None))
+        bounds = []
+        for size, selection in zip(self.shape, window):
+            start, stop, step = selection.indices(size)
+            if step != 1:
+                raise ValueError("Windows must be contiguous.")
+            bounds.append((start, max(start, stop)))
+        (row_start, row_stop), (col_start, col_stop) = bounds
+        out = np.full((row_stop - row_start, col_stop - col_start), self.fill_value,
+                      dtype=self.dtype)
+
+        # Global pixel coordinates of the window.
+        row_start += self.origin[0]
+        row_stop += self.origin[0]
+        col_start += self.origin[1]
+        col_stop += self.origin[1]
+        for h, v in self.files:
+            top = max(row_start, v * self.CELLS)
+            bottom = min(row_stop, (v + 1) * self.CELLS)
+            left = max(col_start, h * self.CELLS)
+            right = min(col_stop, (h + 1) * self.CELLS)
+            if top >= bottom or left >= right:
+                continue
+            dataset = self._get_dataset((h, v))
+            if dataset is None:
+                continue
+            dataset.read_direct(out,
+                                np.s_[top - v * self.CELLS:bottom - v * self.CELLS,
+                                      left - h * self.CELLS:right - h * self.CELLS],
+                                np.s_[top - row_start:bottom - row_start,
+                                      left - col_start:right - col_start])
+        return out
+
+    def get_lat_lon(self, row, col):
+        """
+        Returns latitude and longitude of mosaic pixel centres.
+
+        Parameters
+        ----------
+        row, col: `int` or array-like
+            Pixel coordinates relative to the mosaic.
+        """
+        return self.converter.get_pixel_lat_lon(0, 0, np.asarray(row) + self.origin[0],
+                                                np.asarray(col) + self.origin[1])
+
+    def close(self):
+        """
+        Closes every opened granule.
+        """
+        with self._lock:
+            for dataset in self._datasets.values():
+                if dataset is not None:
+                    dataset.file.close()
+            self._datasets.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,100 @@
+import h5py
+import numpy as np
+import pytest
+from wildfirepy.io.arraycache import (ArrayCache, CachedDataset, find_dataset,
+                                      get_granule_id)
+
+GRANULE = 'VNP14A1.A2020032.h24v06.001.2020034000000'
+
+
+@pytest.fixture
+def granule(tmp_path):
+    filename = tmp_path / f'{GRANULE}.h5'
+    with h5py.File(filename, 'w') as h5file:
+        fields = h5file.create_group('HDFEOS/GRIDS/VNP14A1_Grid/Data Fields')
+        firemask = fields.create_dataset('FireMask', compression='gzip',
+                                         data=np.arange(1200 * 1200).reshape(1200, 1200) % 10)
+        firemask.attrs['legend'] = b'0 not processed'
+        fields.create_dataset('MaxFRP', data=np.ones((1200, 1200), dtype=np.int32))
+    return str(filename)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArrayCache(tmp_path / 'arrays')
+
+
+def test_add_and_get(cache, granule):
+    assert get_granule_id(granule) == GRANULE
+    assert cache.get(GRANULE, 'FireMask') is None
+
+    header = cache.add(granule, ['FireMask'])
+    assert header['tile'] == [24, 6]
+    assert header['datasets']['FireMask']['attrs'] == {'legend': '0 not processed'}
+
+    firemask = cache.get(GRANULE, 'FireMask')
+    assert isinstance(firemask, np.memmap)
+    assert not firemask.flags.writeable
+    with h5py.File(granule, 'r') as h5file:
+        expected = h5file['HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/FireMask'][()]
+    np.testing.assert_array_equal(firemask, expected)
+    assert cache.get(GRANULE, 'MaxFRP') is None
+
+
+def test_header_accumulates(cache, granule):
+    cache.add(granule, ['FireMask'])
+    with h5py.File(granule, 'r') as h5file:
+        cache.add(h5file, ['HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/MaxFRP'])
+    assert set(cache.get_header(GRANULE)['datasets']) == {'FireMask', 'MaxFRP'}
+
+    cache.remove(GRANULE)
+    assert cache.get_header(GRANULE) is None
+    assert cache.get(GRANULE, 'FireMask') is None
+    with pytest.raises(KeyError):
+        cache.add(granule, ['QA'])
+
+
+def test_memory_maps_are_bounded(tmp_path, granule):
+    cache = ArrayCache(tmp_path / 'arrays', max_arrays=1)
+    cache.add(granule, ['FireMask', 'MaxFRP'])
+
+    firemask = cache.get(GRANULE, 'FireMask')
+    assert cache.get(GRANULE, 'FireMask') is firemask
+    cache.get(GRANULE, 'MaxFRP')
+    assert list(cache._arrays) == [(GRANULE, 'MaxFRP')]
+    assert cache.get(GRANULE, 'FireMask') is not firemask
+
+
+def test_find_dataset(granule):
+    with h5py.File(granule, 'r') as h5file:
+        path = '/HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/FireMask'
+        assert find_dataset(h5file, 'FireMask').name == path
+        assert find_dataset(h5file, 'HDFEOS/GRIDS/Other/FireMask').name == path
+        with pytest.raises(KeyError):
+            find_dataset(h5file, 'QA')
+
+
+def test_open_cached_granule(cache, granule, monkeypatch):
+    assert cache.open(granule) is None
+    cache.add(granule, ['FireMask'])
+    with h5py.File(granule, 'r') as h5file:
+        expected = h5file['HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/FireMask'][()]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Opened the HDF5 file.")
+    with monkeypatch.context() as patch:
+        patch.setattr(h5py, 'File', fail)
+        cached = cache.open(granule)
+        assert cached.filename == granule
+        for name in ('FireMask', 'HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/FireMask'):
+            firemask = find_dataset(cached, name)
+            assert isinstance(firemask, CachedDataset)
+        assert firemask.attrs == {'legend': '0 not processed'}
+        out = np.zeros((2, 3), dtype=firemask.dtype)
+        firemask.read_direct(out, np.s_[10:12, 20:23])
+        np.testing.assert_array_equal(out, expected[10:12, 20:23])
+        cached.close()
+
+    with cache.open(granule) as cached:
+        np.testing.assert_array_equal(find_dataset(cached, 'MaxFRP'), 1)
+        assert cached.attrs is not None
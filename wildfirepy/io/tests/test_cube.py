@@ -0,0 +1,76 @@
+from datetime import date, datetime
+
+import h5py
+import numpy as np
+import pytest
+from wildfirepy.io.cube import FIREMASK, FireMaskCube
+
+
+class LocalDownloader:
+    """
+    Serves granules from a directory, for days present in it.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.requests = []
+
+    def get_product(self, product, *, obsdate, tile, fmt="%Y-%m-%d", **kwargs):
+        self.requests.append(obsdate)
+        filename = self.directory / f'{datetime.strptime(obsdate, fmt):%Y-%m-%d}.h5'
+        if not filename.exists():
+            raise IOError("Download failed.")
+        return str(filename)
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    for day in (1, 2, 4):
+        with h5py.File(tmp_path / f'2020-06-0{day}.h5', 'w') as h5file:
+            h5file.create_dataset(FIREMASK, data=np.full((1200, 1200), day, dtype=np.uint8))
+    return LocalDownloader(tmp_path)
+
+
+def test_extend_and_read(tmp_path, downloader):
+    filename = tmp_path / 'cube.h5'
+    with FireMaskCube(filename, tile=(24, 6), start='2020-06-01') as cube:
+        with pytest.warns(UserWarning):
+            missing = cube.extend('2020-06-01', '2020-06-04', downloader=downloader)
+        assert missing == [date(2020, 6, 3)]
+        assert cube.dates == [date(2020, 6, 1), date(2020, 6, 2), date(2020, 6, 4)]
+
+        dates, firemask = cube.read('2020-06-02', '2020-06-04', window=(slice(0, 10), slice(5, 7)))
+        assert dates == [date(2020, 6, 2), date(2020, 6, 3), date(2020, 6, 4)]
+        assert firemask.shape == (3, 10, 2)
+        np.testing.assert_array_equal(firemask[:, 0, 0], [2, 0, 4])
+
+
+def test_extend_skips_existing_days(tmp_path, downloader):
+    filename = tmp_path / 'cube.h5'
+    with FireMaskCube(filename, tile=(24, 6), start='2020-06-01') as cube:
+        cube.extend('2020-06-01', '2020-06-02', downloader=downloader)
+
+    downloader.requests.clear()
+    with FireMaskCube(filename) as cube:
+        assert cube.tile == (24, 6)
+        cube.extend('2020-06-01', '2020-06-02', downloader=downloader)
+        assert downloader.requests == []
+        assert cube.firemask.chunks == (32, 150, 150)
+
+
+def test_extend_with_date_format(tmp_path, downloader):
+    with FireMaskCube(tmp_path / 'cube.h5', tile=(24, 6), start='01/06/2020',
+                      fmt='%d/%m/%Y') as cube:
+        cube.extend('01/06/2020', '02/06/2020', downloader=downloader, fmt='%d/%m/%Y')
+        assert cube.dates == [date(2020, 6, 1), date(2020, 6, 2)]
+
+
+def test_invalid_cubes(tmp_path):
+    with pytest.raises(ValueError):
+        FireMaskCube(tmp_path / 'cube.h5')
+    assert not (tmp_path / 'cube.h5').exists()
+    FireMaskCube(tmp_path / 'cube.h5', tile=(24, 6), start=date(2020, 6, 1)).close()
+    with pytest.raises(ValueError):
+        FireMaskCube(tmp_path / 'cube.h5', tile=(25, 6))
+    with FireMaskCube(tmp_path / 'cube.h5') as cube:
+        with pytest.raises(ValueError):
+            cube.append('2020-05-31', np.zeros((1200, 1200), dtype=np.uint8))
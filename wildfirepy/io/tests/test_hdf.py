@@ -1,6 +1,14 @@
+import json
+import os
+import shutil
+from collections import OrderedDict
+
+import h5py
 import numpy as np
 import pytest
-from wildfirepy.io.hdf import ReadH5
+from wildfirepy.io import metadata
+from wildfirepy.io.hdf import LazyDataset, ReadH5
+from wildfirepy.io.metadata import read_metadata
 from wildfirepy.net.usgs import VIIRSBurntAreaDownloader
 
 downloader = VIIRSBurntAreaDownloader()
@@ -21,3 +29,112 @@ def test_readH5(file_path):
     assert components[2].name == 'Longitude'
     assert len(reader.json['groups']) == 9
     assert components[1].data[0][0] == np.float32(-66.592575)
+
+
+@pytest.fixture
+def local_file(tmpdir):
+    path = str(tmpdir / 'granule.h5')
+    with h5py.File(path, 'w') as h5file:
+        fields = h5file.create_group('HDFEOS/GRIDS/VNP14A1_Grid/Data Fields')
+        fields.create_dataset('FireMask', data=np.arange(10000, dtype=np.uint8).reshape(100, 100),
+                              chunks=(25, 50), compression='gzip')
+        h5file.create_dataset('Longitude', data=np.linspace(-180, 180, 50,
+                                                            dtype=np.float32).reshape(5, 10))
+    return path
+
+
+def test_lazy_subdatasets(local_file):
+    with ReadH5(local_file) as reader:
+        reader.tojson()
+        components = {component.name: component for component in reader.subDatasets(lazy=True)}
+        firemask = components['FireMask'].data
+
+        assert isinstance(firemask, LazyDataset)
+        assert firemask.shape == (100, 100)
+        assert firemask.chunks == (25, 50)
+        expected = np.arange(10000, dtype=np.uint8).reshape(100, 100)
+        np.testing.assert_array_equal(firemask[10:20, 30:40], expected[10:20, 30:40])
+        np.testing.assert_array_equal(np.asarray(components['Longitude'].data),
+                                      np.linspace(-180, 180, 50, dtype=np.float32).reshape(5, 10))
+    assert reader._file is None
+
+
+def test_lazy_iter_chunks(local_file):
+    with ReadH5(local_file) as reader:
+        reader.tojson()
+        firemask = [c for c in reader.subDatasets(lazy=True) if c.name == 'FireMask'][0].data
+        blocks = list(firemask.iter_chunks())
+
+        assert len(blocks) == 8
+        assembled = np.zeros(firemask.shape, dtype=firemask.dtype)
+        for selection, block in blocks:
+            assembled[selection] = block
+        np.testing.assert_array_equal(assembled, firemask.read())
+
+
+def _by_alias(collection):
+    return {item['alias'][0]: item for item in collection.values()}
+
+
+def test_fast_tojson_matches_h5json(local_file, tmpdir, monkeypatch):
+    monkeypatch.setenv('WILDFIREPY_CACHE_DIR', str(tmpdir / 'cache'))
+    expected = json.loads(json.dumps(ReadH5(local_file).tojson()))
+    result = ReadH5(local_file).tojson(fast=True)
+
+    assert _by_alias(result['groups']).keys() == _by_alias(expected['groups']).keys()
+    expected_datasets = _by_alias(expected['datasets'])
+    for alias, dataset in _by_alias(result['datasets']).items():
+        assert dataset['type'] == expected_datasets[alias]['type']
+        assert dataset['shape'] == expected_datasets[alias]['shape']
+        properties = expected_datasets[alias]['creationProperties']
+        assert dataset['creationProperties']['layout'] == properties['layout']
+        assert dataset['creationProperties'].get('filters') == properties.get('filters')
+
+
+def test_fast_tojson_attributes_and_cache(local_file, tmpdir, monkeypatch):
+    monkeypatch.setenv('WILDFIREPY_CACHE_DIR', str(tmpdir / 'cache'))
+    with h5py.File(local_file, 'a') as h5file:
+        h5file['Longitude'].attrs['Scale'] = np.array([0.5])
+
+    first = read_metadata(local_file)
+    second = read_metadata(local_file)
+    assert second == first and second is not first
+    assert len(list((tmpdir / 'cache' / 'metadata').listdir())) == 1
+
+    longitude = _by_alias(first['datasets'])['/Longitude']
+    assert longitude['attributes'] == [{'name': 'Scale',
+                                        'type': {'class': 'H5T_FLOAT', 'base': 'H5T_IEEE_F64LE'},
+                                        'shape': {'class': 'H5S_SIMPLE', 'dims': [1]},
+                                        'value': [0.5]}]
+
+    with h5py.File(local_file, 'a') as h5file:
+        h5file['Longitude'].attrs['Scale'] = np.array([0.25])
+    os.utime(local_file, ns=(os.stat(local_file).st_atime_ns, os.stat(local_file).st_mtime_ns + 10))
+
+    changed = _by_alias(read_metadata(local_file)['datasets'])['/Longitude']
+    assert changed['attributes'][0]['value'] == [0.25]
+
+    with ReadH5(local_file) as reader:
+        reader.tojson(fast=True)
+        assert {component.name for component in reader.subDatasets()} == {'FireMask', 'Longitude'}
+
+
+def test_metadata_cache_returns_copies(local_file, tmpdir, monkeypatch):
+    monkeypatch.setenv('WILDFIREPY_CACHE_DIR', str(tmpdir / 'cache'))
+    first = read_metadata(local_file)
+    first['datasets'].clear()
+
+    assert read_metadata(local_file)['datasets']
+
+
+def test_metadata_memory_cache_is_bounded(local_file, tmpdir, monkeypatch):
+    monkeypatch.setenv('WILDFIREPY_CACHE_DIR', str(tmpdir / 'cache'))
+    monkeypatch.setattr(metadata, '_MEMORY_CACHE_SIZE', 2)
+    monkeypatch.setattr(metadata, '_memory_cache', OrderedDict())
+    copies = []
+    for index in range(3):
+        copies.append(str(tmpdir / f'copy{index}.h5'))
+        shutil.copy(local_file, copies[-1])
+        read_metadata(copies[-1])
+
+    assert list(metadata._memory_cache) == copies[1:]
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from wildfirepy.io.mcd64a1 import (PIXEL_AREA, get_burned_area,
+                                   get_burned_area_many, read_mcd64a1)
+
+SD = pytest.importorskip('pyhdf.SD')
+
+POLYGON = [(25, 70), (29, 70), (29, 73), (25, 73)]
+
+
+def write_granule(filename, burn_date):
+    hdf = SD.SD(str(filename), SD.SDC.WRITE | SD.SDC.CREATE)
+    dataset = hdf.create('Burn Date', SD.SDC.INT16, burn_date.shape)
+    dataset[:] = burn_date
+    dataset.endaccess()
+    hdf.end()
+
+
+@pytest.fixture
+def granules(tmp_path):
+    burn_date = np.zeros((2400, 2400), dtype=np.int16)
+    burn_date[:100] = -2
+    burn_date[1000:1010, 1000:1020] = 33
+    burn_date[0:5, 0:4] = 40
+    burn_date[2000, 2000] = -1
+    filenames = []
+    for doy, h in ((32, 24), (32, 25), (61, 24)):
+        filename = tmp_path / f'MCD64A1.A2020{doy:03d}.h{h}v06.006.2020102114146.hdf'
+        write_granule(filename, burn_date)
+        filenames.append(filename)
+    return filenames
+
+
+def test_read(granules):
+    burn_date = read_mcd64a1(granules[0])
+    assert burn_date.shape == (2400, 2400)
+    assert burn_date[1000, 1000] == 33
+
+
+def test_burned_area(granules):
+    area = get_burned_area(granules[0], polygons={'box': POLYGON})
+    assert area.tile == (24, 6)
+    assert (area.year, area.month) == (2020, 2)
+    assert area.daily[33] == pytest.approx(200 * PIXEL_AREA)
+    assert area.daily[40] == pytest.approx(20 * PIXEL_AREA)
+    assert area.total == pytest.approx(220 * PIXEL_AREA)
+    assert PIXEL_AREA == pytest.approx(0.2147, rel=1e-3)
+
+    # Pixel (1000, 1000) of h24v06 lies near 25.8 N 71.3 E, pixel (0, 0) near 30 N.
+    assert area.polygons['box'][33] == pytest.approx(200 * PIXEL_AREA)
+    assert area.polygons['box'][40] == 0
+
+
+def test_burned_area_many(granules):
+    areas = get_burned_area_many(list(reversed(granules)), max_workers=2)
+    assert [area.filename for area in areas] == [str(filename) for filename in reversed(granules)]
+    assert [area.month for area in areas] == [3, 2, 2]
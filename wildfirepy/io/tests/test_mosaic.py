@@ -0,0 +1,65 @@
+import h5py
+import numpy as np
+import pytest
+from wildfirepy.io.mosaic import Viirs1KmMosaic
+
+FIREMASK = 'HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/FireMask'
+
+
+@pytest.fixture
+def files(tmp_path):
+    files = {}
+    for h, value in ((24, 1), (25, 2)):
+        filename = tmp_path / f'VNP14A1.A2020032.h{h}v06.001.2020034000000.h5'
+        with h5py.File(filename, 'w') as h5file:
+            h5file.create_dataset(FIREMASK, data=np.full((1200, 1200), value, dtype=np.uint8),
+                                  chunks=(100, 1200))
+        files[(h, 6)] = str(filename)
+    files[(24, 7)] = None
+    return files
+
+
+def test_mosaic_layout(files):
+    with Viirs1KmMosaic(files, 'FireMask') as mosaic:
+        assert mosaic.origin == (6 * 1200, 24 * 1200)
+        assert mosaic.shape == (2400, 2400)
+        assert mosaic.dtype == np.uint8
+
+        window = mosaic[1100:1300, 1100:1300]
+        np.testing.assert_array_equal(window[:100, :100], 1)
+        np.testing.assert_array_equal(window[:100, 100:], 2)
+        np.testing.assert_array_equal(window[100:], 0)
+
+
+def test_mosaic_reads_lazily(files):
+    mosaic = Viirs1KmMosaic(files, FIREMASK)
+    mosaic[:10, :10]
+    assert list(mosaic._datasets) == [(24, 6)]
+    mosaic.close()
+
+
+def test_mosaic_bbox(files):
+    mosaic = Viirs1KmMosaic(files, 'FireMask', bbox=(25, 70, 26, 80))
+    assert mosaic.shape[0] < 1200
+    latitude, longitude = mosaic.get_lat_lon([0, mosaic.shape[0] - 1], [0, 0])
+    np.testing.assert_allclose(latitude, [26, 25], atol=1 / 120)
+    assert set(np.unique(mosaic.read())) == {1, 2}
+    mosaic.close()
+
+    with pytest.raises(ValueError):
+        Viirs1KmMosaic(files, 'FireMask', bbox=(-10, 0, -5, 5))
+
+
+def test_missing_dataset_closes_file(files, monkeypatch):
+    opened = []
+
+    def open_file(*args, **kwargs):
+        opened.append(File(*args, **kwargs))
+        return opened[-1]
+    File = h5py.File
+    monkeypatch.setattr(h5py, 'File', open_file)
+
+    mosaic = Viirs1KmMosaic(files, 'QA')
+    with pytest.raises(KeyError):
+        mosaic[:10, :10]
+    assert len(opened) == 1 and not opened[0].id.valid
@@ -1,16 +1,94 @@
+from collections import namedtuple
+from pathlib import Path
+
 import h5py
-from wildfirepy.net import Viirs1KMDownloader
+import numpy as np
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from wildfirepy.granule import parse_granule
+from wildfirepy.io.arraycache import (CachedGranule, find_dataset,
+                                      get_array_cache, get_granule_id)
+
+__all__ = ['FirePixels', 'Viirs1KmLoader']
+
+FIRE_FIELDS = 'HDFEOS/GRIDS/VNP14A1_Grid/Data Fields'
+SURFACE_FIELDS = 'HDFEOS/GRIDS/VNP_Grid_1km_2D/Data Fields'
+
+# Datasets `Viirs1KmLoader.cache_granule` stores by default, by product.
+CACHED_DATASETS = {
+    'VNP14A1': ('FireMask', 'QA', 'MaxFRP'),
+    'VNP09GA': ('SurfReflect_M3_1', 'SurfReflect_M4_1', 'SurfReflect_M5_1',
+                'SurfReflect_M7_1'),
+}
 
-__all__ = ['Viirs1KmLoader']
+FirePixels = namedtuple('FirePixels', ['row', 'col', 'latitude', 'longitude', 'confidence', 'frp'])
+FirePixels.__doc__ = """
+Fire detections of a tile as columns of equal length.
+
+Parameters
+----------
+row: `numpy.ndarray`
+    Pixel row within the tile.
+col: `numpy.ndarray`
+    Pixel column within the tile.
+latitude: `numpy.ndarray`
+    Latitude of the pixel centre in degrees.
+longitude: `numpy.ndarray`
+    Longitude of the pixel centre in degrees.
+confidence: `numpy.ndarray`
+    `FireMask` class: 7 (low), 8 (nominal) or 9 (high confidence).
+frp: `numpy.ndarray`
+    Maximum fire radiative power in MW, NaN where the granule has no `MaxFRP`.
+"""
 
 
 class Viirs1KmLoader:
-    def __init__(self):
-        self.Viirs1KMDownloader = Viirs1KMDownloader()
+    """
+    Opens and reads VIIRS 1 km surface and fire granules.
+
+    Parameters
+    ----------
+    cache: `~wildfirepy.io.arraycache.ArrayCache` or `bool`
+        Cache of decompressed datasets. Granules added to it with
+        `cache_granule` are opened from there, and their datasets read as
+        memory maps instead of from the HDF5 file. By default the
+        process-wide cache; `False` disables it.
+    """
+    def __init__(self, cache=None):
+        self._downloader = None
+        self.converter = SinusoidalCoordinate()
+        if cache is None or cache is True:
+            cache = get_array_cache()
+        self.cache = cache or None
+
+    @property
+    def Viirs1KMDownloader(self):
+        """
+        The downloader for granules missing on the disk, created on first use.
+        """
+        if self._downloader is None:
+            # Imported here, so reading local granules does not load the network stack.
+            from wildfirepy.net import Viirs1KMDownloader
+
+            self._downloader = Viirs1KMDownloader()
+        return self._downloader
+
+    def open(self, filename):
+        """
+        Opens a granule, from the array cache if it has been cached.
+
+        Returns
+        -------
+        data: `h5py.File` or `~wildfirepy.io.arraycache.CachedGranule`
+        """
+        if self.cache is not None:
+            granule = self.cache.open(filename)
+            if granule is not None:
+                return granule
+        return h5py.File(filename, 'r')
 
     def get_data(self, data):
-        surface_data = h5py.File(data['surface'], 'r')
-        fire_data = h5py.File(data['fire'], 'r')
+        surface_data = self.open(data['surface'])
+        fire_data = self.open(data['fire'])
         return {'surface': surface_data, 'fire': fire_data, 'datatype': 'Viirs1Km'}
 
     def list_all_keys(self, data):
@@ -25,8 +103,182 @@ class Viirs1KmLoader:
     def get_1KM_surface_datafields(self, data):
         return list(data['HDFEOS']['GRIDS']['VNP_Grid_1km_2D']['Data Fields'])
 
-    def get_firemask(self, data):
-        return data['HDFEOS/GRIDS/VNP14A1_Grid/Data Fields/FireMask'][()]
+    def get_tile(self, data):
+        """
+        Returns the Sinusoidal grid coordinates ``(h, v)`` of an opened granule.
+        """
+        granule = parse_granule(Path(data.filename).name)
+        if granule is None or granule.tile is None:
+            raise ValueError("Tile could not be determined from the file name.")
+        return granule.tile
+
+    def get_window(self, data, bbox):
+        """
+        Returns the pixel window of an opened granule covering a bounding box.
+
+        Parameters
+        ----------
+        data: `h5py.File`
+            The opened granule.
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)`` in degrees.
+
+        Returns
+        -------
+        window: `tuple` of `slice`
+            Row and column slices into the 1 km grid.
+        """
+        h, v = self.get_tile(data)
+        window = self.converter.get_pixel_window(h, v, bbox, resolution='1km')
+        if window is None:
+            raise ValueError("The bounding box does not intersect the tile.")
+        return window
+
+    def get_firemask(self, data, window=None, bbox=None):
+        """
+        Reads the `FireMask`, or only the part of it inside a window.
+
+        Parameters
+        ----------
+        data: `h5py.File`
+            The opened fire granule.
+        window: `tuple` of `slice`
+            Row and column slices to read. By default the whole tile.
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)``
+            to read instead of `window`.
+        """
+        if bbox is not None:
+            window = self.get_window(data, bbox)
+        return self.get_dataset(data, f'{FIRE_FIELDS}/FireMask', window)
+
+    def get_surface_bands(self, data):
+        """
+        Returns the red (M5), green (M4), blue (M3) and near infrared (M7) 1 km bands.
+
+        Parameters
+        ----------
+        data: `h5py.File` or `~wildfirepy.io.arraycache.CachedGranule`
+            The opened surface granule.
+        """
+        return tuple(find_dataset(data, f'{SURFACE_FIELDS}/SurfReflect_{band}_1')
+                     for band in ('M5', 'M4', 'M3', 'M7'))
+
+    def get_dataset(self, data, name, window=None):
+        """
+        Reads a dataset, from the array cache if the granule has been cached.
+
+        Parameters
+        ----------
+        data: `h5py.File`
+            The opened granule.
+        name: `str`
+            Name or path of the dataset, e.g. ``'FireMask'``.
+        window: `tuple` of `slice`
+            Row and column slices to read. By default all of it.
+
+        Returns
+        -------
+        array: `numpy.ndarray`
+            A read-only memory map if the dataset is cached.
+        """
+        array = None
+        if self.cache is not None:
+            array = self.cache.get(get_granule_id(data.filename), name.split('/')[-1])
+        if array is None:
+            array = find_dataset(data, name)
+        return array[() if window is None else window]
+
+    def cache_granule(self, data, names=None):
+        """
+        Stores datasets of a granule in the array cache for fast repeated reads.
+
+        Parameters
+        ----------
+        data: `h5py.File` or `str`
+            The granule.
+        names: `list` of `str`
+            Datasets to cache. Missing ones are skipped. By default ``FireMask``,
+            ``QA`` and ``MaxFRP`` of fire granules and the bands of
+            `get_surface_bands` of surface granules.
+
+        Raises
+        ------
+        ValueError
+            If the loader was created with ``cache=False``.
+        """
+        if self.cache is None:
+            raise ValueError("The array cache is disabled for this loader.")
+        if isinstance(data, CachedGranule):
+            data = data.filename
+        if isinstance(data, h5py.File):
+            return self._cache_granule(data, names)
+        with h5py.File(data, 'r') as h5file:
+            return self._cache_granule(h5file, names)
+
+    def _cache_granule(self, data, names):
+        if names is None:
+            granule = parse_granule(Path(data.filename).name)
+            product = granule.product if granule is not None else 'VNP14A1'
+            names = CACHED_DATASETS.get(product, CACHED_DATASETS['VNP14A1'])
+        present = []
+        for name in names:
+            try:
+                find_dataset(data, name)
+            except KeyError:
+                continue
+            present.append(name)
+        return self.cache.add(data, present)
+
+    def get_fire_pixels(self, data, window=None, bbox=None, min_confidence=7):
+        """
+        Extracts the fire detections of a tile in one vectorized pass.
+
+        Parameters
+        ----------
+        data: `h5py.File`
+            The opened fire granule.
+        window: `tuple` of `slice`
+            Row and column slices to search. By default the whole tile.
+        bbox: `tuple`
+            ``(min_latitude, min_longitude, max_latitude, max_longitude)``
+            to search instead of `window`.
+        min_confidence: `int`
+            Lowest `FireMask` class to keep: 7 (low), 8 (nominal) or 9 (high).
+            By default 7.
+
+        Returns
+        -------
+        pixels: `FirePixels`
+        """
+        if bbox is not None:
+            window = self.get_window(data, bbox)
+        firemask = self.get_firemask(data, window=window)
+        rows, cols = np.nonzero(firemask >= min_confidence)
+        confidence = firemask[rows, cols]
+
+        try:
+            frp_dataset = find_dataset(data, f'{FIRE_FIELDS}/MaxFRP')
+        except KeyError:
+            frp = np.full(len(rows), np.nan)
+        else:
+            frp = self.get_dataset(data, frp_dataset.name, window)[rows, cols].astype(np.float64)
+            frp *= _get_attribute(frp_dataset, ('scale_factor', 'Scale'), 1.0)
+            frp += _get_attribute(frp_dataset, ('add_offset', 'Offset'), 0.0)
+
+        if window is not None:
+            rows = rows + (window[0].start or 0)
+            cols = cols + (window[1].start or 0)
+        h, v = self.get_tile(data)
+        latitude, longitude = self.converter.get_pixel_lat_lon(h, v, rows, cols)
+        return FirePixels(rows, cols, latitude, longitude, confidence, frp)
 
     def get_fire_datafields(self, data):
         return list(data['fire']['HDFEOS']['GRIDS']['VNP14A1_Grid']['Data Fields'])
+
+
+def _get_attribute(dataset, names, default):
+    for name in names:
+        if name in dataset.attrs:
+            return np.asarray(dataset.attrs[name]).ravel()[0]
+    return default
@@ -1,2 +1,3 @@
+from wildfirepy.net.snpp.planner import *
 from wildfirepy.net.snpp.util import *
 from wildfirepy.net.snpp.viirs import *
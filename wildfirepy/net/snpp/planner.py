@@ -0,0 +1,238 @@
+import os
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from wildfirepy.coordinates.util import SinusoidalCoordinate
+from wildfirepy.net.snpp.viirs import Viirs1KMDownloader
+from wildfirepy.net.snpp.viirs import path as data_path
+from wildfirepy.net.util.bulk import FetchResult, fetch_many
+from wildfirepy.net.util.catalog import get_catalog
+
+__all__ = ['QueryPlan', 'plan_query']
+
+
+def _to_date(obsdate, fmt):
+    if isinstance(obsdate, datetime):
+        return obsdate.date()
+    if isinstance(obsdate, date):
+        return obsdate
+    return datetime.strptime(obsdate, fmt).date()
+
+
+def _get_tiles(converter, geometry):
+    vertices = np.asarray(geometry, dtype=np.float64)
+    if vertices.shape == (2,):
+        return [converter(*vertices)]
+    if vertices.shape == (4,):
+        return converter.get_tiles(tuple(vertices))
+    if vertices.ndim == 2 and vertices.shape[1] == 2 and len(vertices) >= 3:
+        return converter.get_polygon_tiles(vertices)
+    raise ValueError("geometry must be a (latitude, longitude) point, a (min_latitude, "
+                     "min_longitude, max_latitude, max_longitude) box or a list of "
+                     "(latitude, longitude) polygon vertices.")
+
+
+class QueryPlan:
+    """
+    The granules of one product covering a region over a range of days.
+
+    A plan lists every ``(day, tile)`` pair of the query, split into the
+    granules already on the disk and those that still have to be fetched.
+    `resolve` checks the missing ones against the listing of their date
+    directory, which is fetched once per day, and drops those that do not
+    exist upstream, e.g. tiles over the ocean. `run` then downloads the rest
+    concurrently.
+
+    Use `plan_query` to build a plan.
+
+    Parameters
+    ----------
+    product : str
+        Either ``'VNP14A1'`` (fire) or ``'VNP09GA'`` (surface).
+    tiles : list of tuple
+        Sinusoidal grid coordinates ``(h, v)`` of the query.
+    dates : list of datetime.date
+        Days of the query.
+    local : dict
+        Maps ``(day, tile)`` to the path of granules on the disk.
+    path : str
+        Directory to download missing granules to.
+
+    Attributes
+    ----------
+    missing : list of tuple
+        ``(day, tile)`` pairs to fetch, by day.
+    unavailable : dict
+        Maps ``(day, tile)`` pairs that `resolve` found no granule for to the reason.
+    """
+    def __init__(self, product, tiles, dates, local, path=str(data_path)):
+        self.product = product
+        self.tiles = list(tiles)
+        self.dates = list(dates)
+        self.local = dict(local)
+        self.path = path
+        self.missing = [(day, tile) for day in self.dates for tile in self.tiles
+                        if (day, tile) not in self.local]
+        self.unavailable = {}
+        self.resolved = False
+
+    def __len__(self):
+        return len(self.dates) * len(self.tiles)
+
+    def __repr__(self):
+        return (f"<QueryPlan {self.product} {len(self.tiles)} tiles x {len(self.dates)} days: "
+                f"{len(self.local)} local, {len(self.missing)} to fetch, "
+                f"{len(self.unavailable)} unavailable>")
+
+    @property
+    def batches(self):
+        """
+        The tiles to fetch, grouped by day, i.e. by date directory.
+        """
+        batches = {}
+        for day, tile in self.missing:
+            batches.setdefault(day, []).append(tile)
+        return batches
+
+    @property
+    def requests(self):
+        """
+        The downloads of the plan, as requests for `Viirs1KMDownloader.fetch_many`.
+        """
+        return [{'product': self.product, 'obsdate': day.isoformat(), 'tile': tile}
+                for day, tile in self.missing]
+
+    def _get_client(self, downloader):
+        clients = {client.product: client
+                   for client in (downloader.surface_client, downloader.fire_client)}
+        if self.product not in clients:
+            raise ValueError(f"Product must be one of {list(clients)}.")
+        return clients[self.product]
+
+    def resolve(self, downloader=None, max_workers=4):
+        """
+        Checks the granules to fetch against the listings of their date directories.
+
+        Each listing is fetched once, concurrently across days, and kept in
+        the listing cache for the downloads.
+
+        Parameters
+        ----------
+        downloader : Viirs1KMDownloader, optional
+            Downloader to use, by default a new one.
+        max_workers : int, optional
+            Maximum number of concurrent listing requests, by default 4.
+
+        Returns
+        -------
+        plan : QueryPlan
+            The plan itself.
+        """
+        client = self._get_client(downloader or Viirs1KMDownloader())
+        batches = self.batches
+        results = fetch_many(client.get_listing,
+                             [{'obsdate': day.isoformat()} for day in batches],
+                             max_workers=max_workers)
+        missing = []
+        for day, result in zip(batches, results):
+            for tile in batches[day]:
+                if result.error is not None:
+                    self.unavailable[day, tile] = result.error
+                elif tile not in result.path.tiles:
+                    self.unavailable[day, tile] = ValueError("No file exists for given "
+                                                             "coordinates.")
+                else:
+                    missing.append((day, tile))
+        self.missing = missing
+        self.resolved = True
+        return self
+
+    def run(self, downloader=None, max_workers=4, **kwargs):
+        """
+        Resolves the plan if needed and downloads the missing granules.
+
+        Parameters
+        ----------
+        downloader : Viirs1KMDownloader, optional
+            Downloader to use, by default a new one.
+        max_workers : int, optional
+            Maximum number of concurrent downloads, by default 4.
+        kwargs : dict
+            Keyword arguments for `Viirs1KM.fetch`, e.g. ``verify``.
+
+        Returns
+        -------
+        results : list of FetchResult
+            One result per ``(day, tile)`` of the query, by day and tile.
+            Granules on the disk and those found unavailable are included.
+        """
+        downloader = downloader or Viirs1KMDownloader()
+        if not self.resolved:
+            self.resolve(downloader, max_workers=max_workers)
+        fetched = downloader.fetch_many(self.requests, max_workers=max_workers, path=self.path,
+                                        **kwargs)
+        results = dict(zip(self.missing, fetched))
+
+        ordered = []
+        for day in self.dates:
+            for tile in self.tiles:
+                request = {'product': self.product, 'obsdate': day.isoformat(), 'tile': tile}
+                if (day, tile) in results:
+                    ordered.append(results[day, tile])
+                elif (day, tile) in self.local:
+                    ordered.append(FetchResult(request, self.local[day, tile], None))
+                else:
+                    ordered.append(FetchResult(request, None, self.unavailable.get((day, tile))))
+        return ordered
+
+
+def plan_query(geometry, start, end, product='VNP14A1', fmt="%Y-%m-%d", path=str(data_path),
+               catalog=None):
+    """
+    Expands a region and a range of days into the granules covering them.
+
+    Parameters
+    ----------
+    geometry : tuple or list
+        A ``(latitude, longitude)`` point, a ``(min_latitude, min_longitude,
+        max_latitude, max_longitude)`` box or a list of ``(latitude,
+        longitude)`` polygon vertices, in degrees.
+    start, end : str or datetime.date
+        First and last day of the query, inclusive.
+    product : str, optional
+        Either ``'VNP14A1'`` (fire) or ``'VNP09GA'`` (surface), by default ``'VNP14A1'``.
+    fmt : str, optional
+        The format of days given as strings, by default "%Y-%m-%d"
+    path : str, optional
+        Directory holding local granules and receiving downloads,
+        by default ~wildfirepy/data/VIIRS1KM
+    catalog : GranuleCatalog, optional
+        Catalog of local granules, by default the shared one.
+
+    Returns
+    -------
+    plan : QueryPlan
+
+    Examples
+    --------
+    >>> california = [(42, -124.4), (42, -120), (39, -120), (35, -114.6), (32.5, -114.6),
+    ...               (32.5, -117.1), (34.5, -120.6), (40.4, -124.4)]
+    >>> plan = plan_query(california, '2020-06-01', '2020-09-30')
+    >>> results = plan.run(max_workers=8)
+    """
+    start, end = _to_date(start, fmt), _to_date(end, fmt)
+    if end < start:
+        raise ValueError(f"end ({end}) is before start ({start}).")
+    tiles = _get_tiles(SinusoidalCoordinate(), geometry)
+    dates = [start + timedelta(days=day) for day in range((end - start).days + 1)]
+
+    catalog = catalog or get_catalog()
+    catalog.ensure_scanned(path)
+    wanted = {(day, tile) for day in dates for tile in tiles}
+    local = {}
+    # Sorted, so the latest production of a granule comes last and wins.
+    for granule, filepath in catalog.get_granules(product, directory=path):
+        key = (granule.date, granule.tile)
+        if key in wanted and os.path.exists(filepath):
+            local[key] = filepath
+    return QueryPlan(product, tiles, dates, local, path=path)
@@ -1,72 +1,55 @@
-import re
-import urllib
-import urllib.request
-from http.cookiejar import CookieJar
-from urllib.request import (HTTPBasicAuthHandler, HTTPCookieProcessor,
-                            HTTPPasswordMgrWithDefaultRealm)
+import threading
 
-__all__ = ['URLOpenerWithRedirect', 'Viirs1KMParser']
-
-
-class URLOpenerWithRedirect:
-    """
-    A `urllib` based URL opener for URLs that require Login Authentication
-    and lead to redirects.
-    Creates a minimal opener with a HTTP Password Manager, and a HTTP CookieJar
+from wildfirepy.net.util.cache import get_listing_cache
+from wildfirepy.net.util.listing import _get_index
+from wildfirepy.net.util.usgs import URLOpenerWithRedirect
 
-    Parameters
-    ----------
-    username: `str`
-        The login username required to open the URL.
-    password: `str`
-        The login password required to open the URL.
-    top_level_url: `str`
-        Base URL that leads to the login redirects.
-
-    Returns
-    -------
-    response: `http.client.HTTPResponse`
-        When called with a URL, authenticates the domain from `top_level_url`
-        and returns the corresponding response object for the URL.
+__all__ = ['URLOpenerWithRedirect', 'Viirs1KMParser']
 
-    Examples
-    --------
-    >>> opener = URLOpenerWithRedirect()
-    >>> response = opener(url)
 
-    >>> username = "MyName"
-    >>> password = "MyPassword"
-    >>> top_level_url = "https://top_level_url.com/"
-    >>> opener = URLOpenerWithRedirect(username=username, password=password, top_level_url=top_level_url)
-    >>> response = opener(url)
-    """
-    def __init__(self, *, username='RaahulSingh', password='WildFire_Bad.100',
-                 top_level_url="https://urs.earthdata.nasa.gov/"):
+class Viirs1KMParser:
+    def __init__(self, product, url, listing_cache=None):
+        self.url_opener = URLOpenerWithRedirect()
+        self.product = product
+        self.url = url
+        self._listing_cache = listing_cache
+        self._local = threading.local()
 
-        auth_manager = HTTPPasswordMgrWithDefaultRealm()
-        auth_manager.add_password(None, top_level_url, username, password)
-        handler = HTTPBasicAuthHandler(auth_manager)
-        self.opener = urllib.request.build_opener(handler, HTTPCookieProcessor(CookieJar()))
-        # TODO: Get an organisation username and password.
+    @property
+    def listing_cache(self):
+        return self._listing_cache or get_listing_cache()
 
     def __call__(self, url):
-        return self.opener.open(url)
+        self.html_content = self.listing_cache.get(url, self.url_opener)
 
+    @property
+    def html_content(self):
+        """
+        The last listing fetched by the calling thread, by default the one at `url`.
 
-class Viirs1KMParser:
-    def __init__(self, product, url):
-        self.url_opener = URLOpenerWithRedirect()
-        self.product = product
-        self.html_content = self.url_opener(url).read().decode('cp1252')
+        The default listing is only fetched when it is first needed.
+        """
+        if not hasattr(self._local, 'html_content'):
+            self(self.url)
+        return self._local.html_content
 
-    def __call__(self, url):
-        self.html_content = self.url_opener(url).read().decode('cp1252')
+    @html_content.setter
+    def html_content(self, content):
+        self._local.html_content = content
+
+    @property
+    def index(self):
+        """
+        The `~wildfirepy.net.util.listing.ListingIndex` of the `h5` files in
+        `html_content`, built once per listing.
+        """
+        return _get_index(self._local, self.html_content, self.product, 'h5')
 
     def get_all_h5_files(self):
         """
         Returns list of all `h5` files available for download.
         """
-        return re.findall(r'' + f'href="({self.product}.*h5)"', self.html_content)
+        return list(self.index.files)
 
     def get_filename(self, h, v):
         """
@@ -83,13 +66,4 @@ class Viirs1KMParser:
         ----------
         [1] https://modis-land.gsfc.nasa.gov/MODLAND_grid.html
         """
-        h = str(h) if h > 9 else "0" + str(h)
-        v = str(v) if v > 9 else "0" + str(v)
-
-        r = re.compile(r'.*' + f'.(h{h}v{v}).')
-
-        match = list(filter(r.match, self.get_all_h5_files()))
-        if len(match) == 0:
-            raise ValueError("No file exists for given coordinates.")
-
-        return match[0]
+        return self.index.get_tile(h, v)
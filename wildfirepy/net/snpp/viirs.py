@@ -1,12 +1,16 @@
-import glob
-import re
+import asyncio
 import warnings
 from datetime import datetime
 from pathlib import Path
 from urllib.error import HTTPError
 
 from wildfirepy.coordinates.util import SinusoidalCoordinate
-from wildfirepy.net.snpp import URLOpenerWithRedirect, Viirs1KMParser
+from wildfirepy.granule import parse_granule
+from wildfirepy.net.snpp.util import URLOpenerWithRedirect, Viirs1KMParser
+from wildfirepy.net.util.aio import AsyncClient, fetch_many_async
+from wildfirepy.net.util.bulk import fetch_many
+from wildfirepy.net.util.catalog import get_catalog
+from wildfirepy.net.util.download import download, get_granule_metadata
 
 __all__ = ['Viirs1KMDownloader']
 
@@ -30,7 +34,35 @@ class Viirs1KM:
         self.converter = SinusoidalCoordinate()
         self.url_opener = URLOpenerWithRedirect()
 
-    def get_filename(self, latitude: float, longitude: float):
+    @property
+    def aio(self):
+        """
+        An `~wildfirepy.net.util.aio.AsyncClient` exposing every method as a coroutine.
+        """
+        return AsyncClient(self)
+
+    def get_listing(self, *, obsdate: str, fmt: str = "%Y-%m-%d"):
+        """
+        Returns the index of the listing of one date directory.
+
+        Parameters
+        ----------
+        obsdate : str
+            The date of observation.
+        fmt : str, optional
+            The format in which the obsdate is given,
+            by default "%Y-%m-%d"
+
+        Returns
+        -------
+        index : ListingIndex
+            The granules available on that date.
+        """
+        obsdate = datetime.strptime(obsdate, fmt)
+        self.regex_traverser(self.base_url + obsdate.strftime("%Y.%m.%d") + '/')
+        return self.regex_traverser.index
+
+    def get_filename(self, latitude: float = None, longitude: float = None, tile: tuple = None):
         """
         Returns name of file for given latitude and longitude.
 
@@ -40,12 +72,15 @@ class Viirs1KM:
             latitude of the observation.
         longitude: float
             longitude of the observation.
+        tile: tuple, optional
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            latitude and longitude if given.
         """
-        h, v = self.converter(latitude, longitude)
+        h, v = tile if tile is not None else self.converter(latitude, longitude)
         return self.regex_traverser.get_filename(h, v)
 
-    def get_h5(self, *, obsdate: str, latitude: float,
-               longitude: float, fmt: str = "%Y-%m-%d", **kwargs):
+    def get_h5(self, *, obsdate: str, latitude: float = None, longitude: float = None,
+               tile: tuple = None, fmt: str = "%Y-%m-%d", **kwargs):
         """
         Downloads the `h5` file and stores it on the disk.
 
@@ -57,6 +92,9 @@ class Viirs1KM:
             latitude of the observation.
         longitude: float
             longitude of the observation.
+        tile: tuple, optional
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            latitude and longitude if given.
         fmt : str, optional
             The format in which the obsdate is given,
             by default "%Y-%m-%d"
@@ -70,12 +108,12 @@ class Viirs1KM:
         date = obsdate.strftime("%Y.%m.%d") + '/'
         self.regex_traverser(self.base_url + date)
 
-        filename = self.get_filename(latitude, longitude)
+        filename = self.get_filename(latitude, longitude, tile)
         url = self.base_url + date + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
-    def get_xml(self, *, obsdate: str, latitude: float,
-                longitude: float, fmt: str = "%Y-%m-%d", **kwargs):
+    def get_xml(self, *, obsdate: str, latitude: float = None, longitude: float = None,
+                tile: tuple = None, fmt: str = "%Y-%m-%d", **kwargs):
         """
         Downloads the `xml` file and stores it on the disk.
 
@@ -87,6 +125,9 @@ class Viirs1KM:
             latitude of the observation.
         longitude: float
             longitude of the observation.
+        tile: tuple, optional
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            latitude and longitude if given.
         fmt : str, optional
             The format in which the obsdate is given,
             by default "%Y-%m-%d"
@@ -100,12 +141,12 @@ class Viirs1KM:
         date = obsdate.strftime("%Y.%m.%d") + '/'
         self.regex_traverser(self.base_url + date)
 
-        filename = self.get_filename(latitude, longitude) + ".xml"
+        filename = self.get_filename(latitude, longitude, tile) + ".xml"
         url = self.base_url + date + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
-    def get_jpg(self, *, obsdate: str, latitude: float,
-                longitude: float, fmt: str = "%Y-%m-%d", **kwargs):
+    def get_jpg(self, *, obsdate: str, latitude: float = None, longitude: float = None,
+                tile: tuple = None, fmt: str = "%Y-%m-%d", **kwargs):
         """
         Downloads the `jpg` file and stores it on the disk.
 
@@ -117,6 +158,9 @@ class Viirs1KM:
             latitude of the observation.
         longitude: float
             longitude of the observation.
+        tile: tuple, optional
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            latitude and longitude if given.
         fmt : str, optional
             The format in which the obsdate is given,
             by default "%Y-%m-%d"
@@ -126,15 +170,16 @@ class Viirs1KM:
         filepath : str
             path to the downloaded jpg file.
         """
-        self.obsdate = datetime.strptime(obsdate, fmt)
-        self.base_url += self.obsdate.strftime("%Y.%m.%d") + '/'
+        obsdate = datetime.strptime(obsdate, fmt)
+        date = obsdate.strftime("%Y.%m.%d") + '/'
+        self.regex_traverser(self.base_url + date)
 
-        filename = "BROWSE." + self.get_filename(latitude, longitude)[:-3] + "1.jpg"
+        filename = parse_granule(self.get_filename(latitude, longitude, tile)).browse_name
 
-        url = self.base_url + filename
+        url = self.base_url + date + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
-    def fetch(self, url, path=str(path), filename='temp.h5'):
+    def fetch(self, url, path=str(path), filename='temp.h5', verify=True, chunk_size=1 << 20):
         """
         Fetches data from url.
 
@@ -147,26 +192,59 @@ class Viirs1KM:
             by default stores in ~wildfirepy/data/VIIRS1KM
         filename : str
             name of the downladed file.
+        verify : bool, optional
+            If True, h5 granules are checked against the size and checksum
+            published in their xml metadata, by default True.
+        chunk_size : int, optional
+            Number of bytes streamed to disk at a time, by default 1 MiB.
 
         Returns
         -------
         path : str
             Absolute path to the downloaded file.
+
+        Raises
+        ------
+        HTTPError
+            If the file cannot be downloaded, after retries.
+        IOError
+            If the downloaded file fails verification.
         """
         data_folder = Path(path)
         filename = data_folder / filename
         try:
-            response = self.url_opener(url)
+            metadata = None
+            if verify and url.endswith(('.h5', '.hdf')):
+                metadata = get_granule_metadata(self.url_opener, url)
+            download(self.url_opener, url, filename, chunk_size=chunk_size, metadata=metadata)
+            get_catalog().add(filename)
             print("Download Successful!")
-            print("Writing file!")
-            with open(filename, 'wb') as file:
-                file.write(response.read())
-            response.close()
             return filename.absolute().as_posix()
 
         except HTTPError as err:
-            output = format(err)
-            print(output)
+            warnings.warn(UserWarning(f"Could not download {url}: {format(err)}"))
+            raise
+
+    def fetch_many(self, requests, *, method='get_h5', max_workers=4, **kwargs):
+        """
+        Downloads many files concurrently over this client's URL opener.
+
+        Parameters
+        ----------
+        requests : list of dict
+            Keyword arguments for `method` identifying each file, e.g.
+            ``{'obsdate': '2020-02-01', 'tile': (24, 6)}``.
+        method : str, optional
+            Name of the download method to run, by default ``'get_h5'``.
+        max_workers : int, optional
+            Maximum number of concurrent downloads, by default 4.
+
+        Returns
+        -------
+        results : list of FetchResult
+            Per-file outcome, in the order of `requests`.
+        """
+        return fetch_many(getattr(self, method), requests, max_workers=max_workers, **kwargs)
 
 
 class VNP14A1(Viirs1KM):
@@ -192,8 +270,22 @@ class Viirs1KMDownloader:
         self.fire_client = VNP14A1()
         self.converter = SinusoidalCoordinate()
 
-    def get_data(self, *, obsdate: str, latitude: float,
-                 longitude: float, fmt: str = "%Y-%m-%d", **kwargs):
+    @property
+    def aio(self):
+        """
+        An `~wildfirepy.net.util.aio.AsyncClient` exposing every method as a coroutine.
+        """
+        return _AsyncViirs1KMDownloader(self)
+
+    @property
+    def catalog(self):
+        """
+        The `~wildfirepy.net.util.catalog.GranuleCatalog` of local granules.
+        """
+        return get_catalog()
+
+    def get_data(self, *, obsdate: str, latitude: float = None, longitude: float = None,
+                 tile: tuple = None, fmt: str = "%Y-%m-%d", **kwargs):
         """
         Checks if data corresponding to the given obsdate is on the disk.
         If not, the data is downloaded.
@@ -206,6 +298,9 @@ class Viirs1KMDownloader:
             latitude of the observation.
         longitude: float
             longitude of the observation.
+        tile: tuple, optional
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            latitude and longitude if given.
         fmt : str, optional
             The format in which the obsdate is given,
             by default "%Y-%m-%d"
@@ -215,30 +310,138 @@ class Viirs1KMDownloader:
         data_dict : dict
             dictionary with the surface and fire data filenames.
         """
-        all_files = glob.glob(str(path) + "/*h5")
+        h, v = tile if tile is not None else self.converter(latitude, longitude)
+        return {'surface': self.get_product('VNP09GA', obsdate=obsdate, tile=(h, v), fmt=fmt,
+                                            **kwargs),
+                'fire': self.get_product('VNP14A1', obsdate=obsdate, tile=(h, v), fmt=fmt,
+                                         **kwargs)}
+
+    def get_product(self, product: str, *, obsdate: str, latitude: float = None,
+                    longitude: float = None, tile: tuple = None, fmt: str = "%Y-%m-%d", **kwargs):
+        """
+        Returns the file of a single product, downloading it if it is not on the disk.
+
+        Parameters
+        ----------
+        product : str
+            Either ``'VNP09GA'`` (surface) or ``'VNP14A1'`` (fire).
+        obsdate : str
+            The date of observation.
+        latitude: float
+            latitude of the observation.
+        longitude: float
+            longitude of the observation.
+        tile: tuple, optional
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            latitude and longitude if given.
+        fmt : str, optional
+            The format in which the obsdate is given,
+            by default "%Y-%m-%d"
+
+        Returns
+        -------
+        filename : str
+            Path to the file.
+        """
+        client, filename, tile = self._find_product(product, obsdate, latitude, longitude, tile,
+                                                    fmt, kwargs.get('path', path))
+        if filename is None:
+            filename = client.get_h5(obsdate=obsdate, tile=tile, fmt=fmt, **kwargs)
+        return filename
+
+    def _find_product(self, product, obsdate, latitude, longitude, tile, fmt, directory):
+        """
+        Returns the client of `product`, its file on the disk or `None`, and the tile.
+        """
+        clients = {client.product: client for client in (self.surface_client, self.fire_client)}
+        if product not in clients:
+            raise ValueError(f"Product must be one of {list(clients)}.")
         obsdatetime = datetime.strptime(obsdate, fmt)
-        date = date = f'{obsdatetime.year}{obsdatetime.timetuple().tm_yday}'
-        h, v = self.converter(latitude, longitude)
-        h = str(h) if h > 9 else "0" + str(h)
-        v = str(v) if v > 9 else "0" + str(v)
-
-        surface_files = re.compile(r'.*' + f'VNP09GA.A{date}.(h{h}v{v}).*')
-        match = list(filter(surface_files.match, all_files))
-        if len(match) != 0:
-            surface = match[0]
-        else:
-            warnings.warn(UserWarning("Surface data for the given information not found on the disk. \
-                                       Downloading the file!"))
-            surface = self.surface_client.get_h5(obsdate=obsdate, latitude=latitude, longitude=longitude, **kwargs)
-
-        fire_files = re.compile(r'.*' + f'VNP14A1.A{date}.(h{h}v{v}).*')
-        match = list(filter(fire_files.match, all_files))
-        if len(match) != 0:
-            fire = match[0]
-        else:
-            warnings.warn(UserWarning("Fire data for the given information not found on the disk. \
-                                       Downloading the file!"))
-            fire = self.fire_client.get_h5(obsdate=obsdate, latitude=latitude, longitude=longitude, **kwargs)
-
-        return {'surface': surface,
-                'fire': fire}
+        year, doy = obsdatetime.year, obsdatetime.timetuple().tm_yday
+        h, v = tile if tile is not None else self.converter(latitude, longitude)
+        self.catalog.ensure_scanned(directory)
+
+        filename = self.catalog.find(product, year, doy, h, v, directory=directory)
+        if filename is None:
+            kind = 'Surface' if product == 'VNP09GA' else 'Fire'
+            warnings.warn(UserWarning(f"{kind} data for the given information not found on the "
+                                      "disk. Downloading the file!"))
+        return clients[product], filename, (h, v)
+
+    def fetch_many(self, requests, *, max_workers=4, **kwargs):
+        """
+        Downloads many surface and fire files concurrently.
+
+        Parameters
+        ----------
+        requests : list of dict
+            Each request names its ``product``, ``'VNP09GA'`` or ``'VNP14A1'``,
+            and holds the keyword arguments for `Viirs1KM.get_h5`, e.g.
+            ``{'product': 'VNP14A1', 'obsdate': '2020-02-01', 'tile': (24, 6)}``.
+        max_workers : int, optional
+            Maximum number of concurrent downloads, by default 4.
+
+        Returns
+        -------
+        results : list of FetchResult
+            Per-file outcome, in the order of `requests`.
+        """
+        clients = {client.product: client for client in (self.surface_client, self.fire_client)}
+
+        def get_h5(*, product, **request):
+            if product not in clients:
+                raise ValueError(f"Product must be one of {list(clients)}.")
+            return clients[product].get_h5(**request)
+
+        return fetch_many(get_h5, requests, max_workers=max_workers, **kwargs)
+
+
+class _AsyncViirs1KMDownloader(AsyncClient):
+    """
+    Native `asyncio` counterparts of the methods of a `Viirs1KMDownloader`.
+    """
+    async def get_data(self, *, obsdate: str, latitude: float = None, longitude: float = None,
+                       tile: tuple = None, fmt: str = "%Y-%m-%d", **kwargs):
+        h, v = tile if tile is not None else self.client.converter(latitude, longitude)
+        surface, fire = await asyncio.gather(
+            self.get_product('VNP09GA', obsdate=obsdate, tile=(h, v), fmt=fmt, **kwargs),
+            self.get_product('VNP14A1', obsdate=obsdate, tile=(h, v), fmt=fmt, **kwargs))
+        return {'surface': surface, 'fire': fire}
+
+    async def get_product(self, product: str, *, obsdate: str, latitude: float = None,
+                          longitude: float = None, tile: tuple = None, fmt: str = "%Y-%m-%d",
+                          **kwargs):
+        client, filename, tile = self.client._find_product(product, obsdate, latitude, longitude,
+                                                           tile, fmt, kwargs.get('path', path))
+        if filename is None:
+            filename = await AsyncClient(client, self._session).get_h5(obsdate=obsdate, tile=tile,
+                                                                       fmt=fmt, **kwargs)
+        return filename
+
+    async def fetch_many(self, requests, **kwargs):
+        """
+        Downloads many surface and fire files concurrently on the running event loop.
+
+        Parameters
+        ----------
+        requests : list of dict
+            Each request names its ``product``, ``'VNP09GA'`` or ``'VNP14A1'``,
+            and holds the keyword arguments for `Viirs1KM.get_h5`.
+
+        Returns
+        -------
+        results : list of FetchResult
+            Per-file outcome, in the order of `requests`.
+        """
+        clients = {client.product: AsyncClient(client, self._session)
+                   for client in (self.client.surface_client, self.client.fire_client)}
+
+        async def get_h5(*, product, **request):
+            if product not in clients:
+                raise ValueError(f"Product must be one of {list(clients)}.")
+            return await clients[product].get_h5(**request)
+
+        return await fetch_many_async(get_h5, requests, **kwargs)
+
+    get_data.__doc__ = Viirs1KMDownloader.get_data.__doc__
+    get_product.__doc__ = Viirs1KMDownloader.get_product.__doc__
@@ -0,0 +1,262 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+import pytest
+from wildfirepy.net.snpp.util import Viirs1KMParser
+from wildfirepy.net.snpp.viirs import VNP14A1, Viirs1KMDownloader
+from wildfirepy.net.usgs import VIIRSBurntAreaDownloader
+from wildfirepy.net.util import aio as aio_module
+from wildfirepy.net.util import catalog as catalog_module
+from wildfirepy.net.util.aio import AsyncClient, AsyncSession
+from wildfirepy.net.util.cache import ListingCache
+from wildfirepy.net.util.catalog import GranuleCatalog
+from wildfirepy.net.util.download import Cksum
+from wildfirepy.net.util.scheduler import RequestScheduler
+from wildfirepy.net.util.session import EarthdataSession
+from wildfirepy.net.util.usgs import VIIRSHtmlParser
+
+aiohttp = pytest.importorskip('aiohttp')
+
+GRANULES = {'VNP14A1': 'VNP14A1.A2020032.h24v06.001.2020034000000.h5',
+            'VNP09GA': 'VNP09GA.A2020032.h24v06.001.2020034000000.h5'}
+SWATH = 'VNP03MODLL.A2020032.0642.001.2020033000000.h5'
+
+
+def get_xml(content):
+    checksum = Cksum()
+    checksum.update(content)
+    return (f'<GranuleMetaDataFile><FileSize>{len(content)}</FileSize>'
+            f'<Checksum>{checksum.hexdigest()}</Checksum>'
+            f'<ChecksumType>CKSUM</ChecksumType></GranuleMetaDataFile>').encode()
+
+
+class EarthdataHandler(BaseHTTPRequestHandler):
+    """
+    Serves listings and granules behind a login redirect, like LP DAAC.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        path, _, query = self.path.partition('?')
+        if path == '/login':
+            return self.login(query)
+        if path == '/callback':
+            # The data server sets its own session cookie once the login succeeded.
+            return self.reply(302, headers={'Location': query.partition('=')[2],
+                                            'Set-Cookie': 'session=ok; Path=/'})
+        if 'session=ok' not in self.headers.get('Cookie', ''):
+            return self.reply(302, headers={'Location': f'{server.login_url}?next={path}'})
+
+        with server.lock:
+            server.served.append(path)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(server.delay)
+            if path in server.failures and server.failures[path] > 0:
+                server.failures[path] -= 1
+                return self.reply(503)
+            if path not in server.files:
+                return self.reply(404)
+            self.reply(200, server.files[path])
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def login(self, query):
+        if self.headers.get('Authorization') != 'Basic dXNlcjpwYXNzd29yZA==':
+            return self.reply(401, headers={'WWW-Authenticate': 'Basic realm="Earthdata"'})
+        with self.server.lock:
+            self.server.logins += 1
+        target = f'{self.server.data_url}/callback?{query}'
+        self.reply(302, headers={'Location': target, 'Set-Cookie': 'urs=user; Path=/'})
+
+    def reply(self, code, body=b'', headers=()):
+        self.send_response(code)
+        for name, value in dict(headers).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), EarthdataHandler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    server.data_url = f'http://127.0.0.1:{port}'
+    server.login_url = f'http://localhost:{port}/login'
+    server.lock = threading.Lock()
+    server.served = []
+    server.failures = {}
+    server.logins = server.active = server.peak = 0
+    server.delay = 0
+
+    server.files = {}
+    for product, granule in GRANULES.items():
+        content = product.encode() * 5000
+        base = f'/VIIRS/{product}.001/2020.02.01/'
+        server.files[base] = f'<a href="{granule}">{granule}</a>'.encode()
+        server.files[base + granule] = content
+        server.files[base + granule + '.xml'] = get_xml(content)
+    server.files['/VIIRS/VNP03MODLL.001/2020.02.01'] = f'<a href="{SWATH}">{SWATH}</a>'.encode()
+    server.files['/VIIRS/VNP03MODLL.001/2020.02.01/' + SWATH] = b'swath'
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session(server):
+    return AsyncSession(EarthdataSession('user', 'password', f'http://localhost:'
+                                         f'{server.server_address[1]}/', cookie_file=False),
+                        RequestScheduler(timeout=5, backoff=0.001, rate=1000))
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    catalog = GranuleCatalog(tmp_path / 'catalog.sqlite')
+    monkeypatch.setattr(catalog_module, '_catalog', catalog)
+    return catalog
+
+
+def point_to(client, server, tmp_path):
+    client.base_url = f'{server.data_url}/VIIRS/{client.product}.001/'
+    client.regex_traverser = Viirs1KMParser(client.product, client.base_url,
+                                            ListingCache(tmp_path / 'listings.sqlite'))
+    return client
+
+
+def run(session, coroutine):
+    async def main():
+        async with session:
+            return await coroutine()
+    return asyncio.run(main())
+
+
+def test_open_logs_in_once_and_shares_cookies(server, session):
+    url = server.data_url + '/VIIRS/VNP14A1.001/2020.02.01/'
+
+    async def main():
+        for _ in range(3):
+            async with session.open(url) as response:
+                assert await response.read() == server.files['/VIIRS/VNP14A1.001/2020.02.01/']
+
+    run(session, main)
+    assert server.logins == 1
+    assert 'session' in {cookie.name for cookie in session.session.cookies}
+
+    # A new event loop starts from the cookies of the Earthdata session.
+    run(session, main)
+    assert server.logins == 1
+
+
+def test_errors_and_retries(server, session):
+    base = server.data_url + '/VIIRS/VNP14A1.001/2020.02.01/'
+    server.failures['/VIIRS/VNP14A1.001/2020.02.01/'] = 2
+
+    async def main():
+        async with session.open(base) as response:
+            assert response.status == 200
+        with pytest.raises(HTTPError) as err:
+            async with session.open(base + 'missing.h5'):
+                pass
+        return err.value.code
+
+    assert run(session, main) == 404
+    assert server.served.count('/VIIRS/VNP14A1.001/2020.02.01/') == 3
+
+
+def test_per_host_concurrency_is_bounded(server, session):
+    session = AsyncSession(session.session, session.scheduler, max_per_host=3)
+    server.delay = 0.05
+    url = server.data_url + '/VIIRS/VNP14A1.001/2020.02.01/'
+
+    async def get():
+        async with session.open(url) as response:
+            return await response.read()
+
+    async def main():
+        await get()
+        return await asyncio.gather(*(get() for _ in range(12)))
+
+    assert len(run(session, main)) == 12
+    assert 1 < server.peak <= 3
+
+
+def test_get_h5(server, session, catalog, tmp_path):
+    client = AsyncClient(point_to(VNP14A1(), server, tmp_path), session)
+
+    async def main():
+        index = await client.get_listing(obsdate='2020-02-01')
+        path = await client.get_h5(obsdate='2020-02-01', tile=(24, 6), path=str(tmp_path))
+        return index, path
+
+    index, path = run(session, main)
+    assert index.get_tile(24, 6) == GRANULES['VNP14A1']
+    assert path == (tmp_path / GRANULES['VNP14A1']).as_posix()
+    assert (tmp_path / GRANULES['VNP14A1']).read_bytes() == b'VNP14A1' * 5000
+    assert catalog.find('VNP14A1', 2020, 32, 24, 6, directory=str(tmp_path)) == path
+    # The listing is fetched once and then served from the listing cache.
+    assert server.served.count('/VIIRS/VNP14A1.001/2020.02.01/') == 1
+
+
+def test_checksum_mismatch(server, session, catalog, tmp_path):
+    client = AsyncClient(point_to(VNP14A1(), server, tmp_path), session)
+    granule = '/VIIRS/VNP14A1.001/2020.02.01/' + GRANULES['VNP14A1']
+    server.files[granule + '.xml'] = get_xml(b'something else' * 2000)
+
+    with pytest.raises(IOError):
+        run(session, lambda: client.get_h5(obsdate='2020-02-01', tile=(24, 6),
+                                           path=str(tmp_path)))
+    assert not (tmp_path / GRANULES['VNP14A1']).exists()
+
+
+def test_downloader_get_data_and_fetch_many(server, session, catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(aio_module, '_async_session', session)
+    downloader = Viirs1KMDownloader()
+    point_to(downloader.surface_client, server, tmp_path)
+    point_to(downloader.fire_client, server, tmp_path)
+    client = downloader.aio
+
+    async def main():
+        with pytest.warns(UserWarning):
+            data = await client.get_data(obsdate='2020-02-01', tile=(24, 6), path=str(tmp_path))
+        results = await client.fetch_many([{'product': 'VNP14A1', 'obsdate': '2020-02-01',
+                                            'tile': (24, 6)},
+                                           {'product': 'VNP14A1', 'obsdate': '2020-02-01',
+                                            'tile': (25, 6)},
+                                           {'product': 'MOD14', 'obsdate': '2020-02-01',
+                                            'tile': (24, 6)}], path=str(tmp_path))
+        return data, results
+
+    data, results = run(session, main)
+    assert data == {'surface': (tmp_path / GRANULES['VNP09GA']).as_posix(),
+                    'fire': (tmp_path / GRANULES['VNP14A1']).as_posix()}
+    assert results[0].path == data['fire']
+    assert isinstance(results[1].error, ValueError)
+    assert isinstance(results[2].error, ValueError)
+
+
+def test_usgs_downloader(server, session, catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(aio_module, '_async_session', session)
+    downloader = VIIRSBurntAreaDownloader()
+    downloader.base_url = f'{server.data_url}/VIIRS/VNP03MODLL.001/'
+    downloader.regex_traverser = VIIRSHtmlParser('VNP03MODLL',
+                                                 ListingCache(tmp_path / 'listings.sqlite'))
+
+    path = run(session, lambda: downloader.aio.get_h5(
+        year=2020, month=2, date=1, hours=6, minutes=44, path=str(tmp_path), verify=False))
+    assert path == (tmp_path / SWATH).as_posix()
+    assert (tmp_path / SWATH).read_bytes() == b'swath'
@@ -0,0 +1,32 @@
+import threading
+
+from wildfirepy.net.util.bulk import fetch_many
+
+
+def test_fetch_many_reports_per_file_results():
+    seen = set()
+
+    def get_h5(*, obsdate, tile, path):
+        seen.add(threading.current_thread().name)
+        if tile == (0, 0):
+            raise ValueError("No file exists for given coordinates.")
+        return f"{path}/{obsdate}.h{tile[0]}v{tile[1]}.h5"
+
+    requests = [{'obsdate': '2020-02-01', 'tile': (h, 6)} for h in range(8)]
+    requests.insert(3, {'obsdate': '2020-02-01', 'tile': (0, 0)})
+
+    results = fetch_many(get_h5, requests, max_workers=4, path='/data')
+
+    assert [result.request for result in results] == requests
+    assert isinstance(results[3].error, ValueError)
+    assert results[3].path is None
+    assert all(result.error is None for i, result in enumerate(results) if i != 3)
+    assert results[0].path == '/data/2020-02-01.h0v6.h5'
+    assert len(seen) <= 4
+
+
+def test_fetch_many_failed_download():
+    results = fetch_many(lambda **request: None, [{'obsdate': '2020-02-01'}])
+
+    assert results[0].path is None
+    assert isinstance(results[0].error, IOError)
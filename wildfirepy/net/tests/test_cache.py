@@ -0,0 +1,69 @@
+import io
+from email.message import Message
+from urllib.error import HTTPError
+
+import pytest
+from wildfirepy.net.util.cache import ListingCache
+
+HISTORICAL_URL = 'https://e4ftl01.cr.usgs.gov/VIIRS/VNP14A1.001/2020.02.01/'
+ROOT_URL = 'https://e4ftl01.cr.usgs.gov/VIIRS/VNP14A1.001/'
+
+
+class FakeOpener:
+    def __init__(self, content=b'<a href="VNP14A1.A2020032.h24v06.001.2020034000000.h5">'):
+        self.content = content
+        self.requests = []
+        self.not_modified = False
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.not_modified:
+            raise HTTPError(request.full_url, 304, 'Not Modified', Message(), None)
+        response = io.BytesIO(self.content)
+        response.headers = {'ETag': '"abc"', 'Last-Modified': 'Sat, 01 Feb 2020 00:00:00 GMT'}
+        return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ListingCache(path=tmp_path / 'listings.sqlite', ttl=0)
+
+
+def test_historical_listing_fetched_once(cache):
+    opener = FakeOpener()
+    for _ in range(500):
+        content = cache.get(HISTORICAL_URL, opener)
+
+    assert len(opener.requests) == 1
+    assert 'h24v06' in content
+
+
+def test_listing_persists_on_disk(cache):
+    opener = FakeOpener()
+    cache.get(HISTORICAL_URL, opener)
+
+    reopened = ListingCache(path=cache.path)
+    reopened.get(HISTORICAL_URL, opener)
+
+    assert len(opener.requests) == 1
+
+
+def test_stale_listing_is_revalidated(cache):
+    opener = FakeOpener()
+    first = cache.get(ROOT_URL, opener)
+    opener.not_modified = True
+    second = cache.get(ROOT_URL, opener)
+
+    assert first == second
+    assert len(opener.requests) == 2
+    assert opener.requests[1].get_header('If-none-match') == '"abc"'
+    assert opener.requests[1].get_header('If-modified-since') is not None
+
+
+def test_invalidate(cache):
+    opener = FakeOpener()
+    cache.get(HISTORICAL_URL, opener)
+    cache.invalidate(HISTORICAL_URL)
+    cache.get(HISTORICAL_URL, opener)
+
+    assert len(opener.requests) == 2
@@ -0,0 +1,114 @@
+import os
+
+import pytest
+from wildfirepy.net.util.catalog import GranuleCatalog
+
+GRANULES = ['VNP14A1.A2020032.h24v06.001.2020034000000.h5',
+            'VNP14A1.A2020032.h24v06.001.2020040000000.h5',
+            'VNP09GA.A2020032.h24v06.001.2020034000000.h5',
+            'VNP14A1.A2020005.h08v05.001.2020007000000.h5',
+            'MCD64A1.A2020032.h35v10.006.2020102114146.hdf']
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    directory = tmp_path / 'VIIRS1KM'
+    directory.mkdir()
+    for name in GRANULES + ['temp.h5', 'VNP14A1.A2020032.h24v06.001.2020034000000.h5.xml']:
+        (directory / name).write_bytes(b'')
+    return directory
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return GranuleCatalog(path=tmp_path / 'granules.sqlite')
+
+
+def test_scan(catalog, data_dir):
+    assert catalog.scan(data_dir) == len(GRANULES)
+
+
+def test_find_latest_production(catalog, data_dir):
+    catalog.scan(data_dir)
+    path = catalog.find('VNP14A1', 2020, 32, 24, 6)
+
+    assert path == (data_dir / GRANULES[1]).as_posix()
+    assert catalog.find('VNP09GA', 2020, 32, 24, 6) == (data_dir / GRANULES[2]).as_posix()
+    assert catalog.find('MCD64A1', 2020, 32, 35, 10, collection='006') is not None
+
+
+def test_padded_day_of_year(catalog, data_dir):
+    catalog.scan(data_dir)
+
+    assert catalog.find('VNP14A1', 2020, 5, 8, 5) == (data_dir / GRANULES[3]).as_posix()
+    assert catalog.find('VNP14A1', 2020, 50, 8, 5) is None
+
+
+def test_deleted_files_are_pruned(catalog, data_dir):
+    catalog.scan(data_dir)
+    (data_dir / GRANULES[1]).unlink()
+
+    assert catalog.find('VNP14A1', 2020, 32, 24, 6) == (data_dir / GRANULES[0]).as_posix()
+
+
+def test_ensure_scanned_skips_unchanged_directory(catalog, data_dir, monkeypatch):
+    catalog.ensure_scanned(data_dir)
+    reopened = GranuleCatalog(path=catalog.path)
+    scans = []
+    monkeypatch.setattr(reopened, 'scan', scans.append)
+    reopened.ensure_scanned(data_dir)
+
+    assert scans == []
+    assert reopened.find('VNP14A1', 2020, 32, 24, 6) is not None
+
+
+def test_ensure_scanned_picks_up_copied_files(catalog, data_dir):
+    catalog.ensure_scanned(data_dir)
+    os.utime(data_dir, (0, 0))
+    catalog.ensure_scanned(data_dir)
+    (data_dir / 'VNP14A1.A2020033.h24v06.001.2020035000000.h5').write_bytes(b'')
+    reopened = GranuleCatalog(path=catalog.path)
+    reopened.ensure_scanned(data_dir)
+    catalog.ensure_scanned(data_dir)
+
+    assert reopened.find('VNP14A1', 2020, 33, 24, 6) is not None
+    assert catalog.find('VNP14A1', 2020, 33, 24, 6) is not None
+
+
+def test_find_in_directory(catalog, data_dir, tmp_path):
+    other = tmp_path / 'other'
+    other.mkdir()
+    (other / 'VNP14A1.A2020033.h24v06.001.2020035000000.h5').write_bytes(b'')
+    catalog.scan(data_dir)
+    catalog.scan(other)
+
+    assert catalog.find('VNP14A1', 2020, 33, 24, 6) is not None
+    assert catalog.find('VNP14A1', 2020, 33, 24, 6, directory=data_dir) is None
+    assert catalog.find('VNP14A1', 2020, 33, 24, 6, directory=other) is not None
+    assert catalog.find('VNP14A1', 2020, 32, 24, 6, directory=str(data_dir) + '/') is not None
+
+
+def test_get_granules(catalog, tmp_path):
+    names = ['VNP14A1.A2020032.h24v06.001.2020034000000.h5',
+             'VNP09GA.A2020032.h24v06.001.2020034000000.h5']
+    for name in names:
+        (tmp_path / name).touch()
+    catalog.scan(tmp_path)
+
+    granules = catalog.get_granules('VNP14A1')
+
+    assert [(granule.name, path) for granule, path in granules] == \
+        [(names[0], (tmp_path / names[0]).as_posix())]
+
+
+def test_get_granules_keeps_every_copy(catalog, tmp_path):
+    name = 'VNP14A1.A2020032.h24v06.001.2020034000000.h5'
+    for directory in ('a', 'b'):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / name).touch()
+    catalog.scan(tmp_path)
+
+    paths = [path for granule, path in catalog.get_granules('VNP14A1')]
+    assert paths == [(tmp_path / directory / name).as_posix() for directory in ('a', 'b')]
+    assert [path for granule, path in catalog.get_granules(directory=tmp_path / 'b')] == \
+        paths[1:]
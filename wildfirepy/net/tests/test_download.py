@@ -0,0 +1,87 @@
+import io
+import os
+import subprocess
+from urllib.error import HTTPError
+
+import pytest
+from wildfirepy.net.util.download import Cksum, download
+
+DATA = os.urandom(300000)
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data, code=200):
+        super().__init__(data)
+        self.code = code
+
+    def getcode(self):
+        return self.code
+
+
+class FakeOpener:
+    def __init__(self, data=DATA, fail_after=None):
+        self.data = data
+        self.fail_after = fail_after
+        self.ranges = []
+
+    def __call__(self, request):
+        byte_range = request.get_header('Range')
+        self.ranges.append(byte_range)
+        if byte_range:
+            start = int(byte_range[len('bytes='):-1])
+            if start >= len(self.data):
+                raise HTTPError(request.full_url, 416, 'Range Not Satisfiable', None, None)
+            return FakeResponse(self.data[start:], code=206)
+        if self.fail_after is not None:
+            return FakeResponse(self.data[:self.fail_after])
+        return FakeResponse(self.data)
+
+
+def get_metadata(data=DATA):
+    checksum = Cksum()
+    checksum.update(data)
+    return {'FileSize': str(len(data)), 'Checksum': checksum.hexdigest(), 'ChecksumType': 'CKSUM'}
+
+
+def test_cksum_matches_posix(tmp_path):
+    filename = tmp_path / 'granule.h5'
+    filename.write_bytes(DATA)
+    checksum = Cksum()
+    for start in range(0, len(DATA), 4096):
+        checksum.update(DATA[start:start + 4096])
+
+    result = subprocess.run(['cksum', str(filename)], stdout=subprocess.PIPE)
+    assert checksum.hexdigest() == result.stdout.decode('utf-8').split()[0]
+
+
+def test_download_streams_and_verifies(tmp_path):
+    filename = tmp_path / 'granule.h5'
+    download(FakeOpener(), 'https://host/granule.h5', filename, chunk_size=4096,
+             metadata=get_metadata())
+
+    assert filename.read_bytes() == DATA
+    assert not os.path.exists(str(filename) + '.part')
+
+
+def test_download_resumes_partial_file(tmp_path):
+    filename = tmp_path / 'granule.h5'
+    with pytest.raises(IOError):
+        download(FakeOpener(fail_after=100000), 'https://host/granule.h5', filename,
+                 metadata=get_metadata())
+    assert not filename.exists()
+
+    opener = FakeOpener()
+    download(opener, 'https://host/granule.h5', filename, metadata=get_metadata())
+
+    assert opener.ranges == ['bytes=100000-']
+    assert filename.read_bytes() == DATA
+
+
+def test_download_rejects_corrupt_file(tmp_path):
+    filename = tmp_path / 'granule.h5'
+    metadata = get_metadata(DATA[::-1])
+    with pytest.raises(IOError):
+        download(FakeOpener(), 'https://host/granule.h5', filename, metadata=metadata)
+
+    assert not filename.exists()
+    assert not os.path.exists(str(filename) + '.part')
@@ -0,0 +1,108 @@
+import io
+
+import pytest
+from wildfirepy.granule import get_latest
+from wildfirepy.net.snpp.util import Viirs1KMParser
+from wildfirepy.net.util.cache import ListingCache
+from wildfirepy.net.util.listing import ListingIndex
+from wildfirepy.net.util.usgs import MODISHtmlParser, VIIRSHtmlParser
+
+URL = 'https://e4ftl01.cr.usgs.gov/MOTA/MCD64A1.006/2020.02.01/'
+
+
+def make_listing(names):
+    # Apache listings put several links on one line, which a greedy pattern
+    # would merge into a single match.
+    links = ''.join(f'<a href="{name}">{name}</a> <a href="{name}.xml">{name}.xml</a> '
+                    for name in names)
+    return f'<html><body><pre><a href="../">Parent Directory</a> {links}</pre></body></html>'
+
+
+TILES = [f'MCD64A1.A2020032.h{h:02d}v{v:02d}.006.2020102114146.hdf'
+         for h in range(36) for v in range(18)]
+SWATHS = [f'VNP03MODLL.A2020032.{hours:02d}{minutes:02d}.001.2020033000000.h5'
+          for hours in range(24) for minutes in range(0, 60, 6)]
+
+
+class FakeOpener:
+    def __init__(self, content):
+        self.content = content.encode()
+        self.requests = 0
+
+    def __call__(self, request):
+        self.requests += 1
+        response = io.BytesIO(self.content)
+        response.headers = {}
+        return response
+
+
+def test_index_tiles():
+    index = ListingIndex(make_listing(TILES), product='MCD64A1', extension='hdf')
+
+    assert index.files == TILES
+    assert len(index.tiles) == 36 * 18
+    assert index.get_tile(35, 10) == 'MCD64A1.A2020032.h35v10.006.2020102114146.hdf'
+    with pytest.raises(ValueError):
+        index.get_tile(36, 0)
+
+
+def test_index_swaths():
+    index = ListingIndex(make_listing(SWATHS), product='VNP03MODLL', extension='h5')
+
+    assert len(index.times) == len(SWATHS)
+    assert index.get_time(2020, 32, '1206') == 'VNP03MODLL.A2020032.1206.001.2020033000000.h5'
+    assert index.get_prefix('VNP03MODLL.A2020032.1206.') == index.get_time(2020, 32, '1206')
+    with pytest.raises(ValueError):
+        index.get_time(2020, 32, '1205')
+
+
+def test_index_keeps_latest_version():
+    names = ['VNP14A1.A2020032.h24v06.001.2020034000000.h5',
+             'VNP14A1.A2020032.h24v06.001.2020100000000.h5',
+             'VNP14A1.A2020032.h24v06.001.2020050000000.h5']
+    index = ListingIndex(make_listing(names), product='VNP14A1', extension='h5')
+
+    assert index.get_tile(24, 6) == names[1]
+    assert index.get_tile(24, 6) == get_latest(index.granules)[0].name
+
+
+def test_modis_parser(tmp_path):
+    opener = FakeOpener(make_listing(TILES))
+    parser = MODISHtmlParser(product='MCD64A1',
+                             listing_cache=ListingCache(path=tmp_path / 'listings.sqlite'))
+    parser.url_opener = opener
+    parser(URL)
+
+    assert parser.get_all_hdf_files() == TILES
+    assert parser.get_all_xml_files() == [name + '.xml' for name in TILES]
+    assert parser.get_filename(35, 10) == 'MCD64A1.A2020032.h35v10.006.2020102114146.hdf'
+    with pytest.raises(ValueError):
+        parser.get_filename(35, 18)
+
+
+def test_index_built_once_per_listing(tmp_path):
+    parser = MODISHtmlParser(product='MCD64A1',
+                             listing_cache=ListingCache(path=tmp_path / 'listings.sqlite'))
+    parser.url_opener = FakeOpener(make_listing(TILES))
+    parser(URL)
+    index = parser.index
+    for h in range(36):
+        parser(URL)
+        parser.get_filename(h, 0)
+
+    assert parser.index is index
+    assert parser.url_opener.requests == 1
+
+    parser.html_content = make_listing(TILES[:1])
+    assert parser.index is not index
+    assert len(parser.index) == 1
+
+
+def test_viirs_parsers():
+    parser = VIIRSHtmlParser(product='VNP03MODLL')
+    parser.html_content = make_listing(SWATHS)
+    assert parser.get_swath_filename(2020, 32, '0000') == SWATHS[0]
+
+    parser = Viirs1KMParser('VNP14A1', url=URL)
+    parser.html_content = make_listing(['VNP14A1.A2020032.h24v06.001.2020034000000.h5'])
+    assert parser.get_filename(24, 6) == 'VNP14A1.A2020032.h24v06.001.2020034000000.h5'
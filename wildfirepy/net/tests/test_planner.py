@@ -0,0 +1,107 @@
+import threading
+from datetime import date
+
+import pytest
+from wildfirepy.net.snpp.planner import plan_query
+from wildfirepy.net.util.bulk import fetch_many
+from wildfirepy.net.util.catalog import GranuleCatalog
+from wildfirepy.net.util.listing import ListingIndex
+
+BOX = (25, 75, 29, 79)
+
+
+class FakeClient:
+    def __init__(self, product, tiles):
+        self.product = product
+        self.tiles = tiles
+        self.listings = []
+        self._lock = threading.Lock()
+
+    def get_listing(self, *, obsdate, fmt="%Y-%m-%d"):
+        with self._lock:
+            self.listings.append(obsdate)
+        if obsdate == '2020-02-04':
+            raise OSError("No such directory.")
+        doy = date.fromisoformat(obsdate).timetuple().tm_yday
+        links = ''.join(f'<a href="{self.product}.A2020{doy:03d}.h{h:02d}v{v:02d}.001.'
+                        f'2020100000000.h5">' for h, v in self.tiles)
+        return ListingIndex(links, self.product, 'h5')
+
+
+class FakeDownloader:
+    def __init__(self, tiles):
+        self.surface_client = FakeClient('VNP09GA', tiles)
+        self.fire_client = FakeClient('VNP14A1', tiles)
+        self.requests = []
+
+    def fetch_many(self, requests, *, max_workers=4, **kwargs):
+        self.requests += requests
+
+        def get_h5(*, product, obsdate, tile, path):
+            return f'{path}/{product}.{obsdate}.h{tile[0]:02d}v{tile[1]:02d}.h5'
+
+        return fetch_many(get_h5, requests, max_workers=max_workers, **kwargs)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    directory = tmp_path / 'VIIRS1KM'
+    directory.mkdir()
+    for name in ['VNP14A1.A2020032.h24v06.001.2020034000000.h5',
+                 'VNP14A1.A2020032.h24v06.001.2020040000000.h5',
+                 'VNP09GA.A2020033.h25v06.001.2020035000000.h5']:
+        (directory / name).touch()
+    catalog = GranuleCatalog(path=tmp_path / 'granules.sqlite')
+    catalog.scan(directory)
+    return catalog
+
+
+def test_plan_dedupes_against_local_granules(catalog, tmp_path):
+    plan = plan_query(BOX, '2020-02-01', '2020-02-03', catalog=catalog,
+                      path=str(tmp_path / 'VIIRS1KM'))
+
+    assert plan.tiles == [(24, 6), (25, 6)]
+    assert len(plan) == 6
+    assert plan.local == {(date(2020, 2, 1), (24, 6)):
+                          str(tmp_path / 'VIIRS1KM/VNP14A1.A2020032.h24v06.001.2020040000000.h5')}
+    assert len(plan.missing) == 5
+    assert plan.batches[date(2020, 2, 1)] == [(25, 6)]
+    assert plan.requests[0] == {'product': 'VNP14A1', 'obsdate': '2020-02-01', 'tile': (25, 6)}
+
+
+def test_plan_ignores_granules_of_other_directories(catalog, tmp_path):
+    plan = plan_query(BOX, '2020-02-01', '2020-02-03', catalog=catalog,
+                      path=str(tmp_path / 'other'))
+    assert plan.local == {}
+
+
+def test_plan_geometries(catalog):
+    point = plan_query((28.7041, 77.1025), '2020-02-01', '2020-02-01', catalog=catalog)
+    polygon = plan_query([(25, 75), (29, 75), (29, 79), (25, 79)], '2020-02-01', '2020-02-01',
+                         catalog=catalog)
+
+    assert point.tiles == [(24, 6)]
+    assert polygon.tiles == [(24, 6), (25, 6)]
+    with pytest.raises(ValueError):
+        plan_query([(25, 75), (29, 75)], '2020-02-01', '2020-02-01', catalog=catalog)
+    with pytest.raises(ValueError):
+        plan_query(BOX, '2020-02-02', '2020-02-01', catalog=catalog)
+
+
+def test_run_fetches_each_listing_once(catalog, tmp_path):
+    downloader = FakeDownloader(tiles=[(24, 6)])
+    directory = str(tmp_path / 'VIIRS1KM')
+    plan = plan_query(BOX, '2020-02-01', '2020-02-04', catalog=catalog, path=directory)
+
+    results = plan.run(downloader=downloader)
+
+    assert sorted(downloader.fire_client.listings) == ['2020-02-01', '2020-02-02',
+                                                       '2020-02-03', '2020-02-04']
+    assert [request['obsdate'] for request in downloader.requests] == ['2020-02-02',
+                                                                       '2020-02-03']
+    assert len(results) == 8
+    assert results[0].path.endswith('2020040000000.h5')
+    assert isinstance(results[1].error, ValueError)
+    assert results[2].path == f'{directory}/VNP14A1.2020-02-02.h24v06.h5'
+    assert isinstance(results[6].error, OSError)
+    assert len(plan.unavailable) == 5
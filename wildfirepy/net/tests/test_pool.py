@@ -0,0 +1,101 @@
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from wildfirepy.net.util import pool as pool_module
+from wildfirepy.net.util.bulk import fetch_many
+from wildfirepy.net.util.pool import ConnectionPool, KeepAliveHandler
+from wildfirepy.net.util.session import EarthdataSession
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        body = self.path.encode() * 1000
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        if self.path == '/close':
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+        # Drop the connection without telling the client, like an idle timeout.
+        self.close_connection = self.path == '/drop'
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CountingHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url(server, path):
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_connection_is_reused(server):
+    pool = ConnectionPool()
+    opener = urllib.request.build_opener(KeepAliveHandler(pool))
+
+    for index in range(5):
+        with opener.open(url(server, f'/file{index}')) as response:
+            assert response.read() == f'/file{index}'.encode() * 1000
+    pool.clear()
+
+    assert server.connections == 1
+
+
+def test_connection_closed_by_server_is_not_reused(server):
+    pool = ConnectionPool()
+    opener = urllib.request.build_opener(KeepAliveHandler(pool))
+
+    for path in ['/close', '/file', '/file']:
+        with opener.open(url(server, path)) as response:
+            response.read()
+    pool.clear()
+
+    assert server.connections == 2
+
+
+def test_stale_connection_is_replaced(server):
+    pool = ConnectionPool()
+    opener = urllib.request.build_opener(KeepAliveHandler(pool))
+
+    with opener.open(url(server, '/drop')) as response:
+        response.read()
+    with opener.open(url(server, '/again')) as response:
+        assert response.read() == b'/again' * 1000
+    pool.clear()
+
+    assert server.connections == 2
+
+
+def test_fetch_many_shares_connections(server, monkeypatch):
+    monkeypatch.setattr(pool_module, '_pool', ConnectionPool())
+    session = EarthdataSession('user', 'password', cookie_file=False)
+
+    def get_h5(*, name):
+        with session.open(url(server, f'/{name}')) as response:
+            return response.read().decode()[:len(name) + 1]
+
+    requests = [{'name': f'file{index}'} for index in range(40)]
+    results = fetch_many(get_h5, requests, max_workers=4)
+
+    assert [result.path for result in results] == [f"/file{index}" for index in range(40)]
+    assert server.connections <= 4
@@ -0,0 +1,137 @@
+import io
+import threading
+import time
+from email.message import Message
+from urllib.error import HTTPError
+
+import pytest
+from wildfirepy.net.util.scheduler import RequestScheduler
+
+
+class FlakyOpener:
+    def __init__(self, failures, code=503):
+        self.failures = failures
+        self.code = code
+        self.calls = 0
+        self.timeouts = []
+
+    def open(self, request, timeout=None):
+        self.calls += 1
+        self.timeouts.append(timeout)
+        if self.calls <= self.failures:
+            raise HTTPError(request, self.code, 'Error', Message(), None)
+        return io.BytesIO(b'response')
+
+
+@pytest.fixture
+def scheduler():
+    return RequestScheduler(timeout=5, retries=3, backoff=0.001, rate=1000)
+
+
+def test_retries_server_errors(scheduler):
+    opener = FlakyOpener(failures=2)
+
+    assert scheduler.open(opener, 'https://e4ftl01.cr.usgs.gov/').read() == b'response'
+    assert opener.calls == 3
+    assert opener.timeouts == [5, 5, 5]
+
+
+def test_gives_up_after_retries(scheduler):
+    opener = FlakyOpener(failures=10, code=429)
+
+    with pytest.raises(HTTPError):
+        scheduler.open(opener, 'https://e4ftl01.cr.usgs.gov/')
+    assert opener.calls == 4
+
+
+def test_client_errors_are_not_retried(scheduler):
+    opener = FlakyOpener(failures=1, code=404)
+
+    with pytest.raises(HTTPError):
+        scheduler.open(opener, 'https://e4ftl01.cr.usgs.gov/')
+    assert opener.calls == 1
+
+
+def test_rate_limit():
+    scheduler = RequestScheduler(rate=50, burst=1)
+    opener = FlakyOpener(failures=0)
+
+    start = time.monotonic()
+    for _ in range(6):
+        scheduler.open(opener, 'https://e4ftl01.cr.usgs.gov/')
+
+    assert time.monotonic() - start >= 0.09
+
+
+def test_per_host_concurrency_cap():
+    scheduler = RequestScheduler(max_per_host=2, rate=1000)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    class SlowOpener:
+        def open(self, request, timeout=None):
+            with lock:
+                active.append(request)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(request)
+            return io.BytesIO(b'response')
+
+    def fetch(url):
+        scheduler.open(SlowOpener(), url).close()
+
+    threads = [threading.Thread(target=fetch, args=(f'https://e4ftl01.cr.usgs.gov/{i}',))
+               for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+
+
+def test_per_host_cap_covers_open_bodies():
+    scheduler = RequestScheduler(max_per_host=2, rate=1000)
+    bodies = []
+    peak = []
+    lock = threading.Lock()
+
+    class Body(io.BytesIO):
+        def close(self):
+            with lock:
+                bodies.remove(self)
+            super().close()
+
+    class Opener:
+        def open(self, request, timeout=None):
+            body = Body(b'x' * 10)
+            with lock:
+                bodies.append(body)
+                peak.append(len(bodies))
+            return body
+
+    def fetch(url):
+        with scheduler.open(Opener(), url) as response:
+            while response.read(1):
+                time.sleep(0.002)
+
+    threads = [threading.Thread(target=fetch, args=(f'https://e4ftl01.cr.usgs.gov/{i}',))
+               for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    assert not bodies
+
+
+def test_slot_released_on_failed_open():
+    scheduler = RequestScheduler(max_per_host=1, retries=0, rate=1000)
+
+    for _ in range(3):
+        with pytest.raises(HTTPError):
+            scheduler.open(FlakyOpener(failures=1, code=404), 'https://e4ftl01.cr.usgs.gov/')
+    scheduler.open(FlakyOpener(failures=0), 'https://e4ftl01.cr.usgs.gov/').close()
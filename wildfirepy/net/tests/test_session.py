@@ -0,0 +1,70 @@
+import time
+from http.cookiejar import Cookie
+
+import pytest
+from wildfirepy.net.util import session as session_module
+from wildfirepy.net.util.session import EarthdataSession, get_credentials
+from wildfirepy.net.util.usgs import URLOpenerWithRedirect
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv('WILDFIREPY_CACHE_DIR', str(tmp_path / 'cache'))
+
+
+def make_cookie(name, value, expires=None):
+    return Cookie(0, name, value, None, False, '.earthdata.nasa.gov', True, True, '/', True,
+                  True, expires, expires is None, None, None, {})
+
+
+def test_credentials_from_environment(monkeypatch, tmp_path):
+    netrc_file = tmp_path / 'netrc'
+    netrc_file.write_text('machine urs.earthdata.nasa.gov login netrc-user password netrc-pass\n')
+    netrc_file.chmod(0o600)
+    monkeypatch.delenv('EARTHDATA_USERNAME', raising=False)
+    monkeypatch.delenv('EARTHDATA_PASSWORD', raising=False)
+
+    assert get_credentials(netrc_file=str(netrc_file)) == ('netrc-user', 'netrc-pass')
+    with pytest.raises(ValueError, match='No Earthdata Login credentials'):
+        get_credentials(netrc_file=str(tmp_path / 'missing'))
+
+    monkeypatch.setenv('EARTHDATA_USERNAME', 'env-user')
+    with pytest.raises(ValueError, match='EARTHDATA_PASSWORD'):
+        get_credentials(netrc_file=str(netrc_file))
+    monkeypatch.setenv('EARTHDATA_PASSWORD', 'env-pass')
+    assert get_credentials(netrc_file=str(netrc_file)) == ('env-user', 'env-pass')
+
+
+def test_partial_credentials_are_rejected():
+    with pytest.raises(ValueError, match='both'):
+        EarthdataSession('user', cookie_file=False)
+    with pytest.raises(ValueError, match='both'):
+        URLOpenerWithRedirect(password='secret')
+
+
+def test_cookies_are_persisted_with_expiry(tmp_path):
+    cookie_file = tmp_path / 'cookies.txt'
+    session = EarthdataSession('user', 'pass', cookie_file=cookie_file, ttl=60)
+    session.cookies.set_cookie(make_cookie('urs_user_already_logged', 'yes'))
+    session.cookies.set_cookie(make_cookie('stale', 'no', expires=int(time.time()) - 10))
+    session.save()
+    assert oct(cookie_file.stat().st_mode & 0o777) == '0o600'
+
+    restored = EarthdataSession('user', 'pass', cookie_file=cookie_file)
+    cookies = {cookie.name: cookie for cookie in restored.cookies}
+    assert set(cookies) == {'urs_user_already_logged'}
+    assert time.time() < cookies['urs_user_already_logged'].expires <= time.time() + 60
+
+    restored.clear()
+    assert not cookie_file.exists()
+
+
+def test_openers_share_the_session(monkeypatch, tmp_path):
+    shared = EarthdataSession('user', 'pass', cookie_file=False)
+    monkeypatch.setattr(session_module, '_session', shared)
+
+    assert URLOpenerWithRedirect().opener is shared.opener
+    assert URLOpenerWithRedirect().opener is URLOpenerWithRedirect().opener
+    own = URLOpenerWithRedirect(username='someone', password='secret')
+    assert own.opener is not shared.opener
+    assert own.session.cookie_file is None
@@ -1,4 +1,5 @@
 from wildfirepy.coordinates.util import SinusoidalCoordinate
+from wildfirepy.granule import parse_granule
 from wildfirepy.net.usgs.usgs_downloader import AbstractUSGSDownloader
 from wildfirepy.net.util import MODISHtmlParser
 
@@ -56,7 +57,7 @@ class Modis(AbstractUSGSDownloader):
         """
         return self.regex_traverser.get_all_hdf_files()
 
-    def get_filename(self, latitude, longitude):
+    def get_filename(self, latitude=None, longitude=None, tile=None):
         """
         Returns name of file for given latitude and longitude.
 
@@ -66,11 +67,14 @@ class Modis(AbstractUSGSDownloader):
             latitude of the observation.
         longitude: `float`
             longitude of the observation.
+        tile: `tuple`
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            `latitude` and `longitude` if given.
         """
-        h, v = self.converter(latitude, longitude)
+        h, v = tile if tile is not None else self.converter(latitude, longitude)
         return self.regex_traverser.get_filename(h, v)
 
-    def get_hdf(self, *, year, month, latitude, longitude, **kwargs):
+    def get_hdf(self, *, year, month, latitude=None, longitude=None, tile=None, **kwargs):
         """
         Downloads the `hdf` file and stores it on the disk.
 
@@ -84,6 +88,9 @@ class Modis(AbstractUSGSDownloader):
             latitude of the observation.
         longitude: `float`
             longitude of the observation.
+        tile: `tuple`
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            `latitude` and `longitude` if given.
         kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`
 
         Returns
@@ -91,16 +98,15 @@ class Modis(AbstractUSGSDownloader):
         path: `str`
             Absolute path to the downloaded `hdf` file.
         """
-        if not self.has_files:
-            self.get_files_from_date(year, month)
+        self.get_files_from_date(year, month)
 
-        filename = self.get_filename(latitude, longitude)
+        filename = self.get_filename(latitude, longitude, tile)
         month = str(month) if month > 9 else "0" + str(month)
         date = f"{str(year)}.{month}.01/"
         url = self.base_url + date + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
-    def get_xml(self, *, year, month, latitude, longitude, **kwargs):
+    def get_xml(self, *, year, month, latitude=None, longitude=None, tile=None, **kwargs):
         """
         Downloads the `xml` file and stores it on the disk.
 
@@ -114,6 +120,9 @@ class Modis(AbstractUSGSDownloader):
             latitude of the observation.
         longitude: `float`
             longitude of the observation.
+        tile: `tuple`
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            `latitude` and `longitude` if given.
         kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`
 
         Returns
@@ -121,17 +130,16 @@ class Modis(AbstractUSGSDownloader):
         path: `str`
             Absolute path to the downloaded `xml` file.
         """
-        if not self.has_files:
-            self.get_files_from_date(year, month)
+        self.get_files_from_date(year, month)
 
-        filename = self.get_filename(latitude, longitude) + ".xml"
+        filename = self.get_filename(latitude, longitude, tile) + ".xml"
 
         month = str(month) if month > 9 else "0" + str(month)
         date = f"{str(year)}.{month}.01/"
         url = self.base_url + date + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
-    def get_jpg(self, *, year, month, latitude, longitude, **kwargs):
+    def get_jpg(self, *, year, month, latitude=None, longitude=None, tile=None, **kwargs):
         """
         Downloads the `jpg` file and stores it on the disk.
 
@@ -145,6 +153,9 @@ class Modis(AbstractUSGSDownloader):
             latitude of the observation.
         longitude: `float`
             longitude of the observation.
+        tile: `tuple`
+            Sinusoidal grid coordinates ``(h, v)``, used instead of
+            `latitude` and `longitude` if given.
         kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`
 
         Returns
@@ -152,16 +163,37 @@ class Modis(AbstractUSGSDownloader):
         path: `str`
             Absolute path to the downloaded `jpg` file.
         """
-        if not self.has_files:
-            self.get_files_from_date(year, month)
+        self.get_files_from_date(year, month)
 
-        filename = "BROWSE." + self.get_filename(latitude, longitude)[:-3] + "1.jpg"
+        filename = parse_granule(self.get_filename(latitude, longitude, tile)).browse_name
 
         month = str(month) if month > 9 else "0" + str(month)
         date = f"{str(year)}.{month}.01/"
         url = self.base_url + date + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
+    def fetch_many(self, requests, *, method='get_hdf', max_workers=4, **kwargs):
+        """
+        Downloads many files concurrently.
+
+        Parameters
+        ----------
+        requests: `list` of `dict`
+            Keyword arguments for `method` identifying each file, e.g.
+            ``{'year': 2020, 'month': 2, 'tile': (24, 6)}``.
+        method: `str`
+            Name of the download method to run, by default ``'get_hdf'``.
+        max_workers: `int`
+            Maximum number of concurrent downloads. By default 4.
+        kwargs: keyword arguments to be passed to `AbstractUSGSDownloader.fetch`
+
+        Returns
+        -------
+        results: `list` of `~wildfirepy.net.util.bulk.FetchResult`
+            Per-file outcome, in the order of `requests`.
+        """
+        return super().fetch_many(requests, method=method, max_workers=max_workers, **kwargs)
+
 
 class ModisBurntAreaDownloader(Modis):
     """
@@ -1,7 +1,12 @@
+import warnings
 from pathlib import Path
 from urllib.error import HTTPError
 
 from wildfirepy.net.util import URLOpenerWithRedirect
+from wildfirepy.net.util.aio import AsyncClient
+from wildfirepy.net.util.bulk import fetch_many
+from wildfirepy.net.util.catalog import get_catalog
+from wildfirepy.net.util.download import download, get_granule_metadata
 
 __all__ = ['AbstractUSGSDownloader']
 
@@ -15,6 +20,13 @@ class AbstractUSGSDownloader:
         self.url_opener = URLOpenerWithRedirect()
         self.has_files = False
 
+    @property
+    def aio(self):
+        """
+        An `~wildfirepy.net.util.aio.AsyncClient` exposing every method as a coroutine.
+        """
+        return AsyncClient(self)
+
     def _get_available_dates(self):
         """
         Returns dates for which data is available.
@@ -69,7 +81,7 @@ class AbstractUSGSDownloader:
         """
         raise NotImplementedError
 
-    def fetch(self, url, path='./', filename='temp.h5'):
+    def fetch(self, url, path='./', filename='temp.h5', verify=True, chunk_size=1 << 20):
         """
         Fetches data from `url`.
 
@@ -81,23 +93,61 @@ class AbstractUSGSDownloader:
             path to store the downladed file.
         filename: `str`
             name of the downladed file.
+        verify: `bool`
+            If `True`, `h5` and `hdf` granules are checked against the size
+            and checksum published in their `xml` metadata.
+        chunk_size: `int`
+            Number of bytes streamed to disk at a time.
 
         Returns
         -------
         path: `str`
             Absolute path to the downloaded file.
+
+        Raises
+        ------
+        urllib.error.HTTPError
+            If the file cannot be downloaded, after retries.
+        IOError
+            If the downloaded file fails verification.
         """
         data_folder = Path(path)
         filename = data_folder / filename
         try:
-            response = self.url_opener(url)
+            metadata = None
+            if verify and url.endswith(('.h5', '.hdf')):
+                metadata = get_granule_metadata(self.url_opener, url)
+            download(self.url_opener, url, filename, chunk_size=chunk_size, metadata=metadata)
+            get_catalog().add(filename)
             print("Download Successful!")
-            print("Writing file!")
-            with open(filename, 'wb') as file:
-                file.write(response.read())
-            response.close()
             return filename.absolute().as_posix()
 
         except HTTPError as err:
-            output = format(err)
-            print(output)
+            warnings.warn(UserWarning(f"Could not download {url}: {format(err)}"))
+            raise
+
+    def fetch_many(self, requests, *, method='get_h5', max_workers=4, **kwargs):
+        """
+        Downloads many files concurrently.
+
+        All downloads share this downloader's URL opener, and with it a single
+        Earthdata session cookie jar. Listings are resolved through the shared
+        listing cache, so requests for one date fetch its listing once.
+
+        Parameters
+        ----------
+        requests: `list` of `dict`
+            Keyword arguments for `method` identifying each file.
+        method: `str`
+            Name of the download method to run, by default ``'get_h5'``.
+        max_workers: `int`
+            Maximum number of concurrent downloads. By default 4.
+        kwargs: `dict`
+            keyword arguments to be passed to `AbstractUSGSDownloader.fetch`
+
+        Returns
+        -------
+        results: `list` of `~wildfirepy.net.util.bulk.FetchResult`
+            Per-file outcome, in the order of `requests`.
+        """
+        return fetch_many(getattr(self, method), requests, max_workers=max_workers, **kwargs)
@@ -72,8 +72,7 @@ class Viirs(AbstractUSGSDownloader):
 
         self.regex_traverser(self.base_url + date)
 
-        filename = f"{self.product}.A{year}{'%03d' % julian_day}.{time}.001."
-        filename = self.regex_traverser.get_filename(filename)
+        filename = self.regex_traverser.get_swath_filename(year, julian_day, time)
         url = self.base_url + date + '/' + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
@@ -104,8 +103,9 @@ class Viirs(AbstractUSGSDownloader):
         date, julian_day = self._get_date(year=year, month=month, date=date)
         time = self._get_nearest_time(hours=hours, minutes=minutes)
 
-        filename = f"{self.product}.A{year}{'%03d' % julian_day}.{time}.001."
-        filename = self.regex_traverser.get_filename(filename) + '.xml'
+        self.regex_traverser(self.base_url + date)
+
+        filename = self.regex_traverser.get_swath_filename(year, julian_day, time) + '.xml'
         url = self.base_url + date + '/' + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
@@ -150,8 +150,7 @@ class Viirs_ext(Viirs):
 
         self.regex_traverser(self.base_url + date)
 
-        filename = f"{self.product}.A{year}{'%03d' % julian_day}.{h}.001.{v}"
-        filename = self.regex_traverser.get_filename(filename)
+        filename = self.regex_traverser.get_tile_filename(h, v)
         url = self.base_url + date + '/' + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
@@ -182,8 +181,9 @@ class Viirs_ext(Viirs):
         date, julian_day = self._get_date(year=year, month=month, date=date)
         h, v = self.converter(latitude, longitude)
 
-        filename = f"{self.product}.A{year}{'%03d' % julian_day}.{h}.001.{v}"
-        filename = self.regex_traverser.get_filename(filename) + '.xml'
+        self.regex_traverser(self.base_url + date)
+
+        filename = self.regex_traverser.get_tile_filename(h, v) + '.xml'
         url = self.base_url + date + '/' + filename
         return self.fetch(url=url, filename=filename, **kwargs)
 
@@ -1,3 +1,11 @@
+from wildfirepy.net.util.aio import *
+from wildfirepy.net.util.bulk import *
+from wildfirepy.net.util.cache import *
+from wildfirepy.net.util.catalog import *
+from wildfirepy.net.util.listing import *
+from wildfirepy.net.util.pool import *
+from wildfirepy.net.util.scheduler import *
+from wildfirepy.net.util.session import *
 from wildfirepy.net.util.usgs import *
 
-__all__ = ['usgs']
+__all__ = ['usgs', 'cache', 'bulk', 'scheduler', 'catalog', 'aio', 'session', 'listing', 'pool']
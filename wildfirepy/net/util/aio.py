@@ -0,0 +1,498 @@
+import asyncio
+import base64
+import copy
+import inspect
+import threading
+import time
+import warnings
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from http.cookiejar import Cookie, http2time
+from http.cookies import Morsel
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlparse
+
+from wildfirepy.net.util.bulk import FetchResult
+from wildfirepy.net.util.catalog import get_catalog
+from wildfirepy.net.util.download import (download_async,
+                                          get_granule_metadata_async)
+from wildfirepy.net.util.scheduler import get_scheduler
+from wildfirepy.net.util.session import get_session
+
+__all__ = ['AsyncClient', 'AsyncSession', 'fetch_many_async', 'get_async_session',
+           'set_async_session']
+
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 10
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("Asynchronous downloads require aiohttp: "
+                          "pip install wildfirepy[async]") from None
+    return aiohttp
+
+
+class _LoopState:
+    """
+    The `aiohttp` client session of one event loop and its per-host semaphores.
+    """
+    def __init__(self, client, session, max_per_host):
+        self.client = client
+        self.session = session
+        self.semaphores = defaultdict(lambda: asyncio.Semaphore(max_per_host))
+        self.synced = None
+
+
+class AsyncSession:
+    """
+    An `aiohttp` session sharing the login of an Earthdata session.
+
+    Requests carry the cookies of the
+    `~wildfirepy.net.util.session.EarthdataSession`, and the cookies the
+    servers set, e.g. after a login, are written back to it, so blocking and
+    asynchronous downloads log in once between them. Credentials are only
+    sent to the login host. Requests get the timeout, retries and rate
+    limit of the `~wildfirepy.net.util.scheduler.RequestScheduler`, and at
+    most `max_per_host` of them are in flight per host however many
+    coroutines await them. A request holds its host slot until its response
+    is released, so the cap covers streaming the body.
+
+    The underlying `aiohttp.ClientSession` belongs to the event loop it was
+    created on, one is made for every loop the session is used on. Await
+    `close` before the loop ends.
+
+    Parameters
+    ----------
+    session: `~wildfirepy.net.util.session.EarthdataSession`
+        Session holding the credentials and cookies. By default the
+        process-wide one.
+    scheduler: `~wildfirepy.net.util.scheduler.RequestScheduler`
+        Scheduler whose timeout, retries and rate limit apply. By default
+        the process-wide one.
+    max_per_host: `int`
+        Maximum number of requests in flight per host. By default the
+        ``max_per_host`` of `scheduler`.
+
+    Examples
+    --------
+    >>> async with AsyncSession() as session:
+    ...     async with session.open(url) as response:
+    ...         content = await response.read()
+    """
+    def __init__(self, session=None, scheduler=None, max_per_host=None):
+        self._session = session
+        self._scheduler = scheduler
+        self._max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._states = weakref.WeakKeyDictionary()
+
+    @property
+    def session(self):
+        return self._session or get_session()
+
+    @property
+    def scheduler(self):
+        return self._scheduler or get_scheduler()
+
+    @property
+    def max_per_host(self):
+        return self._max_per_host or self.scheduler.max_per_host
+
+    def _get_state(self):
+        loop = asyncio.get_running_loop()
+        session = self.session
+        with self._lock:
+            state = self._states.get(loop)
+            if state is not None and not state.client.closed and state.session is session:
+                return state
+        aiohttp = _import_aiohttp()
+        jar = aiohttp.CookieJar(unsafe=True)
+        _load_cookies(jar, session.cookies)
+        timeout = self.scheduler.timeout
+        client = aiohttp.ClientSession(cookie_jar=jar,
+                                       timeout=aiohttp.ClientTimeout(sock_connect=timeout,
+                                                                     sock_read=timeout))
+        state = _LoopState(client, session, self.max_per_host)
+        with self._lock:
+            self._states[loop] = state
+        return state
+
+    async def _acquire_token(self):
+        wait = self.scheduler._take_token()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self.scheduler._take_token()
+
+    async def _send(self, state, url, headers):
+        session = state.session
+        login_host = urlparse(session.top_level_url).hostname
+        username, password = session.auth_manager.find_user_password(None, session.top_level_url)
+        credentials = None
+        if username is not None:
+            credentials = base64.b64encode(f'{username}:{password}'.encode()).decode('ascii')
+        for _ in range(_MAX_REDIRECTS + 1):
+            request_headers = headers
+            if credentials is not None and urlparse(url).hostname == login_host:
+                request_headers = dict(headers, Authorization=f'Basic {credentials}')
+            response = await state.client.get(url, headers=request_headers,
+                                              allow_redirects=False)
+            if response.status not in _REDIRECT_CODES or 'Location' not in response.headers:
+                return response
+            url = urljoin(url, response.headers['Location'])
+            response.release()
+        raise HTTPError(url, response.status, "Too many redirects", response.headers, None)
+
+    async def _request(self, state, url, headers):
+        aiohttp = _import_aiohttp()
+        scheduler = self.scheduler
+        for attempt in range(scheduler.retries + 1):
+            await self._acquire_token()
+            try:
+                response = await self._send(state, url, headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                if attempt == scheduler.retries:
+                    raise URLError(err) from err
+                delay = scheduler._get_delay(attempt)
+            else:
+                self._save_cookies(state)
+                if 200 <= response.status < 300:
+                    return response
+                response.release()
+                err = HTTPError(str(response.url), response.status, response.reason,
+                                response.headers, None)
+                if err.code not in scheduler.RETRY_CODES or attempt == scheduler.retries:
+                    raise err
+                delay = scheduler._get_delay(attempt, err)
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def open(self, url, headers=None):
+        """
+        Sends a ``GET`` request for `url`, retrying transient failures.
+
+        Parameters
+        ----------
+        url: `str`
+            URL to open.
+        headers: `dict`
+            Extra request headers, e.g. ``Range``.
+
+        Returns
+        -------
+        response: `aiohttp.ClientResponse`
+            An asynchronous context manager yielding the response, holding
+            a per-host slot until it exits.
+
+        Raises
+        ------
+        urllib.error.HTTPError
+            For responses other than 2xx, after retries, as the blocking
+            openers do.
+        urllib.error.URLError
+            If the server cannot be reached, after retries.
+        """
+        state = self._get_state()
+        async with state.semaphores[urlparse(url).netloc]:
+            response = await self._request(state, url, headers or {})
+            try:
+                yield response
+            finally:
+                response.release()
+
+    def _save_cookies(self, state):
+        current = {(morsel['domain'], morsel['path'], morsel.key, morsel.value)
+                   for morsel in state.client.cookie_jar}
+        if current == state.synced:
+            return
+        state.synced = current
+        cookies = state.session.cookies
+        domains = {cookie.domain for cookie in cookies}
+        for morsel in state.client.cookie_jar:
+            cookies.set_cookie(_to_cookie(morsel, domains))
+        state.session.save()
+
+    async def close(self):
+        """
+        Closes the `aiohttp` session of the running event loop.
+        """
+        with self._lock:
+            state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+def _load_cookies(jar, cookies):
+    from yarl import URL
+
+    now = time.time()
+    for cookie in cookies:
+        if cookie.expires is not None and cookie.expires <= now:
+            continue
+        morsel = Morsel()
+        morsel.set(cookie.name, cookie.value, cookie.value)
+        morsel['path'] = cookie.path
+        if cookie.domain_specified:
+            morsel['domain'] = cookie.domain.lstrip('.')
+        if cookie.expires is not None:
+            morsel['max-age'] = str(int(cookie.expires - now))
+        if cookie.secure:
+            morsel['secure'] = True
+        scheme = 'https' if cookie.secure else 'http'
+        jar.update_cookies({cookie.name: morsel},
+                           URL(f"{scheme}://{cookie.domain.lstrip('.')}{cookie.path}"))
+
+
+def _to_cookie(morsel, domains):
+    domain = morsel['domain']
+    domain_specified = '.' + domain in domains
+    if domain_specified:
+        domain = '.' + domain
+    expires = None
+    if morsel['max-age']:
+        expires = int(time.time() + int(morsel['max-age']))
+    elif morsel['expires']:
+        expires = http2time(morsel['expires'])
+    return Cookie(0, morsel.key, morsel.value, None, False, domain, domain_specified,
+                  domain_specified, morsel['path'] or '/', bool(morsel['path']),
+                  bool(morsel['secure']), expires, expires is None, None, None, {})
+
+
+_async_session = None
+_async_session_lock = threading.Lock()
+
+
+def get_async_session():
+    """
+    Returns the process-wide `AsyncSession`.
+    """
+    global _async_session
+    with _async_session_lock:
+        if _async_session is None:
+            _async_session = AsyncSession()
+    return _async_session
+
+
+def set_async_session(session):
+    """
+    Replaces the process-wide `AsyncSession`.
+    """
+    global _async_session
+    with _async_session_lock:
+        _async_session = session
+
+
+async def fetch_many_async(getter, requests, **kwargs):
+    """
+    Awaits `getter` once per request, all at once on the running event loop.
+
+    The coroutine counterpart of `~wildfirepy.net.util.bulk.fetch_many`.
+    Errors are caught per request, so one missing granule does not abort
+    the whole batch. Concurrency is bounded by the per-host cap of the
+    `AsyncSession` the calls share.
+
+    Parameters
+    ----------
+    getter: `callable`
+        Download coroutine function, e.g. ``AsyncClient.get_h5``. Called
+        with the keyword arguments in each request and `kwargs`.
+    requests: `list` of `dict`
+        Keyword arguments identifying each file, e.g. date and tile.
+    kwargs: `dict`
+        Keyword arguments passed to every call, e.g. ``path``.
+
+    Returns
+    -------
+    results: `list` of `~wildfirepy.net.util.bulk.FetchResult`
+        One result per request, in the order of `requests`.
+    """
+    async def run(request):
+        try:
+            path = await getter(**request, **kwargs)
+        except Exception as err:
+            return FetchResult(request, None, err)
+        if path is None:
+            return FetchResult(request, None, IOError("Download failed."))
+        return FetchResult(request, path, None)
+
+    return list(await asyncio.gather(*(run(request) for request in requests)))
+
+
+class _ListingMissing(Exception):
+    """
+    Raised while planning a call that needs a listing not cached yet.
+    """
+    def __init__(self, url):
+        super().__init__(url)
+        self.url = url
+
+
+def _defer(request):
+    raise _ListingMissing(request.full_url)
+
+
+class _PlannedListings:
+    """
+    A listing cache serving only listings that need no request.
+    """
+    def __init__(self, listing_cache, listings):
+        self.listing_cache = listing_cache
+        self.listings = listings
+
+    def get(self, url, url_opener):
+        if url in self.listings:
+            return self.listings[url]
+        return self.listing_cache.get(url, _defer)
+
+
+class _Fetch:
+    """
+    A download a downloader method asked for while it was planned.
+    """
+    def __init__(self, arguments):
+        self.arguments = arguments
+
+
+class AsyncClient:
+    """
+    Native `asyncio` counterparts of the methods of a downloader.
+
+    Every method of the wrapped client is available as a coroutine with the
+    same name and arguments, e.g. ``get_h5``, ``get_hdf`` or ``get_listing``.
+    The client's own method works out which listings and file it needs, and
+    those are fetched with non-blocking I/O on `session`: listings through
+    the client's listing cache, downloads resumed and verified like blocking
+    ones and added to the catalog. No thread is used, so thousands of calls
+    can be interleaved on one event loop, bounded by the per-host cap of
+    `session`.
+
+    Parameters
+    ----------
+    client: `object`
+        The downloader, e.g. a `Viirs1KM` or `VIIRSBurntAreaDownloader`.
+    session: `AsyncSession`
+        Session to send requests with. By default the one from
+        `get_async_session`.
+
+    Examples
+    --------
+    >>> client = AsyncClient(VNP14A1())
+    >>> files = await asyncio.gather(*(client.get_h5(obsdate=date, tile=(24, 6))
+    ...                                for date in dates))
+    """
+    def __init__(self, client, session=None):
+        self.client = client
+        self._session = session
+
+    @property
+    def session(self):
+        return self._session or get_async_session()
+
+    def _plan(self, name, args, kwargs, listings):
+        client = copy.copy(self.client)
+        traverser = getattr(client, 'regex_traverser', None)
+        if traverser is not None:
+            traverser = copy.copy(traverser)
+            traverser._listing_cache = _PlannedListings(traverser.listing_cache, listings)
+            client.regex_traverser = traverser
+        client.fetch = self._plan_fetch
+        return getattr(client, name)(*args, **kwargs)
+
+    def _plan_fetch(self, *args, **kwargs):
+        return _Fetch(self._bind_fetch(args, kwargs))
+
+    def _bind_fetch(self, args, kwargs):
+        arguments = inspect.signature(self.client.fetch).bind(*args, **kwargs)
+        arguments.apply_defaults()
+        return arguments.arguments
+
+    async def _call(self, name, args, kwargs):
+        listings = {}
+        while True:
+            try:
+                result = self._plan(name, args, kwargs, listings)
+            except _ListingMissing as missing:
+                listing_cache = self.client.regex_traverser.listing_cache
+                listings[missing.url] = await listing_cache.get_async(missing.url, self.session)
+                continue
+            if isinstance(result, _Fetch):
+                return await self.fetch(**result.arguments)
+            return result
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if not callable(attribute):
+            return attribute
+
+        async def method(*args, **kwargs):
+            return await self._call(name, args, kwargs)
+        method.__name__ = name
+        method.__doc__ = attribute.__doc__
+        return method
+
+    async def fetch(self, *args, **kwargs):
+        """
+        Downloads a file, taking the arguments of the client's ``fetch``.
+
+        Returns
+        -------
+        path: `str`
+            Absolute path to the downloaded file.
+
+        Raises
+        ------
+        urllib.error.HTTPError
+            If the file cannot be downloaded, after retries.
+        IOError
+            If the downloaded file fails verification.
+        """
+        arguments = self._bind_fetch(args, kwargs)
+        url = arguments['url']
+        filename = Path(arguments['path']) / arguments['filename']
+        try:
+            metadata = None
+            if arguments.get('verify', True) and url.endswith(('.h5', '.hdf')):
+                metadata = await get_granule_metadata_async(self.session, url)
+            await download_async(self.session, url, filename,
+                                 chunk_size=arguments.get('chunk_size', 1 << 20),
+                                 metadata=metadata)
+            get_catalog().add(filename)
+            print("Download Successful!")
+            return filename.absolute().as_posix()
+
+        except HTTPError as err:
+            warnings.warn(UserWarning(f"Could not download {url}: {format(err)}"))
+            raise
+
+    async def fetch_many(self, requests, *, method='get_h5', **kwargs):
+        """
+        Downloads many files concurrently on the running event loop.
+
+        Parameters
+        ----------
+        requests: `list` of `dict`
+            Keyword arguments for `method` identifying each file.
+        method: `str`
+            Name of the download coroutine to run, by default ``'get_h5'``.
+        kwargs: `dict`
+            Keyword arguments passed to every call, e.g. ``path``.
+
+        Returns
+        -------
+        results: `list` of `~wildfirepy.net.util.bulk.FetchResult`
+            Per-file outcome, in the order of `requests`.
+        """
+        return await fetch_many_async(getattr(self, method), requests, **kwargs)
+
+    def __repr__(self):
+        return f"<AsyncClient {self.client!r}>"
@@ -0,0 +1,55 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ['FetchResult', 'fetch_many']
+
+FetchResult = namedtuple('FetchResult', ['request', 'path', 'error'])
+FetchResult.__doc__ = """
+Outcome of a single download requested through `fetch_many`.
+
+Parameters
+----------
+request: `dict`
+    The request as it was passed in.
+path: `str`
+    Absolute path to the downloaded file, `None` if the download failed.
+error: `Exception`
+    The error raised while downloading, `None` on success.
+"""
+
+
+def fetch_many(getter, requests, max_workers=4, **kwargs):
+    """
+    Runs `getter` once per request over a bounded thread pool.
+
+    Errors are caught per request, so one missing granule does not abort
+    the whole batch.
+
+    Parameters
+    ----------
+    getter: `callable`
+        Download method, e.g. ``Viirs1KM.get_h5``. Called with the keyword
+        arguments in each request and `kwargs`.
+    requests: `list` of `dict`
+        Keyword arguments identifying each file, e.g. date and tile.
+    max_workers: `int`
+        Maximum number of concurrent downloads. By default 4.
+    kwargs: `dict`
+        Keyword arguments passed to every call, e.g. ``path``.
+
+    Returns
+    -------
+    results: `list` of `FetchResult`
+        One result per request, in the order of `requests`.
+    """
+    def run(request):
+        try:
+            path = getter(**request, **kwargs)
+        except Exception as err:
+            return FetchResult(request, None, err)
+        if path is None:
+            return FetchResult(request, None, IOError("Download failed."))
+        return FetchResult(request, path, None)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run, requests))
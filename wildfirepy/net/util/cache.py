@@ -0,0 +1,198 @@
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.error import HTTPError
+from urllib.request import Request
+
+from wildfirepy.config import get_cache_dir
+
+__all__ = ['ListingCache', 'get_cache_dir', 'get_listing_cache']
+
+
+class ListingCache:
+    """
+    An on-disk cache for LP DAAC directory listings, keyed by URL.
+
+    Listings are kept in a SQLite database together with their ``ETag`` and
+    ``Last-Modified`` headers. A listing younger than `ttl` is served
+    straight from the cache, an older one is revalidated with a conditional
+    request. Listings of date directories older than `immutable_after` never
+    change upstream and are cached forever.
+
+    Parameters
+    ----------
+    path: `str`
+        Path to the SQLite database.
+        By default ``listings.sqlite`` inside `~wildfirepy.config.get_cache_dir`.
+    ttl: `float`
+        Seconds for which a mutable listing is considered fresh.
+        By default 3600.
+    immutable_after: `datetime.timedelta`
+        Age after which a date directory listing is treated as immutable.
+        By default 14 days.
+
+    Examples
+    --------
+    >>> cache = ListingCache()
+    >>> html = cache.get('https://e4ftl01.cr.usgs.gov/VIIRS/VNP14A1.001/2020.02.01/', opener)
+    """
+    DATE_DIRECTORY = re.compile(r'/(\d{4})\.(\d{2})\.(\d{2})/?$')
+
+    def __init__(self, path=None, ttl=3600, immutable_after=timedelta(days=14)):
+        self.path = str(path or get_cache_dir() / 'listings.sqlite')
+        self.ttl = ttl
+        self.immutable_after = immutable_after
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS listings ("
+                                     "url TEXT PRIMARY KEY, content TEXT, etag TEXT, "
+                                     "last_modified TEXT, fetched_at REAL)")
+
+    def is_immutable(self, url):
+        """
+        Returns `True` if `url` is a date directory old enough to never change.
+        """
+        match = self.DATE_DIRECTORY.search(url)
+        if match is None:
+            return False
+        date = datetime(*map(int, match.groups()))
+        return datetime.now() - date > self.immutable_after
+
+    def _is_fresh(self, url, fetched_at):
+        return self.is_immutable(url) or time.time() - fetched_at < self.ttl
+
+    def _lookup(self, url):
+        if url in self._memory:
+            return self._memory[url]
+        row = self._connection.execute("SELECT content, etag, last_modified, fetched_at "
+                                       "FROM listings WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            self._memory[url] = row
+        return row
+
+    def _store(self, url, content, etag, last_modified):
+        row = (content, etag, last_modified, time.time())
+        self._memory[url] = row
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?)",
+                                     (url,) + row)
+
+    def get(self, url, url_opener):
+        """
+        Returns the listing at `url`, fetching it with `url_opener` only if needed.
+
+        Parameters
+        ----------
+        url: `str`
+            URL of the directory listing.
+        url_opener: `callable`
+            Called with a `urllib.request.Request`, e.g. a `URLOpenerWithRedirect`.
+
+        Returns
+        -------
+        content: `str`
+            The decoded HTML page.
+        """
+        row = self._get_row(url)
+        if row is not None and self._is_fresh(url, row[3]):
+            return row[0]
+
+        try:
+            response = url_opener(Request(url, headers=self._get_validators(row)))
+        except HTTPError as err:
+            return self._not_modified(url, row, err)
+
+        try:
+            content = response.read().decode('cp1252')
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        finally:
+            response.close()
+        with self._lock:
+            self._store(url, content, etag, last_modified)
+        return content
+
+    async def get_async(self, url, session):
+        """
+        Returns the listing at `url`, fetching it with `session` only if needed.
+
+        The coroutine counterpart of `get`, sharing the same cache.
+
+        Parameters
+        ----------
+        url: `str`
+            URL of the directory listing.
+        session: `~wildfirepy.net.util.aio.AsyncSession`
+            Session to fetch the listing with.
+
+        Returns
+        -------
+        content: `str`
+            The decoded HTML page.
+        """
+        row = self._get_row(url)
+        if row is not None and self._is_fresh(url, row[3]):
+            return row[0]
+
+        try:
+            async with session.open(url, headers=self._get_validators(row)) as response:
+                content = (await response.read()).decode('cp1252')
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except HTTPError as err:
+            return self._not_modified(url, row, err)
+        with self._lock:
+            self._store(url, content, etag, last_modified)
+        return content
+
+    def _get_row(self, url):
+        with self._lock:
+            return self._lookup(url)
+
+    @staticmethod
+    def _get_validators(row):
+        headers = {}
+        if row is not None:
+            if row[1]:
+                headers['If-None-Match'] = row[1]
+            if row[2]:
+                headers['If-Modified-Since'] = row[2]
+        return headers
+
+    def _not_modified(self, url, row, err):
+        if err.code != 304 or row is None:
+            raise err
+        with self._lock:
+            self._store(url, *row[:3])
+        return row[0]
+
+    def invalidate(self, url=None):
+        """
+        Drops `url` from the cache, or every listing if `url` is `None`.
+        """
+        with self._lock, self._connection:
+            if url is None:
+                self._memory.clear()
+                self._connection.execute("DELETE FROM listings")
+            else:
+                self._memory.pop(url, None)
+                self._connection.execute("DELETE FROM listings WHERE url = ?", (url,))
+
+
+_listing_cache = None
+_listing_cache_lock = threading.Lock()
+
+
+def get_listing_cache():
+    """
+    Returns the process-wide `ListingCache` shared by all HTML parsers.
+    """
+    global _listing_cache
+    with _listing_cache_lock:
+        if _listing_cache is None:
+            _listing_cache = ListingCache()
+    return _listing_cache
@@ -0,0 +1,236 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from wildfirepy.config import get_cache_dir
+from wildfirepy.granule import parse_granules
+
+__all__ = ['GranuleCatalog', 'get_catalog']
+
+
+class GranuleCatalog:
+    """
+    A SQLite index of tiled granules stored on the local disk.
+
+    Granules are indexed on product, acquisition date, tile, collection and
+    production time, so checking whether a tile is on disk is an indexed
+    lookup instead of a scan over the data directory. Downloaders register
+    files as they fetch them; directories filled by other means are indexed
+    with `scan`, or with `ensure_scanned`, which rescans a directory
+    whenever its modification time changes. Files added to subdirectories
+    do not change that time and need an explicit `scan`.
+
+    Parameters
+    ----------
+    path: `str`
+        Path to the SQLite database.
+        By default ``granules.sqlite`` inside `~wildfirepy.config.get_cache_dir`.
+
+    Examples
+    --------
+    >>> catalog = GranuleCatalog()
+    >>> catalog.scan('/data/VIIRS1KM')
+    >>> catalog.find('VNP14A1', year=2020, doy=32, h=24, v=6)
+    """
+    def __init__(self, path=None):
+        self.path = str(path or get_cache_dir() / 'granules.sqlite')
+        self._lock = threading.Lock()
+        self._scanned = {}
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS granules ("
+                                     "path TEXT PRIMARY KEY, product TEXT, year INTEGER, "
+                                     "doy INTEGER, h INTEGER, v INTEGER, collection TEXT, "
+                                     "production TEXT)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS granules_tile ON granules "
+                                     "(product, year, doy, h, v)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS directories "
+                                     "(path TEXT PRIMARY KEY, mtime REAL)")
+            columns = [row[1] for row in
+                       self._connection.execute("PRAGMA table_info(directories)")]
+            if 'mtime' not in columns:
+                self._connection.execute("ALTER TABLE directories ADD COLUMN mtime REAL")
+
+    def add(self, filepath):
+        """
+        Registers a granule file.
+
+        Parameters
+        ----------
+        filepath: `str`
+            Path to the granule.
+
+        Returns
+        -------
+        added: `bool`
+            `False` if the file name is not a tiled granule name.
+        """
+        return self._add_many([filepath]) == 1
+
+    def _add_many(self, filepaths):
+        filepaths = [Path(filepath).absolute() for filepath in filepaths]
+        rows = [(filepath.as_posix(), granule.product, granule.year, granule.doy, granule.h,
+                 granule.v, granule.collection, granule.production)
+                for filepath, granule in zip(filepaths,
+                                             parse_granules(path.name for path in filepaths))
+                if granule is not None and granule.tile is not None]
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO granules "
+                                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def remove(self, filepath):
+        """
+        Drops a granule file from the catalog.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM granules WHERE path = ?",
+                                     (Path(filepath).absolute().as_posix(),))
+
+    def find(self, product, year, doy, h, v, collection=None, directory=None):
+        """
+        Returns the path of a granule on disk, or `None` if there is none.
+
+        If several production versions exist, the most recent one is returned.
+        Entries whose file has been deleted are dropped on the way.
+
+        Parameters
+        ----------
+        product: `str`
+            Product name, e.g. ``'VNP14A1'``.
+        year: `int`
+            Year of the observation.
+        doy: `int`
+            Day of year of the observation.
+        h: `int`
+            Sinusoidal grid longitude.
+        v: `int`
+            Sinusoidal grid latitude.
+        collection: `str`
+            Collection, e.g. ``'001'``. By default any.
+        directory: `str`
+            Only return granules below this directory. By default any.
+        """
+        query = ("SELECT path FROM granules "
+                 "WHERE product = ? AND year = ? AND doy = ? AND h = ? AND v = ?")
+        args = [product, year, doy, h, v]
+        if collection is not None:
+            query += " AND collection = ?"
+            args.append(collection)
+        if directory is not None:
+            prefix = Path(directory).absolute().as_posix().rstrip('/') + '/'
+            query += " AND substr(path, 1, ?) = ?"
+            args += [len(prefix), prefix]
+        query += " ORDER BY production DESC"
+
+        with self._lock:
+            paths = [row[0] for row in self._connection.execute(query, args)]
+        for path in paths:
+            if os.path.exists(path):
+                return path
+            self.remove(path)
+        return None
+
+    def get_granules(self, product=None, directory=None):
+        """
+        Returns every catalogued granule, parsed.
+
+        Parameters
+        ----------
+        product: `str`
+            Product name, e.g. ``'VNP14A1'``. By default every product.
+        directory: `str`
+            Only return granules below this directory. By default any.
+
+        Returns
+        -------
+        granules: `list` of `tuple`
+            ``(granule, path)`` pairs of a `~wildfirepy.granule.Granule` and
+            its path, sorted. A granule stored in several directories is
+            listed once per copy.
+        """
+        conditions, args = [], []
+        if product is not None:
+            conditions.append("product = ?")
+            args.append(product)
+        if directory is not None:
+            prefix = Path(directory).absolute().as_posix().rstrip('/') + '/'
+            conditions.append("substr(path, 1, ?) = ?")
+            args += [len(prefix), prefix]
+        query = "SELECT path FROM granules"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            paths = [row[0] for row in self._connection.execute(query, args)]
+        return sorted(zip(parse_granules(os.path.basename(path) for path in paths), paths))
+
+    def scan(self, directory):
+        """
+        Indexes every granule below `directory`.
+
+        Parameters
+        ----------
+        directory: `str`
+            Directory to scan recursively.
+
+        Returns
+        -------
+        count: `int`
+            Number of granules found.
+        """
+        directory = Path(directory).absolute()
+        mtime = directory.stat().st_mtime
+        count = self._add_many(filepath for filepath in directory.rglob('*') if filepath.is_file())
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO directories VALUES (?, ?)",
+                                     (directory.as_posix(), mtime))
+        self._scanned[directory.as_posix()] = mtime
+        return count
+
+    def rebuild(self, directory):
+        """
+        Drops every entry and re-indexes `directory` from scratch.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM granules")
+            self._connection.execute("DELETE FROM directories")
+        self._scanned.clear()
+        return self.scan(directory)
+
+    def ensure_scanned(self, directory):
+        """
+        Scans `directory` unless it is indexed and unchanged since.
+
+        Lets a catalog pick up granules downloaded before it existed or
+        copied into `directory` by other means. A directory counts as changed
+        when its modification time differs from the one of the last scan.
+        """
+        directory = Path(directory).absolute().as_posix()
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return
+        if self._scanned.get(directory) == mtime:
+            return
+        with self._lock:
+            row = self._connection.execute("SELECT mtime FROM directories WHERE path = ?",
+                                           (directory,)).fetchone()
+        if row is None or row[0] != mtime:
+            self.scan(directory)
+        self._scanned[directory] = mtime
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """
+    Returns the process-wide `GranuleCatalog` shared by all downloaders.
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = GranuleCatalog()
+    return _catalog
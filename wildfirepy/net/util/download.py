@@ -0,0 +1,262 @@
+import hashlib
+import os
+import zlib
+from urllib.error import HTTPError
+from urllib.request import Request
+from xml.dom import minidom
+
+__all__ = ['Cksum', 'get_granule_metadata', 'get_granule_metadata_async', 'download',
+           'download_async']
+
+# Bit-reversal table, used to run the MSB-first POSIX cksum CRC through `zlib.crc32`.
+_REVERSED_BITS = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
+
+
+class Cksum:
+    """
+    Incremental POSIX ``cksum`` checksum, as published by LP DAAC.
+
+    Examples
+    --------
+    >>> checksum = Cksum()
+    >>> checksum.update(b'some bytes')
+    >>> checksum.hexdigest()
+    """
+    name = 'cksum'
+
+    def __init__(self):
+        self._crc = 0
+        self._length = 0
+
+    def update(self, data):
+        self._crc = zlib.crc32(data.translate(_REVERSED_BITS), self._crc ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+        self._length += len(data)
+
+    def digest(self):
+        """
+        Returns the checksum as an `int`.
+        """
+        length = self._length
+        suffix = bytearray()
+        while length:
+            suffix.append(length & 0xFF)
+            length >>= 8
+        crc = zlib.crc32(bytes(suffix).translate(_REVERSED_BITS),
+                         self._crc ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+        return int(f'{crc:032b}'[::-1], 2) ^ 0xFFFFFFFF
+
+    def hexdigest(self):
+        """
+        Returns the checksum formatted the way ``cksum`` prints it.
+        """
+        return str(self.digest())
+
+
+def _get_hasher(checksum_type):
+    if checksum_type.upper() == 'CKSUM':
+        return Cksum()
+    return hashlib.new(checksum_type.lower())
+
+
+def get_granule_metadata(url_opener, url):
+    """
+    Reads size and checksum of a granule from its ``.xml`` metadata file.
+
+    Parameters
+    ----------
+    url_opener: `callable`
+        Opener used to fetch the metadata, e.g. a `URLOpenerWithRedirect`.
+    url: `str`
+        URL of the granule itself.
+
+    Returns
+    -------
+    metadata: `dict`
+        ``FileSize``, ``Checksum`` and ``ChecksumType`` of the granule,
+        or `None` if no metadata is published for it.
+    """
+    try:
+        response = url_opener(url + '.xml')
+    except HTTPError:
+        return None
+    try:
+        return _parse_metadata(response.read())
+    finally:
+        response.close()
+
+
+async def get_granule_metadata_async(session, url):
+    """
+    Reads size and checksum of a granule from its ``.xml`` metadata file.
+
+    The coroutine counterpart of `get_granule_metadata`.
+
+    Parameters
+    ----------
+    session: `~wildfirepy.net.util.aio.AsyncSession`
+        Session used to fetch the metadata.
+    url: `str`
+        URL of the granule itself.
+
+    Returns
+    -------
+    metadata: `dict`
+        ``FileSize``, ``Checksum`` and ``ChecksumType`` of the granule,
+        or `None` if no metadata is published for it.
+    """
+    try:
+        async with session.open(url + '.xml') as response:
+            return _parse_metadata(await response.read())
+    except HTTPError:
+        return None
+
+
+def _parse_metadata(content):
+    document = minidom.parseString(content)
+    metadata = {}
+    for tag in ('FileSize', 'Checksum', 'ChecksumType'):
+        nodes = document.getElementsByTagName(tag)
+        if nodes and nodes[0].firstChild is not None:
+            metadata[tag] = nodes[0].firstChild.nodeValue.strip()
+    return metadata
+
+
+def _get_offset(partial):
+    return os.path.getsize(partial) if os.path.exists(partial) else 0
+
+
+def _start_hasher(metadata, partial, offset, chunk_size):
+    if not metadata or 'Checksum' not in metadata:
+        return None
+    hasher = _get_hasher(metadata.get('ChecksumType', 'CKSUM'))
+    if offset:
+        with open(partial, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                hasher.update(chunk)
+    return hasher
+
+
+def _finish(url, filename, partial, metadata, hasher):
+    if metadata and 'FileSize' in metadata:
+        size = os.path.getsize(partial)
+        expected = int(metadata['FileSize'])
+        if size < expected:
+            raise IOError(f"Incomplete download of {url}: got {size} of {expected} bytes.")
+        if size > expected:
+            os.remove(partial)
+            raise IOError(f"Size mismatch for {url}: got {size}, expected {expected} bytes.")
+
+    if hasher is not None and hasher.hexdigest().lower() != metadata['Checksum'].lower():
+        os.remove(partial)
+        raise IOError(f"Checksum mismatch for {url}.")
+
+    os.replace(partial, filename)
+
+
+def download(url_opener, url, filename, chunk_size=1 << 20, metadata=None):
+    """
+    Streams `url` to `filename` in chunks of `chunk_size` bytes.
+
+    Data is written to ``<filename>.part`` first. A partial file left by an
+    interrupted download is resumed with an HTTP ``Range`` request. Once
+    complete, the file is checked against `metadata` and atomically moved
+    into place, so `filename` only ever exists when it is complete.
+
+    Parameters
+    ----------
+    url_opener: `callable`
+        Opener used to fetch the data, e.g. a `URLOpenerWithRedirect`.
+    url: `str`
+        URL to get the data from.
+    filename: `str` or `pathlib.Path`
+        Destination of the download.
+    chunk_size: `int`
+        Number of bytes read and written at a time. By default 1 MiB.
+    metadata: `dict`
+        Expected ``FileSize`` and ``Checksum``/``ChecksumType``, as returned
+        by `get_granule_metadata`. Nothing is verified if `None`.
+
+    Raises
+    ------
+    IOError
+        If the downloaded file does not match `metadata`.
+    """
+    filename = str(filename)
+    partial = filename + '.part'
+    offset = _get_offset(partial)
+
+    request = Request(url)
+    if offset:
+        request.add_header('Range', f'bytes={offset}-')
+    try:
+        response = url_opener(request)
+    except HTTPError as err:
+        # 416: the partial file already holds the whole granule.
+        if not offset or err.code != 416:
+            raise
+        response = None
+    if response is not None and offset and response.getcode() != 206:
+        offset = 0
+
+    hasher = _start_hasher(metadata, partial, offset, chunk_size)
+    if response is not None:
+        try:
+            with open(partial, 'ab' if offset else 'wb') as file:
+                for chunk in iter(lambda: response.read(chunk_size), b''):
+                    file.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+        finally:
+            response.close()
+
+    _finish(url, filename, partial, metadata, hasher)
+
+
+async def download_async(session, url, filename, chunk_size=1 << 20, metadata=None):
+    """
+    Streams `url` to `filename` in chunks of `chunk_size` bytes.
+
+    The coroutine counterpart of `download`, resuming and verifying
+    downloads the same way.
+
+    Parameters
+    ----------
+    session: `~wildfirepy.net.util.aio.AsyncSession`
+        Session used to fetch the data.
+    url: `str`
+        URL to get the data from.
+    filename: `str` or `pathlib.Path`
+        Destination of the download.
+    chunk_size: `int`
+        Number of bytes read and written at a time. By default 1 MiB.
+    metadata: `dict`
+        Expected ``FileSize`` and ``Checksum``/``ChecksumType``, as returned
+        by `get_granule_metadata_async`. Nothing is verified if `None`.
+
+    Raises
+    ------
+    IOError
+        If the downloaded file does not match `metadata`.
+    """
+    filename = str(filename)
+    partial = filename + '.part'
+    offset = _get_offset(partial)
+
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+    try:
+        async with session.open(url, headers=headers) as response:
+            if offset and response.status != 206:
+                offset = 0
+            hasher = _start_hasher(metadata, partial, offset, chunk_size)
+            with open(partial, 'ab' if offset else 'wb') as file:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    file.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+    except HTTPError as err:
+        # 416: the partial file already holds the whole granule.
+        if not offset or err.code != 416:
+            raise
+        hasher = _start_hasher(metadata, partial, offset, chunk_size)
+
+    _finish(url, filename, partial, metadata, hasher)
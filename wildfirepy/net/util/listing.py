@@ -0,0 +1,142 @@
+import re
+from functools import lru_cache
+
+from wildfirepy.granule import parse_granules
+
+__all__ = ['ListingIndex']
+
+
+@lru_cache(maxsize=64)
+def _get_link_pattern(product, extension):
+    return re.compile(f'href="({re.escape(product)}[^"]*?\\.{re.escape(extension)})"')
+
+
+class ListingIndex:
+    """
+    A directory listing parsed once into lookup tables.
+
+    The links to granules of `product` are extracted with a single pass over
+    the page and their names parsed, so finding the granule of a tile or of
+    a swath start time is a dictionary lookup. Where several granules share
+    a key, e.g. reprocessed versions, the most recently produced one is
+    kept, as `~wildfirepy.net.util.catalog.GranuleCatalog.find` and
+    `~wildfirepy.granule.get_latest` do for local granules.
+
+    Parameters
+    ----------
+    content: `str`
+        The HTML page of a date directory.
+    product: `str`
+        Name of the product, e.g. ``'VNP14A1'``. By default every granule.
+    extension: `str`
+        Extension of the granules, e.g. ``'hdf'`` or ``'h5'``. By default ``'hdf'``.
+
+    Attributes
+    ----------
+    files: `list` of `str`
+        Granule names in the order of the page.
+    granules: `list` of `~wildfirepy.granule.Granule`
+        The parsed names of `files`, `None` where a name could not be parsed.
+    tiles: `dict`
+        Maps ``(h, v)`` to the granule name of tiled products.
+    times: `dict`
+        Maps ``(year, doy, 'HHMM')`` to the granule name of swath products.
+
+    Examples
+    --------
+    >>> index = ListingIndex(html, product='VNP14A1', extension='h5')
+    >>> index.get_tile(24, 6)
+    'VNP14A1.A2020032.h24v06.001.2020034000000.h5'
+    """
+    def __init__(self, content, product='', extension='hdf'):
+        self.content = content
+        self.product = product
+        self.extension = extension
+        self.files = _get_link_pattern(product, extension).findall(content)
+        self.granules = parse_granules(self.files)
+        self.tiles = {}
+        self.times = {}
+        latest = {}
+        for filename, granule in zip(self.files, self.granules):
+            if granule is None:
+                continue
+            if granule.h is not None:
+                table, key = self.tiles, (granule.h, granule.v)
+            else:
+                table, key = self.times, (granule.year, granule.doy, granule.time)
+            # Tile keys are pairs and time keys triples, so they never collide.
+            current = latest.get(key)
+            if current is None or granule.production > current.production:
+                latest[key] = granule
+                table[key] = filename
+
+    def __len__(self):
+        return len(self.files)
+
+    def get_tile(self, h, v):
+        """
+        Returns the granule name of a tile.
+
+        Parameters
+        ----------
+        h: `int`
+            Sinusoidal grid longitude.
+        v: `int`
+            Sinusoidal grid latitude.
+
+        Raises
+        ------
+        ValueError
+            If the listing has no granule for the tile.
+        """
+        try:
+            return self.tiles[int(h), int(v)]
+        except KeyError:
+            raise ValueError("No file exists for given coordinates.") from None
+
+    def get_time(self, year, doy, time):
+        """
+        Returns the granule name of a swath.
+
+        Parameters
+        ----------
+        year: `int`
+            Year of the observation.
+        doy: `int`
+            Day of year of the observation.
+        time: `str`
+            Start time of the swath as ``'HHMM'``, UTC.
+
+        Raises
+        ------
+        ValueError
+            If the listing has no granule starting at `time`.
+        """
+        try:
+            return self.times[int(year), int(doy), time]
+        except KeyError:
+            raise ValueError("No file exists for given time.") from None
+
+    def get_prefix(self, prefix):
+        """
+        Returns the first granule name starting with `prefix`.
+
+        Raises
+        ------
+        ValueError
+            If no granule name starts with `prefix`.
+        """
+        for filename in self.files:
+            if filename.startswith(prefix):
+                return filename
+        raise ValueError(f"No file starting with {prefix} exists.")
+
+
+def _get_index(local, content, product, extension):
+    # The index is kept next to the listing it was built from in the
+    # thread-local storage of a parser. Listings come from the listing
+    # cache, which hands out the same string while it is fresh.
+    index = getattr(local, 'index', None)
+    if index is None or index.content is not content:
+        index = local.index = ListingIndex(content, product, extension)
+    return index
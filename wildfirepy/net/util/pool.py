@@ -0,0 +1,188 @@
+import http.client
+import socket
+import threading
+import urllib.request
+from collections import defaultdict
+from urllib.error import URLError
+
+__all__ = ['ConnectionPool', 'KeepAliveHandler', 'KeepAliveHTTPSHandler', 'get_connection_pool']
+
+# Errors of a pooled connection the server closed while it was idle.
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class _PooledResponse(http.client.HTTPResponse):
+    """
+    A response handing its connection back to the pool once it is closed.
+
+    The connection is only reused if the body was read to the end and the
+    server did not ask to close it.
+    """
+    _release = None
+
+    def close(self):
+        release, self._release = self._release, None
+        reusable = self.fp is None and not self.will_close
+        super().close()
+        if release is not None:
+            release(reusable)
+
+
+class _HTTPConnection(http.client.HTTPConnection):
+    response_class = _PooledResponse
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    response_class = _PooledResponse
+
+
+class ConnectionPool:
+    """
+    Idle persistent HTTP connections, by scheme and host.
+
+    Connections are shared by every thread. A request takes an idle
+    connection to its host or opens a new one, and its response puts the
+    connection back once the body has been read and the response closed.
+
+    Parameters
+    ----------
+    max_idle: `int`
+        Maximum number of idle connections kept per host. By default 4,
+        the per-host cap of `~wildfirepy.net.util.scheduler.RequestScheduler`.
+    """
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = defaultdict(list)
+
+    def get(self, key):
+        """
+        Takes an idle connection for `key`, or returns `None` if there is none.
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def put(self, key, connection):
+        """
+        Keeps `connection` for reuse, or closes it if enough are idle already.
+        """
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def clear(self):
+        """
+        Closes every idle connection.
+        """
+        with self._lock:
+            connections = [connection for idle in self._idle.values() for connection in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+
+class _KeepAliveMixin:
+
+    def __init__(self, pool=None, **kwargs):
+        super().__init__(**kwargs)
+        self.pool = pool
+
+    def do_open(self, http_class, req, **http_conn_args):
+        if req._tunnel_host:
+            # Connections through a proxy tunnel are not pooled.
+            return super().do_open(http_class, req, **http_conn_args)
+        host = req.host
+        if not host:
+            raise URLError('no host given')
+        pool = self.pool or get_connection_pool()
+        key = (req.type, host)
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers['Connection'] = 'keep-alive'
+        headers = {name.title(): value for name, value in headers.items()}
+
+        connection = pool.get(key)
+        while True:
+            reused = connection is not None
+            if not reused:
+                connection = http_class(host, timeout=req.timeout, **http_conn_args)
+                connection.set_debuglevel(self._debuglevel)
+            elif req.timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                connection.sock.settimeout(req.timeout)
+            try:
+                try:
+                    connection.request(req.get_method(), req.selector, req.data, headers,
+                                       encode_chunked=req.has_header('Transfer-encoding'))
+                    response = connection.getresponse()
+                except _STALE_ERRORS:
+                    if not reused:
+                        raise
+                    # The server dropped the idle connection, try a new one.
+                    connection.close()
+                    connection = None
+                    continue
+                except OSError as err:
+                    if isinstance(err, http.client.HTTPException):
+                        raise
+                    raise URLError(err)
+            except BaseException:
+                connection.close()
+                raise
+            break
+
+        def release(reusable, connection=connection):
+            if reusable:
+                pool.put(key, connection)
+            else:
+                connection.close()
+        response._release = release
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        return response
+
+
+class KeepAliveHandler(_KeepAliveMixin, urllib.request.HTTPHandler):
+    """
+    A `urllib` handler sending ``http`` requests over persistent connections.
+
+    Unlike the default handler, which opens a new socket for every request
+    and asks the server to close it, connections are kept alive and reused
+    through a `ConnectionPool`.
+
+    Parameters
+    ----------
+    pool: `ConnectionPool`
+        Pool of idle connections. By default the process-wide one.
+    """
+    def http_open(self, req):
+        return self.do_open(_HTTPConnection, req)
+
+
+class KeepAliveHTTPSHandler(_KeepAliveMixin, urllib.request.HTTPSHandler):
+    """
+    A `urllib` handler sending ``https`` requests over persistent connections.
+
+    Parameters
+    ----------
+    pool: `ConnectionPool`
+        Pool of idle connections. By default the process-wide one.
+    context: `ssl.SSLContext`
+        TLS settings of new connections. By default the system defaults.
+    """
+    def https_open(self, req):
+        return self.do_open(_HTTPSConnection, req, context=self._context)
+
+
+_pool = ConnectionPool()
+
+
+def get_connection_pool():
+    """
+    Returns the process-wide `ConnectionPool` used by the Earthdata session.
+    """
+    return _pool
@@ -0,0 +1,196 @@
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+
+__all__ = ['RequestScheduler', 'get_scheduler', 'set_scheduler']
+
+
+class _HostSlotResponse:
+    """
+    A response holding a per-host slot of the scheduler until it is closed.
+
+    Every other attribute is looked up on the wrapped response.
+    """
+    def __init__(self, response, semaphore):
+        self._response = response
+        self._semaphore = semaphore
+        self._released = False
+        self._release_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __iter__(self):
+        return iter(self._response)
+
+    def _release(self):
+        with self._release_lock:
+            if self._released:
+                return
+            self._released = True
+        self._semaphore.release()
+
+    def close(self):
+        try:
+            close = getattr(self._response, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        # Responses dropped without being closed must not leak their slot.
+        self._release()
+
+
+class RequestScheduler:
+    """
+    Schedules HTTP requests to the LP DAAC servers.
+
+    Every request gets a timeout, is retried with exponential backoff and
+    jitter on throttling (429), server errors (5xx) and network errors, and
+    is subject to a per-host concurrency cap and a token-bucket rate limit
+    shared by every downloader in the process. A request holds its host
+    slot until its response is closed, so the cap covers streaming the
+    body, not only opening the connection.
+
+    Parameters
+    ----------
+    timeout: `float`
+        Socket timeout in seconds. By default 60.
+    retries: `int`
+        Number of retries after the first attempt. By default 5.
+    backoff: `float`
+        Base delay in seconds, doubled on every retry. By default 1.
+    max_backoff: `float`
+        Upper bound for a single delay in seconds. By default 60.
+    max_per_host: `int`
+        Maximum number of requests in flight per host. By default 4.
+    rate: `float`
+        Sustained number of requests per second. By default 10.
+    burst: `int`
+        Size of the token bucket. By default `rate`.
+
+    Examples
+    --------
+    >>> scheduler = RequestScheduler(rate=2, max_per_host=2)
+    >>> set_scheduler(scheduler)
+    """
+    RETRY_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(self, timeout=60, retries=5, backoff=1.0, max_backoff=60, max_per_host=4,
+                 rate=10.0, burst=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_per_host = max_per_host
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._hosts = defaultdict(lambda: threading.BoundedSemaphore(self.max_per_host))
+
+    def _take_token(self):
+        """
+        Takes a token from the bucket and returns 0, or returns the seconds until one is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def _acquire_token(self):
+        wait = self._take_token()
+        while wait:
+            time.sleep(wait)
+            wait = self._take_token()
+
+    def _get_delay(self, attempt, err=None):
+        retry_after = err.headers.get('Retry-After') if err is not None and err.headers else None
+        if retry_after is not None and retry_after.isdigit():
+            return min(self.max_backoff, float(retry_after))
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, delay)
+
+    def _open_once(self, opener, request, semaphore):
+        semaphore.acquire()
+        try:
+            response = opener.open(request, timeout=self.timeout)
+        except BaseException:
+            semaphore.release()
+            raise
+        return _HostSlotResponse(response, semaphore)
+
+    def open(self, opener, request):
+        """
+        Opens `request` with `opener`, retrying transient failures.
+
+        Parameters
+        ----------
+        opener: `urllib.request.OpenerDirector`
+            The opener to send the request with.
+        request: `str` or `urllib.request.Request`
+            URL or request to open.
+
+        Returns
+        -------
+        response: `http.client.HTTPResponse`
+            The response, holding a per-host slot until it is closed.
+
+        Raises
+        ------
+        urllib.error.HTTPError
+            Immediately for client errors, or once retries are exhausted.
+        """
+        url = request if isinstance(request, str) else request.full_url
+        with self._lock:
+            semaphore = self._hosts[urlparse(url).netloc]
+
+        for attempt in range(self.retries + 1):
+            self._acquire_token()
+            try:
+                return self._open_once(opener, request, semaphore)
+            except HTTPError as err:
+                if err.code not in self.RETRY_CODES or attempt == self.retries:
+                    raise
+                delay = self._get_delay(attempt, err)
+            except (URLError, socket.timeout, ConnectionError):
+                if attempt == self.retries:
+                    raise
+                delay = self._get_delay(attempt)
+            time.sleep(delay)
+
+
+_scheduler = RequestScheduler()
+
+
+def get_scheduler():
+    """
+    Returns the process-wide `RequestScheduler`.
+    """
+    return _scheduler
+
+
+def set_scheduler(scheduler):
+    """
+    Replaces the process-wide `RequestScheduler` used by URL openers without their own.
+    """
+    global _scheduler
+    _scheduler = scheduler
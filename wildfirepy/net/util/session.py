@@ -0,0 +1,193 @@
+import netrc
+import os
+import threading
+import time
+import urllib.request
+from http.cookiejar import LoadError, MozillaCookieJar
+from urllib.parse import urlparse
+from urllib.request import (HTTPBasicAuthHandler, HTTPCookieProcessor,
+                            HTTPPasswordMgrWithDefaultRealm)
+
+from wildfirepy.config import get_cache_dir
+from wildfirepy.net.util.pool import KeepAliveHandler, KeepAliveHTTPSHandler
+
+__all__ = ['EarthdataSession', 'get_credentials', 'get_session', 'set_session']
+
+EARTHDATA_URL = "https://urs.earthdata.nasa.gov/"
+
+
+def get_credentials(top_level_url=EARTHDATA_URL, netrc_file=None):
+    """
+    Looks up Earthdata Login credentials.
+
+    The ``EARTHDATA_USERNAME`` and ``EARTHDATA_PASSWORD`` environment
+    variables take precedence, then the ``netrc`` entry of the login host.
+
+    Parameters
+    ----------
+    top_level_url: `str`
+        URL of the login server.
+    netrc_file: `str`
+        Path to the netrc file. By default ``~/.netrc``.
+
+    Returns
+    -------
+    username, password: `str`
+
+    Raises
+    ------
+    ValueError
+        If only one of the environment variables is set, or if no
+        credentials are configured at all.
+    """
+    username = os.environ.get('EARTHDATA_USERNAME')
+    password = os.environ.get('EARTHDATA_PASSWORD')
+    if username and password:
+        return username, password
+    if username or password:
+        raise ValueError("Set both EARTHDATA_USERNAME and EARTHDATA_PASSWORD, or neither.")
+    hostname = urlparse(top_level_url).hostname
+    try:
+        entry = netrc.netrc(netrc_file).authenticators(hostname)
+    except (OSError, netrc.NetrcParseError):
+        entry = None
+    if entry is not None and entry[0] and entry[2]:
+        return entry[0], entry[2]
+    raise ValueError(f"No Earthdata Login credentials found. Set EARTHDATA_USERNAME and "
+                     f"EARTHDATA_PASSWORD, add a 'machine {hostname}' entry to ~/.netrc, "
+                     f"or pass username and password explicitly.")
+
+
+class EarthdataSession:
+    """
+    An authenticated opener shared by every parser and downloader.
+
+    The session logs in once and keeps the Earthdata session cookies in a
+    cookie file, so later processes skip the login redirects as long as the
+    cookies are valid. Cookies without an expiry are saved with one of
+    `ttl` seconds. Requests go over the keep-alive connections of
+    `~wildfirepy.net.util.pool.get_connection_pool`, so parallel downloads
+    reuse their sockets and TLS handshakes instead of opening new ones.
+
+    Parameters
+    ----------
+    username: `str`
+        Earthdata Login username. By default from `get_credentials`.
+    password: `str`
+        Earthdata Login password. By default from `get_credentials`.
+    top_level_url: `str`
+        Base URL that leads to the login redirects.
+    cookie_file: `str`
+        File to persist cookies in. By default ``earthdata_cookies.txt``
+        inside `~wildfirepy.config.get_cache_dir`. `False` keeps
+        cookies in memory only.
+    ttl: `float`
+        Lifetime in seconds given to persisted session cookies. By default 12 hours.
+
+    Raises
+    ------
+    ValueError
+        If only one of `username` and `password` is given, or neither is
+        and `get_credentials` finds none.
+
+    Examples
+    --------
+    >>> session = get_session()
+    >>> response = session.open(url)
+    """
+    def __init__(self, username=None, password=None, top_level_url=EARTHDATA_URL,
+                 cookie_file=None, ttl=12 * 3600):
+        if (username is None) != (password is None):
+            raise ValueError("Pass both username and password, or neither.")
+        if username is None:
+            username, password = get_credentials(top_level_url)
+        self.username = username
+        self.top_level_url = top_level_url
+        self.ttl = ttl
+        if cookie_file is None:
+            cookie_file = get_cache_dir() / 'earthdata_cookies.txt'
+        self.cookie_file = str(cookie_file) if cookie_file else None
+
+        self._lock = threading.Lock()
+        self.cookies = MozillaCookieJar(self.cookie_file)
+        if self.cookie_file and os.path.exists(self.cookie_file):
+            try:
+                self.cookies.load(ignore_discard=True)
+            except (LoadError, OSError):
+                self.cookies.clear()
+        self._saved = self._get_state()
+
+        self.auth_manager = HTTPPasswordMgrWithDefaultRealm()
+        self.auth_manager.add_password(None, top_level_url, username, password)
+        self.opener = urllib.request.build_opener(KeepAliveHandler(), KeepAliveHTTPSHandler(),
+                                                  HTTPBasicAuthHandler(self.auth_manager),
+                                                  HTTPCookieProcessor(self.cookies))
+
+    def _get_state(self):
+        return {(cookie.domain, cookie.path, cookie.name, cookie.value) for cookie in self.cookies}
+
+    def open(self, request, scheduler=None):
+        """
+        Opens `request`, through `scheduler` if given, and persists new cookies.
+        """
+        if scheduler is None:
+            response = self.opener.open(request)
+        else:
+            response = scheduler.open(self.opener, request)
+        self.save()
+        return response
+
+    def save(self):
+        """
+        Writes the cookies to `cookie_file` if they changed since the last save.
+        """
+        if not self.cookie_file:
+            return
+        with self._lock:
+            state = self._get_state()
+            if state == self._saved:
+                return
+            expires = int(time.time() + self.ttl)
+            for cookie in self.cookies:
+                if cookie.expires is None:
+                    cookie.expires = expires
+                    cookie.discard = False
+            partial = self.cookie_file + '.part'
+            self.cookies.save(partial, ignore_discard=True)
+            os.chmod(partial, 0o600)
+            os.replace(partial, self.cookie_file)
+            self._saved = state
+
+    def clear(self):
+        """
+        Drops the session cookies, forcing a new login.
+        """
+        with self._lock:
+            self.cookies.clear()
+            self._saved = set()
+            if self.cookie_file and os.path.exists(self.cookie_file):
+                os.remove(self.cookie_file)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the process-wide `EarthdataSession`.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = EarthdataSession()
+    return _session
+
+
+def set_session(session):
+    """
+    Replaces the process-wide `EarthdataSession`, e.g. to log in with other credentials.
+    """
+    global _session
+    with _session_lock:
+        _session = session
@@ -1,28 +1,40 @@
 import re
-import urllib
-import urllib.request
-from http.cookiejar import CookieJar
-from urllib.request import (HTTPBasicAuthHandler, HTTPCookieProcessor,
-                            HTTPPasswordMgrWithDefaultRealm)
+import threading
+
+from wildfirepy.net.util.cache import get_listing_cache
+from wildfirepy.net.util.listing import _get_index
+from wildfirepy.net.util.scheduler import get_scheduler
+from wildfirepy.net.util.session import (EARTHDATA_URL, EarthdataSession,
+                                         get_session)
 
 __all__ = ['URLOpenerWithRedirect', 'MODISHtmlParser', 'VIIRSHtmlParser']
 
+_DATE_DIRECTORY = re.compile(r'href="(\d{4}\.\d{2}\.\d{2})/"')
+
+
 class URLOpenerWithRedirect:
     """
     Description
     -----------
     A `urllib` based URL opener for URLs that require Login Authentication
     and lead to redirects.
-    Creates a minimal opener with a HTTP Password Manager, and a HTTP CookieJar
+    Without explicit credentials all openers share the process-wide
+    `~wildfirepy.net.util.session.EarthdataSession`, so the login happens
+    once per process, or not at all while its persisted cookies are valid.
 
     Parameters
     ----------
     username: `str`
         The login username required to open the URL.
+        By default read from the environment or netrc, see
+        `~wildfirepy.net.util.session.get_credentials`.
     password: `str`
         The login password required to open the URL.
     top_level_url: `str`
         Base URL that leads to the login redirects.
+    scheduler: `~wildfirepy.net.util.scheduler.RequestScheduler`
+        Scheduler applying timeouts, retries and rate limits to every
+        request, by default the process-wide one.
 
     Returns
     -------
@@ -41,17 +53,19 @@ class URLOpenerWithRedirect:
     >>> opener = URLOpenerWithRedirect(username=username, password=password, top_level_url=top_level_url)
     >>> response = opener(url)
     """
-    def __init__(self, *, username='RaahulSingh', password='WildFire_Bad.100',
-                 top_level_url="https://urs.earthdata.nasa.gov/"):
+    def __init__(self, *, username=None, password=None, top_level_url=EARTHDATA_URL,
+                 scheduler=None):
+        self.session = None
+        if username is not None or password is not None or top_level_url != EARTHDATA_URL:
+            self.session = EarthdataSession(username, password, top_level_url, cookie_file=False)
+        self.scheduler = scheduler
 
-        auth_manager = HTTPPasswordMgrWithDefaultRealm()
-        auth_manager.add_password(None, top_level_url, username, password)
-        handler = HTTPBasicAuthHandler(auth_manager)
-        self.opener = urllib.request.build_opener(handler, HTTPCookieProcessor(CookieJar()))
-        # TODO: Get an organisation username and password.
+    @property
+    def opener(self):
+        return (self.session or get_session()).opener
 
     def __call__(self, url):
-        return self.opener.open(url)
+        return (self.session or get_session()).open(url, self.scheduler or get_scheduler())
 
 
 class MODISHtmlParser:
@@ -60,31 +74,65 @@ class MODISHtmlParser:
     -----------
     A Regex based HTML parser for USGS MODIS data server.
     When called with a URL, stores the HTML page as an `str`.
+    Pages are served from `listing_cache` whenever possible.
+
+    Parameters
+    ----------
+    product: `str`
+        Name of the product.
+    listing_cache: `~wildfirepy.net.util.cache.ListingCache`
+        Cache for directory listings, by default the shared one.
     """
-    def __init__(self, product=''):
+    def __init__(self, product='', listing_cache=None):
         self.url_opener = URLOpenerWithRedirect()
         self.product = product
+        self._listing_cache = listing_cache
+        self._local = threading.local()
+
+    @property
+    def listing_cache(self):
+        return self._listing_cache or get_listing_cache()
 
     def __call__(self, url):
-        self.html_content = self.url_opener(url).read().decode('cp1252')
+        self.html_content = self.listing_cache.get(url, self.url_opener)
+
+    @property
+    def html_content(self):
+        """
+        The last listing fetched by the calling thread.
+        """
+        return self._local.html_content
+
+    @html_content.setter
+    def html_content(self, content):
+        self._local.html_content = content
+
+    @property
+    def index(self):
+        """
+        The `~wildfirepy.net.util.listing.ListingIndex` of the `hdf` files in
+        `html_content`, built once per listing.
+        """
+        return _get_index(self._local, self.html_content, self.product, 'hdf')
 
     def get_all_hdf_files(self):
         """
         Returns list of all `hdf` files available for download.
         """
-        return re.findall(r'' + f'href="({self.product}.*hdf)"', self.html_content)
+        return list(self.index.files)
 
     def get_all_jpg_files(self):
         """
         Returns list of all `jpg` files available for download.
         """
-        return re.findall(r'href="(BROWSE.*jpg)"', self.html_content)
+        return re.findall(r'href="(BROWSE\.[^"]*?\.jpg)"', self.html_content)
 
     def get_all_xml_files(self):
         """
         Returns list of all `xml` files available for download.
         """
-        return re.findall(r'' + f'href="({self.product}.*hdf.xml)"', self.html_content)
+        return re.findall(f'href="({re.escape(self.product)}[^"]*?\\.hdf\\.xml)"',
+                          self.html_content)
 
     def get_all_files(self):
         """
@@ -96,7 +144,7 @@ class MODISHtmlParser:
         """
         Returns list of all `dates` from which files can be downloaded.
         """
-        return re.findall(r'"(2.*)/"', self.html_content)
+        return _DATE_DIRECTORY.findall(self.html_content)
 
     def get_filename(self, h, v):
         """
@@ -111,16 +159,7 @@ class MODISHtmlParser:
         ----------
         [1] https://modis-land.gsfc.nasa.gov/MODLAND_grid.html
         """
-        h = str(h) if h > 9 else "0" + str(h)
-        v = str(v) if v > 9 else "0" + str(v)
-
-        r = re.compile(r'.*' + f'.(h{h}v{v}).')
-
-        match = list(filter(r.match, self.get_all_hdf_files()))
-        if len(match) == 0:
-            raise ValueError("No file exists for given coordinates.")
-
-        return match[0]
+        return self.index.get_tile(h, v)
 
 
 class VIIRSHtmlParser:
@@ -129,12 +168,61 @@ class VIIRSHtmlParser:
     -----------
     A Regex based HTML parser for USGS VIIRS data server.
     When called with a URL, stores the HTML page as an `str`.
+    Pages are served from `listing_cache` whenever possible.
+
+    Parameters
+    ----------
+    product: `str`
+        Name of the product.
+    listing_cache: `~wildfirepy.net.util.cache.ListingCache`
+        Cache for directory listings, by default the shared one.
     """
-    def __init__(self, product=''):
+    def __init__(self, product='', listing_cache=None):
         self.url_opener = URLOpenerWithRedirect()
+        self.product = product
+        self._listing_cache = listing_cache
+        self._local = threading.local()
+
+    @property
+    def listing_cache(self):
+        return self._listing_cache or get_listing_cache()
 
     def __call__(self, url):
-        self.html_content = self.url_opener(url).read().decode('cp1252')
+        self.html_content = self.listing_cache.get(url, self.url_opener)
+
+    @property
+    def html_content(self):
+        """
+        The last listing fetched by the calling thread.
+        """
+        return self._local.html_content
+
+    @html_content.setter
+    def html_content(self, content):
+        self._local.html_content = content
+
+    @property
+    def index(self):
+        """
+        The `~wildfirepy.net.util.listing.ListingIndex` of the `h5` files in
+        `html_content`, built once per listing.
+        """
+        return _get_index(self._local, self.html_content, self.product, 'h5')
 
     def get_filename(self, partial):
-        return re.findall(r'' + f'>({partial}.*h5)', self.html_content)[0]
+        """
+        Returns the first `h5` file whose name starts with `partial`.
+        """
+        return self.index.get_prefix(partial)
+
+    def get_tile_filename(self, h, v):
+        """
+        Returns full name of the file based on the Sinusoidal Grid coordinates.
+        """
+        return self.index.get_tile(h, v)
+
+    def get_swath_filename(self, year, doy, time):
+        """
+        Returns full name of the swath file starting at `time`, given as ``'HHMM'``.
+        """
+        return self.index.get_time(year, doy, time)
@@ -0,0 +1,54 @@
+from datetime import date
+
+from wildfirepy.granule import (Granule, get_latest, parse_granule,
+                                parse_granules)
+
+TILE = 'VNP14A1.A2020032.h24v06.001.2020034000000.h5'
+SWATH = 'VNP03MODLL.A2020032.1206.001.2020033000000.h5'
+MODIS = 'MCD64A1.A2020032.h35v10.006.2020102114146.hdf'
+
+
+def test_parse_tile():
+    granule = parse_granule(TILE)
+
+    assert granule == Granule('VNP14A1', 2020, 32, 24, 6, None, '001', '2020034000000', 'h5')
+    assert granule.tile == (24, 6)
+    assert granule.date == date(2020, 2, 1)
+    assert granule.name == TILE
+    assert granule.browse_name == 'BROWSE.VNP14A1.A2020032.h24v06.001.2020034000000.1.jpg'
+
+
+def test_parse_swath():
+    granule = parse_granule(SWATH)
+
+    assert granule.time == '1206'
+    assert granule.tile is None
+    assert granule.name == SWATH
+
+
+def test_browse_name_of_hdf():
+    assert parse_granule(MODIS).browse_name == 'BROWSE.' + MODIS[:-3] + '1.jpg'
+
+
+def test_parse_granules_keeps_order():
+    granules = parse_granules([TILE, 'README.txt', TILE + '.xml', MODIS])
+
+    assert [granule and granule.name for granule in granules] == [TILE, None, None, MODIS]
+
+
+def test_get_latest():
+    names = ['VNP14A1.A2020033.h24v06.001.2020035000000.h5',
+             'VNP14A1.A2020032.h24v06.001.2020100000000.h5',
+             'VNP14A1.A2020032.h24v06.001.2020034000000.h5',
+             'VNP14A1.A2020032.h23v06.001.2020034000000.h5']
+
+    latest = get_latest(parse_granules(names))
+
+    assert [granule.name for granule in latest] == [names[3], names[1], names[0]]
+
+
+def test_tiles_and_swaths_sort_together():
+    granules = parse_granules([TILE, SWATH, MODIS, 'VNP14A1.A2020032.1200.001.2020034000000.h5'])
+
+    assert [granule.name for granule in sorted(granules)] == \
+        [MODIS, SWATH, 'VNP14A1.A2020032.1200.001.2020034000000.h5', TILE]
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ('matplotlib', 'skimage', 'h5py', 'h5json', 'pyproj', 'pkg_resources')
+
+
+def _get_modules(statement):
+    """
+    Returns the modules loaded after running `statement` in a fresh interpreter.
+    """
+    code = f'{statement}\nimport sys\nprint(*sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            check=True)
+    return set(result.stdout.split())
+
+
+def _get_import_time(module):
+    """
+    Returns the cumulative time in seconds of importing `module` in a fresh interpreter.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1e6
+    raise AssertionError(f"{module} was not imported.")
+
+
+@pytest.mark.parametrize('statement', ['import wildfirepy',
+                                       'from wildfirepy.coordinates import util',
+                                       'import wildfirepy.net',
+                                       'import wildfirepy.io',
+                                       'import wildfirepy.gis'])
+def test_no_heavy_imports(statement):
+    loaded = {name.split('.')[0] for name in _get_modules(statement)}
+    assert not loaded.intersection(HEAVY)
+
+
+def test_lazy_attributes():
+    modules = _get_modules('import wildfirepy\n'
+                           'wildfirepy.io.read_metadata\n'
+                           'wildfirepy.io.Viirs1KmLoader\n'
+                           'wildfirepy.gis.stretch')
+    assert 'wildfirepy.io.metadata' in modules
+    assert 'wildfirepy.net' not in modules
+    assert 'wildfirepy.io.hdf' not in modules
+    assert 'wildfirepy.gis.map' not in modules
+    assert 'matplotlib' not in modules
+
+
+@pytest.mark.parametrize('module', ['wildfirepy.granule', 'wildfirepy.io.arraycache',
+                                    'wildfirepy.io.mcd64a1', 'wildfirepy.io.viirs1km',
+                                    'wildfirepy.io.mosaic', 'wildfirepy.io.cube'])
+def test_io_does_not_import_net(module):
+    assert 'wildfirepy.net' not in _get_modules(f'import {module}')
+
+
+@pytest.mark.parametrize('module', ['wildfirepy', 'wildfirepy.net'])
+def test_import_time(module):
+    # A generous budget, the package itself takes a fraction of it.
+    assert _get_import_time(module) < 0.5